@@ -1,17 +1,19 @@
 import logging
 from typing import Any
 
-import requests
 from django.conf import settings
 from pydantic import HttpUrl
 from requests import Response
 from rest_framework import status
 
+from contrib.api.http import http_get, run_blocking
+
 logger = logging.getLogger('contrib')
 
 
 class UnsplashImageAPIClient:
     BASE_API_URL = 'https://api.unsplash.com'
+    BREAKER_KEY = 'unsplash'
 
     def get_random_image_with_parameters(self, image_search_query: str) -> tuple[HttpUrl, Any | None] | tuple[None, None]:
         try:
@@ -22,7 +24,8 @@ class UnsplashImageAPIClient:
                 'content_filter': 'high',
             }
 
-            response: Response = requests.get(self.BASE_API_URL + '/photos/random', params=params)
+            response: Response = http_get(url=self.BASE_API_URL + '/photos/random', breaker_key=self.BREAKER_KEY,
+                                          params=params)
 
             if response.status_code != status.HTTP_200_OK:
                 return None, None
@@ -36,3 +39,11 @@ class UnsplashImageAPIClient:
             logger.exception(msg=e)
 
             return None, None
+
+    async def aget_random_image_with_parameters(
+            self, image_search_query: str) -> tuple[HttpUrl, Any | None] | tuple[None, None]:
+        """
+        Async variant of ``get_random_image_with_parameters``, which does not block the event loop while waiting for
+        Unsplash.
+        """
+        return await run_blocking(self.get_random_image_with_parameters, image_search_query=image_search_query)
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger('contrib')
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a request is refused because the circuit breaker of its source is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and requests are refused for ``reset_timeout``
+    seconds. After that a single probe request is let through (half-open): if it succeeds the circuit closes again,
+    otherwise it re-opens. The breaker also keeps track of the latency of the source.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, key: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.successes = 0
+        self.failures = 0
+        self.rejections = 0
+        self.last_latency: float | None = None
+        self.average_latency: float | None = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let one probe request through
+                self.state = self.HALF_OPEN
+                return True
+
+            self.rejections += 1
+
+            return False
+
+    def is_available(self) -> bool:
+        """
+        Whether a request would currently be let through (without reserving the half-open probe).
+        """
+        return self.state == self.CLOSED or (
+                self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout)
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._record_latency(latency=latency)
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            self.opened_at = None
+
+    def record_failure(self, latency: float) -> None:
+        with self._lock:
+            self._record_latency(latency=latency)
+            self.failures += 1
+            self.consecutive_failures += 1
+
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(msg=f'Circuit breaker for "{self.key}" opened after '
+                                       f'{self.consecutive_failures} consecutive failures.')
+
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def _record_latency(self, latency: float) -> None:
+        self.last_latency = latency
+        self.average_latency = latency if self.average_latency is None else (
+                0.8 * self.average_latency + 0.2 * latency)
+
+    def as_dict(self) -> dict[str, any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'successes': self.successes,
+            'failures': self.failures,
+            'rejections': self.rejections,
+            'last_latency_ms': round(self.last_latency * 1000, 3) if self.last_latency is not None else None,
+            'average_latency_ms': round(self.average_latency * 1000, 3) if self.average_latency is not None else None,
+        }
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+_sessions: dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def get_circuit_breaker(key: str) -> CircuitBreaker:
+    circuit_breaker: CircuitBreaker | None = _circuit_breakers.get(key)
+
+    if circuit_breaker is None:
+        with _lock:
+            circuit_breaker = _circuit_breakers.setdefault(key, CircuitBreaker(
+                key=key,
+                failure_threshold=settings.HTTP_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.HTTP_CIRCUIT_BREAKER_RESET_TIMEOUT,
+            ))
+
+    return circuit_breaker
+
+
+def get_circuit_breaker_states() -> dict[str, dict[str, any]]:
+    """
+    Get the state, counters and latency of every source that has been called so far.
+    """
+    return {key: circuit_breaker.as_dict() for key, circuit_breaker in sorted(_circuit_breakers.items())}
+
+
+def is_source_available(key: str) -> bool:
+    """
+    Whether requests to the given source are currently let through by its circuit breaker.
+    """
+    circuit_breaker: CircuitBreaker | None = _circuit_breakers.get(key)
+
+    return circuit_breaker is None or circuit_breaker.is_available()
+
+
+def get_session(url: str) -> requests.Session:
+    """
+    Get the pooled (keep-alive) session for the host of the given URL.
+    """
+    parsed_url = urlsplit(url)
+    host: str = f'{parsed_url.scheme}://{parsed_url.netloc}'
+    session: requests.Session | None = _sessions.get(host)
+
+    if session is None:
+        with _lock:
+            session = _sessions.get(host)
+
+            if session is None:
+                session = requests.Session()
+                session.mount(prefix=host, adapter=HTTPAdapter(pool_connections=1,
+                                                               pool_maxsize=settings.HTTP_POOL_MAXSIZE))
+                _sessions[host] = session
+
+    return session
+
+
+def http_get(url: str, breaker_key: str, params: dict[str, any] = None, headers: dict[str, any] = None) -> Response:
+    """
+    Send a GET request through the pooled session of the host, with the configured timeouts and guarded by the
+    circuit breaker of ``breaker_key``.
+
+    :raises CircuitOpenError: if the circuit breaker of the source is open.
+    """
+    circuit_breaker: CircuitBreaker = get_circuit_breaker(key=breaker_key)
+
+    if not circuit_breaker.allow_request():
+        raise CircuitOpenError(f'Circuit breaker for "{breaker_key}" is open, not calling {url}')
+
+    start_time: float = time.monotonic()
+
+    try:
+        response: Response = get_session(url=url).get(
+            url=url, params=params, headers=headers,
+            timeout=(settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT))
+    except requests.RequestException:
+        circuit_breaker.record_failure(latency=time.monotonic() - start_time)
+        raise
+
+    if response.status_code >= 500 or response.status_code == 429:
+        circuit_breaker.record_failure(latency=time.monotonic() - start_time)
+    else:
+        circuit_breaker.record_success(latency=time.monotonic() - start_time)
+
+    return response
+
+
+_http_executor: ThreadPoolExecutor | None = None
+
+
+def get_http_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool that runs blocking HTTP calls for async code (@see ``run_blocking``).
+    """
+    global _http_executor
+
+    if _http_executor is None:
+        with _lock:
+            if _http_executor is None:
+                _http_executor = ThreadPoolExecutor(max_workers=settings.HTTP_ASYNC_MAX_WORKERS,
+                                                    thread_name_prefix='http-client')
+
+    return _http_executor
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> any:
+    """
+    Run a blocking (HTTP) call in the HTTP thread pool, so it does not block the event loop. Not for database access,
+    use ``asgiref.sync.sync_to_async`` for that.
+    """
+    return await asyncio.get_running_loop().run_in_executor(get_http_executor(), partial(func, *args, **kwargs))
+
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from django.conf import settings
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: allows ``rate`` requests per second on average, with bursts of up to ``burst`` requests.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a request is allowed.
+        """
+        while (wait_time := self.try_acquire()) > 0:
+            time.sleep(wait_time)
+
+    def try_acquire(self) -> float:
+        """
+        Allow a request if a token is available, without blocking.
+
+        :returns: 0 if the request is allowed, otherwise the number of seconds until the next token.
+        :rtype: float
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self.rate
+
+
+_rate_limiters: dict[str, RateLimiter] = {}
+_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str) -> RateLimiter:
+    """
+    Get the rate limiter of a source, configured with ``HTTP_RATE_LIMITS`` (requests per second per source key) or
+    ``HTTP_DEFAULT_RATE_LIMIT``.
+    """
+    rate_limiter: RateLimiter | None = _rate_limiters.get(key)
+
+    if rate_limiter is None:
+        with _lock:
+            rate: float = settings.HTTP_RATE_LIMITS.get(key, settings.HTTP_DEFAULT_RATE_LIMIT)
+            rate_limiter = _rate_limiters.setdefault(key, RateLimiter(rate=rate, burst=max(1, int(rate))))
+
+    return rate_limiter
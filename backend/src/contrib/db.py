@@ -0,0 +1,61 @@
+import json
+
+from django.db import connection
+from django.db.models import QuerySet
+
+
+def get_estimated_row_count(db_table: str) -> float:
+    """
+    Get the PostgreSQL planner's row estimate for the given table (``-1`` or ``0`` if the table was never analyzed).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', (db_table,))
+        row: tuple | None = cursor.fetchone()
+
+    return row[0] if row else -1
+
+
+def get_index_sizes(db_table: str) -> dict[str, int]:
+    """
+    Get the size (in bytes) of every index of the given table, by index name. SQLite only reports sizes when it is
+    built with the ``dbstat`` table (as the Python builds usually are), other databases report nothing.
+    """
+    if connection.vendor == 'postgresql':
+        sql: str = 'SELECT indexrelname, pg_relation_size(indexrelid) FROM pg_stat_user_indexes WHERE relname = %s'
+    elif connection.vendor == 'sqlite':
+        sql: str = ('SELECT dbstat.name, SUM(dbstat.pgsize) FROM dbstat JOIN sqlite_master '
+                    "ON sqlite_master.name = dbstat.name AND sqlite_master.type = 'index' "
+                    'WHERE sqlite_master.tbl_name = %s GROUP BY dbstat.name')
+    else:
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (db_table,))
+
+        return {name: int(size) for name, size in cursor.fetchall()}
+
+
+def get_approximate_count(queryset: QuerySet) -> int:
+    """
+    Get the approximate number of rows of a queryset from the PostgreSQL planner statistics, without scanning the table
+    like ``COUNT(*)`` does: the table estimate for an unfiltered queryset, or else the planner's estimate for the
+    query. Falls back to an exact count on other database vendors and on tables that have not been analyzed yet.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    if not queryset.query.where:
+        estimated_rows: float = get_estimated_row_count(db_table=queryset.model._meta.db_table)
+
+        return int(estimated_rows) if estimated_rows > 0 else queryset.count()
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan: list[dict[str, any]] | str = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
@@ -37,3 +37,19 @@ class ResponsibleUserMixin(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ModelVersion(models.Model):
+    """
+    Version of a model's table, which changes whenever rows are deleted (@see ``contrib.versions.bump_model_version``).
+    Stored in the database, so every process sees the same version, whatever the cache backend.
+    """
+    label = models.CharField(max_length=255, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _('Model version')
+        verbose_name_plural = _('Model versions')
+
+    def __str__(self) -> str:
+        return _(f'{self.label} (version {self.version})').__str__()
@@ -0,0 +1,63 @@
+from django.db.models import QuerySet
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from contrib.db import get_approximate_count
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination on the primary key: every page is an index range scan (``WHERE id < %s ORDER BY id DESC
+    LIMIT n``), however deep it is, and there is no ``COUNT(*)``. An approximate total from the planner statistics can
+    be requested with ``?approximate_count=true``.
+    """
+    ordering = '-pk'
+    approximate_count_query_param = 'approximate_count'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: APIView | None = None) -> list | None:
+        self.approximate_count: int | None = None
+
+        if request.query_params.get(self.approximate_count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.approximate_count = get_approximate_count(queryset=queryset)
+
+        return super().paginate_queryset(queryset=queryset, request=request, view=view)
+
+    def get_paginated_response(self, data: list) -> Response:
+        response: Response = super().get_paginated_response(data=data)
+
+        if self.approximate_count is not None:
+            response.data['approximate_count'] = self.approximate_count
+
+        return response
+
+    def get_paginated_response_schema(self, schema: dict[str, any]) -> dict[str, any]:
+        response_schema: dict[str, any] = super().get_paginated_response_schema(schema=schema)
+        response_schema['properties']['approximate_count'] = {
+            'type': 'integer',
+            'example': 123,
+            'description': f'Estimated total, only with ?{self.approximate_count_query_param}=true',
+        }
+
+        return response_schema
+
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, any]]:
+        return [
+            *super().get_schema_operation_parameters(view=view),
+            {
+                'name': self.approximate_count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Include an approximate total (from the planner statistics).',
+                'schema': {
+                    'type': 'boolean',
+                },
+            },
+        ]
+
+
+PAGINATION_CLASSES: dict[str, type[BasePagination]] = {
+    'page_number': PageNumberPagination,
+    'cursor': KeysetPagination,
+}
@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest, HttpResponseBase
+
+logger = logging.getLogger('contrib')
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised (with ``QUERY_BUDGET_STRICT``, e.g. in tests) when a request runs more queries than its endpoint's budget.
+    """
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    max_queries: int
+    max_time_ms: float | None = None
+
+
+def query_budget(max_queries: int, max_time_ms: float | None = None) -> Callable:
+    """
+    Declare the query budget of a view (or viewset action), enforced by ``QueryBudgetMiddleware``.
+
+    Inherited viewset actions (e.g. ``list``) can be given a budget with a ``query_budgets`` dict on the viewset instead.
+    """
+    def decorator(func: Callable) -> Callable:
+        func.query_budget = QueryBudget(max_queries=max_queries, max_time_ms=max_time_ms)
+
+        return func
+
+    return decorator
+
+
+def get_view_query_budget(view_func: Callable, request: HttpRequest) -> QueryBudget | None:
+    """
+    Get the query budget declared for the view (or viewset action) that handles the request.
+    """
+    budget: QueryBudget | None = getattr(view_func, 'query_budget', None)
+    view_class: type | None = getattr(view_func, 'cls', None)
+    actions: dict[str, str] | None = getattr(view_func, 'actions', None)
+
+    if budget is None and view_class is not None and actions:
+        action: str | None = actions.get(request.method.lower())
+        query_budgets: dict[str, int] = getattr(view_class, 'query_budgets', {})
+        budget = getattr(getattr(view_class, action, None), 'query_budget', None) if action else None
+
+        if budget is None and action in query_budgets:
+            budget = QueryBudget(max_queries=query_budgets[action])
+
+    return budget
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that counts and times the queries of a request.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.time_ms = 0.0
+
+    def __call__(self, execute: Callable, sql: str, params: any, many: bool, context: dict[str, any]) -> any:
+        start_time: float = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.time_ms += (time.perf_counter() - start_time) * 1000
+
+
+_query_stats: dict[str, dict[str, int | float]] = {}
+_query_stats_lock = threading.Lock()
+
+
+def record_query_stats(endpoint: str, queries: int, time_ms: float, exceeded: bool) -> None:
+    with _query_stats_lock:
+        stats: dict[str, int | float] = _query_stats.setdefault(
+            endpoint, {'requests': 0, 'queries': 0, 'max_queries': 0, 'time_ms': 0.0, 'budget_exceeded': 0})
+        stats['requests'] += 1
+        stats['queries'] += queries
+        stats['max_queries'] = max(stats['max_queries'], queries)
+        stats['time_ms'] += time_ms
+        stats['budget_exceeded'] += int(exceeded)
+
+
+def get_query_stats() -> dict[str, dict[str, int | float]]:
+    """
+    Get the number of requests, queries and query time per endpoint (in this process).
+    """
+    with _query_stats_lock:
+        return {endpoint: dict(stats) for endpoint, stats in _query_stats.items()}
+
+
+def add_query_recorder(recorder: QueryRecorder) -> None:
+    connection.execute_wrappers.append(recorder)
+
+
+def remove_query_recorder(recorder: QueryRecorder) -> None:
+    connection.execute_wrappers.remove(recorder)
+
+
+class QueryBudgetMiddleware:
+    """
+    Records the number of queries and the query time per endpoint, and checks them against the endpoint's declared
+    budget (@see ``query_budget``). Exceeding the budget is logged, or raises ``QueryBudgetExceeded`` with
+    ``QUERY_BUDGET_STRICT`` (only the number of queries, timings are too noisy to fail on).
+
+    Under ASGI the queries of async views run in the request's thread for synchronous code (``sync_to_async``), so the
+    recorder is installed on the connection of that thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not settings.QUERY_BUDGET_ENABLED:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+
+        with connection.execute_wrapper(recorder):
+            response: HttpResponseBase = self.get_response(request)
+
+        self.check_query_budget(request=request, recorder=recorder)
+
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        if not settings.QUERY_BUDGET_ENABLED:
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        await sync_to_async(add_query_recorder)(recorder=recorder)
+
+        try:
+            response: HttpResponseBase = await self.get_response(request)
+        finally:
+            await sync_to_async(remove_query_recorder)(recorder=recorder)
+
+        self.check_query_budget(request=request, recorder=recorder)
+
+        return response
+
+    @staticmethod
+    def check_query_budget(request: HttpRequest, recorder: QueryRecorder) -> None:
+        resolver_match = getattr(request, 'resolver_match', None)
+
+        if resolver_match is None:
+            return
+
+        endpoint: str = resolver_match.view_name
+        budget: QueryBudget | None = getattr(request, 'query_budget', None)
+        exceeds_queries: bool = budget is not None and recorder.count > budget.max_queries
+        exceeds_time: bool = budget is not None and budget.max_time_ms is not None and (
+                recorder.time_ms > budget.max_time_ms)
+        record_query_stats(endpoint=endpoint, queries=recorder.count, time_ms=recorder.time_ms,
+                           exceeded=exceeds_queries or exceeds_time)
+
+        if exceeds_queries or exceeds_time:
+            message: str = (f'{request.method} {endpoint} exceeded its query budget: {recorder.count} queries in '
+                            f'{recorder.time_ms:.1f} ms (budget: {budget.max_queries} queries'
+                            f'{f" in {budget.max_time_ms} ms" if budget.max_time_ms is not None else ""})')
+
+            if exceeds_queries and settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+
+            logger.warning(msg=message)
+
+    @staticmethod
+    def process_view(request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict) -> None:
+        request.query_budget = get_view_query_budget(view_func=view_func, request=request)
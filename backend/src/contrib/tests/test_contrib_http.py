@@ -0,0 +1,45 @@
+import time
+
+from contrib.api.http import CircuitBreaker
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    circuit_breaker = CircuitBreaker(key='source', failure_threshold=3, reset_timeout=60.0)
+
+    for _ in range(2):
+        circuit_breaker.record_failure(latency=0.1)
+    circuit_breaker.record_success(latency=0.1)
+    for _ in range(2):
+        circuit_breaker.record_failure(latency=0.1)
+
+    assert circuit_breaker.state == CircuitBreaker.CLOSED
+    assert circuit_breaker.allow_request() is True
+
+    circuit_breaker.record_failure(latency=0.1)
+
+    assert circuit_breaker.state == CircuitBreaker.OPEN
+    assert circuit_breaker.is_available() is False
+    assert circuit_breaker.allow_request() is False
+    assert circuit_breaker.as_dict()['rejections'] == 1
+
+
+def test_circuit_breaker_half_open_probe():
+    circuit_breaker = CircuitBreaker(key='source', failure_threshold=1, reset_timeout=0.05)
+    circuit_breaker.record_failure(latency=0.1)
+    time.sleep(0.06)
+
+    assert circuit_breaker.is_available() is True
+    # Only a single probe is let through
+    assert circuit_breaker.allow_request() is True
+    assert circuit_breaker.allow_request() is False
+
+    circuit_breaker.record_failure(latency=0.1)
+
+    assert circuit_breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    circuit_breaker.allow_request()
+    circuit_breaker.record_success(latency=0.02)
+
+    assert circuit_breaker.state == CircuitBreaker.CLOSED
+    assert circuit_breaker.as_dict()['last_latency_ms'] == 20.0
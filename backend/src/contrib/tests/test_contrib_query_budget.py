@@ -0,0 +1,48 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from contrib.query_budget import QueryBudget, QueryBudgetExceeded, get_query_stats
+from quotes.tests.factories import QuoteFactory
+from quotes.views import QuoteViewSet
+
+
+@pytest.mark.django_db
+def test_query_budget_middleware(client, caplog):
+    cache.clear()
+    QuoteFactory.create_batch(size=3)
+    url = reverse(viewname='quotes-list')
+
+    with mock.patch.object(QuoteViewSet, 'query_budgets', {'list': 1}):
+        with override_settings(QUERY_BUDGET_STRICT=True), pytest.raises(QueryBudgetExceeded):
+            client.get(url)
+
+        cache.clear()
+
+        with override_settings(QUERY_BUDGET_STRICT=False):
+            assert client.get(url).status_code == 200
+
+    assert 'quotes-list exceeded its query budget: 3 queries' in caplog.text
+
+    stats = get_query_stats()['quotes-list']
+    assert stats['requests'] >= 2
+    assert stats['max_queries'] >= 3
+    assert stats['budget_exceeded'] >= 2
+
+
+@pytest.mark.django_db
+@override_settings(QUERY_BUDGET_STRICT=True)
+def test_query_budget_decorator(client):
+    cache.clear()
+    QuoteFactory.create_batch(size=3)
+    url = reverse(viewname='quotes-get-most-liked-quotes')
+
+    with mock.patch.object(QuoteViewSet.get_most_liked_quotes, 'query_budget', QueryBudget(max_queries=0)):
+        with pytest.raises(QueryBudgetExceeded):
+            client.get(url)
+
+        # Served from the cache, without queries
+        assert client.get(url).status_code == 200
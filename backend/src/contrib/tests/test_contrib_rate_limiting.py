@@ -0,0 +1,23 @@
+import time
+
+from contrib.api.rate_limiting import RateLimiter
+
+
+def test_rate_limiter():
+    rate_limiter = RateLimiter(rate=20.0, burst=2)
+    start_time = time.monotonic()
+
+    for _ in range(6):
+        rate_limiter.acquire()
+
+    # Two requests are allowed in a burst, the other four need 1/20th of a second each
+    assert 0.18 <= time.monotonic() - start_time < 0.5
+
+
+def test_rate_limiter_try_acquire():
+    rate_limiter = RateLimiter(rate=10.0, burst=1)
+
+    assert rate_limiter.try_acquire() == 0
+    # The next token is a 1/10th of a second away, and not taken while waiting for it
+    assert 0.05 < rate_limiter.try_acquire() <= 0.1
+    assert 0.05 < rate_limiter.try_acquire() <= 0.1
@@ -0,0 +1,55 @@
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Model, PositiveBigIntegerField, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from contrib.models import ModelVersion
+
+
+def get_model_label(model: type[Model]) -> str:
+    return model._meta.label_lower
+
+
+def get_model_version_subquery(model: type[Model]) -> Coalesce:
+    """
+    Get the version of a model's table as an expression, to read it in the same query as the rows it applies to.
+    """
+    return Coalesce(Subquery(ModelVersion.objects.filter(label=get_model_label(model=model)).values('version')),
+                    Value(0), output_field=PositiveBigIntegerField())
+
+
+def get_model_versions(models: Iterable[type[Model]]) -> dict[type[Model], int]:
+    """
+    Get the versions of several models' tables with a single query (@see ``bump_model_version``).
+    """
+    models_by_label: dict[str, type[Model]] = {get_model_label(model=model): model for model in models}
+    versions: dict[str, int] = dict(
+        ModelVersion.objects.filter(label__in=models_by_label).values_list('label', 'version'))
+
+    return {model: versions.get(label, 0) for label, model in models_by_label.items()}
+
+
+def get_model_version(model: type[Model]) -> int:
+    """
+    Get the version of a model's table, which changes whenever rows are deleted (@see ``bump_model_version``).
+    """
+    return get_model_versions(models=(model,))[model]
+
+
+def bump_model_version(model: type[Model]) -> None:
+    """
+    Change the version of a model's table, e.g. from a ``post_delete`` receiver. It is changed in the database, in the
+    transaction of the change it is bumped for, so no process can see the change without the new version.
+    """
+    label: str = get_model_label(model=model)
+
+    if ModelVersion.objects.filter(label=label).update(version=F('version') + 1):
+        return
+
+    try:
+        with transaction.atomic():
+            ModelVersion.objects.create(label=label, version=1)
+    except IntegrityError:
+        # Created by another process in the meantime
+        ModelVersion.objects.filter(label=label).update(version=F('version') + 1)
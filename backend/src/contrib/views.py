@@ -1,6 +1,139 @@
+from datetime import datetime
+from hashlib import md5
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Expression, QuerySet
+from django.http import Http404, HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from contrib.versions import get_model_version_subquery
+
 
 class GenericGUIDViewSet(GenericViewSet):
     lookup_field = 'guid'
     lookup_value_regex = '[a-zA-Z0-9]{8}-[a-zA-Z0-9]{4}-[a-zA-Z0-9]{4}-[a-zA-Z0-9]{4}-[a-zA-Z0-9]{12}'
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET support for ``retrieve`` and ``list`` of models with a ``modified`` timestamp (e.g.
+    ``TimestampMixin``).
+
+    The ETag and Last-Modified validators are computed from ``modified`` with a single small query, so unchanged
+    objects are answered with a 304 without serializing anything. The serialized payloads are cached server-side
+    (``RESPONSE_CACHE_TIMEOUT``), keyed on the validators, so a changed object never hits a stale cache entry.
+
+    Deleting rows does not change the latest ``modified`` timestamp of a list, and changing related rows that are part
+    of the payload (e.g. the name of an author) does not change ``modified`` at all, so both must bump the model version
+    (@see ``contrib.versions.bump_model_version``). Changes that are tracked in another table with its own timestamps
+    can be added to the validators instead (@see ``get_modified_annotations``).
+    """
+
+    def get_modified_annotations(self, detail: bool) -> dict[str, Expression]:
+        """
+        Get expressions of the times of changes of the payload that don't update ``modified`` (e.g. rows of another
+        table), annotated in the validators query, of the object (``detail``) or of any object of the list. The latest
+        of them and ``modified`` is the time of the latest change.
+        """
+        return {}
+
+    def retrieve(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        lookup_url_kwarg: str = self.lookup_url_kwarg or self.lookup_field
+        queryset: QuerySet = self.filter_queryset(self.get_queryset())
+        modified_annotations: dict[str, Expression] = self.get_modified_annotations(detail=True)
+        # The pk, ``modified`` and version, then the times of the other changes
+        validators: tuple[int | datetime | None, ...] | None = (
+            queryset
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .annotate(version=get_model_version_subquery(model=queryset.model), **modified_annotations)
+            .values_list('pk', 'modified', 'version', *modified_annotations)
+            .first()
+        )
+
+        if validators is None:
+            raise Http404
+
+        pk, modified, version = validators[:3]
+        modified = max([modified, *[other for other in validators[3:] if other is not None]])
+
+        return self.get_conditional_response(
+            request=request,
+            validator=f'{version}:{pk}:{modified.isoformat()}',
+            last_modified=modified.timestamp(),
+            get_data=lambda: self.get_retrieve_data(request, *args, **kwargs),
+        )
+
+    def list(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        queryset: QuerySet = self.filter_queryset(self.get_queryset())
+        modified_annotations: dict[str, Expression] = self.get_modified_annotations(detail=False)
+        # The latest change (an index scan of a single row), the version and the times of the other changes in the same
+        # query, none for an empty list
+        validators: tuple[datetime | int | None, ...] | None = (
+            queryset
+            .order_by('-modified')
+            .annotate(version=get_model_version_subquery(model=queryset.model), **modified_annotations)
+            .values_list('modified', 'version', *modified_annotations)
+            .first()
+        )
+        latest_modified: datetime | None = None
+        version: int | None = None
+
+        if validators is not None:
+            latest_modified, version = validators[:2]
+            latest_modified = max([latest_modified, *[other for other in validators[2:] if other is not None]])
+
+        last_modified: float | None = latest_modified.timestamp() if latest_modified else None
+
+        return self.get_conditional_response(
+            request=request,
+            validator=f'{version}:{last_modified}:{request.GET.urlencode()}',
+            last_modified=last_modified,
+            get_data=lambda: self.get_list_data(request, *args, **kwargs),
+        )
+
+    def get_retrieve_data(self, request: Request, *args, **kwargs) -> any:
+        """
+        Get the payload of ``retrieve`` (on a cache miss).
+        """
+        return super().retrieve(request, *args, **kwargs).data
+
+    def get_list_data(self, request: Request, *args, **kwargs) -> any:
+        """
+        Get the payload of ``list`` (on a cache miss).
+        """
+        return super().list(request, *args, **kwargs).data
+
+    def get_conditional_response(self, request: Request, validator: str, last_modified: float | None,
+                                 get_data: Callable[[], any]) -> HttpResponseBase:
+        """
+        Return a 304 when the client's validators match, or else the (cached) payload with the validators.
+        """
+        etag: str = quote_etag(md5(f'{self.action}:{validator}'.encode('utf-8'), usedforsecurity=False).hexdigest())
+        response: HttpResponseBase | None = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified) if last_modified is not None else None)
+
+        if response is None:
+            cache_key: str = f'{self.basename}:{etag}'
+            data: any = cache.get(cache_key)
+
+            if data is None:
+                data = get_data()
+                cache.set(cache_key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+            response = Response(data=data)
+
+        response.headers['ETag'] = etag
+
+        if last_modified is not None:
+            response.headers['Last-Modified'] = http_date(last_modified)
+
+        # Let clients always revalidate (which is cheap) instead of guessing how long the response stays fresh
+        patch_cache_control(response, no_cache=True)
+
+        return response
@@ -3,11 +3,11 @@ from django.http import HttpRequest
 from django.utils.html import format_html
 from django.utils.safestring import SafeString
 from django.utils.translation import gettext_lazy as _
-from unfold.admin import ModelAdmin
+from unfold.admin import ModelAdmin, TabularInline
 from unfold.contrib.filters.admin import RangeDateFilter
 
 from contrib.admin_mixins import GUIDAdminMixin
-from quotes.models import Author, Category, Quote, QuoteOrigin
+from quotes.models import Author, Category, CategoryAlias, ImageEnrichmentJob, Quote, QuoteOrigin
 
 
 @admin.register(Author)
@@ -26,18 +26,25 @@ class AuthorAdmin(GUIDAdminMixin, ModelAdmin):
     )
 
 
+class CategoryAliasInline(TabularInline):
+    model = CategoryAlias
+    fields = ('alias',)
+    extra = 0
+
+
 @admin.register(Category)
 class CategoryAdmin(GUIDAdminMixin, ModelAdmin):
     def has_module_permission(self, request: HttpRequest) -> bool:
         return False
 
-    list_display = ('name', 'created', 'modified')
+    inlines = (CategoryAliasInline,)
+    list_display = ('name', 'quote_count', 'created', 'modified')
     list_filter = ('name', ('created', RangeDateFilter), ('modified', RangeDateFilter))
-    readonly_fields = ('created', 'modified')
+    readonly_fields = ('quote_count', 'created', 'modified')
     search_fields = ordering = ('name',)
     fieldsets = (
         (
-            _('Category'), {'fields': ('name',)}
+            _('Category'), {'fields': ('name', 'quote_count')}
         ),
     )
 
@@ -118,3 +125,18 @@ class QuoteAdmin(GUIDAdminMixin, ModelAdmin):
         )
 
     ratio.short_description = _('Like/Dislike ratio')
+
+
+@admin.register(ImageEnrichmentJob)
+class ImageEnrichmentJobAdmin(ModelAdmin):
+    autocomplete_fields = ('quote',)
+    list_display = ('quote', 'status', 'attempts', 'available_at', 'modified')
+    list_filter = ('status', ('available_at', RangeDateFilter), ('modified', RangeDateFilter))
+    readonly_fields = ('created', 'modified')
+    ordering = ('available_at',)
+    fieldsets = (
+        (
+            _('Image enrichment job'),
+            {'fields': ('quote', 'image_search_query', 'status', 'attempts', 'available_at', 'last_error')}
+        ),
+    )
@@ -2,10 +2,10 @@ import logging
 from abc import ABC, abstractmethod
 from urllib.parse import urljoin
 
-import requests
 from django.conf import settings
 from requests import Response
 
+from contrib.api.http import http_get, run_blocking
 from quotes.api.models import Quote
 
 logger = logging.getLogger('quotes')
@@ -35,6 +35,12 @@ class BaseQuoteAPIClient(ABC):
     def fetch_random_quote(self) -> Quote | None:
         raise NotImplementedError('Subclasses must implement ``fetch_random_quote``!')
 
+    async def afetch_random_quote(self) -> Quote | None:
+        """
+        Async variant of ``fetch_random_quote``, which does not block the event loop while waiting for the API.
+        """
+        return await run_blocking(self.fetch_random_quote)
+
 
 class APINinjaQuoteAPIClient(BaseQuoteAPIClient):
     @property
@@ -54,7 +60,7 @@ class APINinjaQuoteAPIClient(BaseQuoteAPIClient):
             headers: dict[str, any] = {
                 'X-Api-Key': settings.APININJAS_API_KEY,
             }
-            response: Response = requests.get(url=self.random_quote_url, headers=headers)
+            response: Response = http_get(url=self.random_quote_url, breaker_key=self.api_client_key, headers=headers)
             data: dict[str, any] = response.json()[0]
             author: str | None = data.get('author')
             category: str | None = data.get('category')
@@ -94,7 +100,7 @@ class ProgrammingQuoteAPIClient(BaseQuoteAPIClient):
 
     def fetch_random_quote(self) -> Quote | None:
         try:
-            response: Response = requests.get(url=self.random_quote_url)
+            response: Response = http_get(url=self.random_quote_url, breaker_key=self.api_client_key)
             data: dict[str, any] = response.json()
             author: str = data.get('author')
             quote_text: str = data.get('quote')
@@ -133,7 +139,7 @@ class ZenQuoteAPIClient(BaseQuoteAPIClient):
 
     def fetch_random_quote(self) -> Quote | None:
         try:
-            response: Response = requests.get(url=self.random_quote_url)
+            response: Response = http_get(url=self.random_quote_url, breaker_key=self.api_client_key)
             data: list[dict[str, any]] = response.json()
             author: str = data[0].get('a')
             quote_text: str = data[0].get('q')
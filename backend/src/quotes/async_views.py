@@ -0,0 +1,107 @@
+"""
+Async variants of the hot quote endpoints, for ASGI deployments: waiting for the database or an external API does
+not tie up a worker. They respond like their ``QuoteViewSet`` counterparts.
+"""
+from distutils.util import strtobool
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+from rest_framework import status
+
+from contrib.query_budget import query_budget
+from .models import Quote
+from .serializers import FastQuoteSerializer, QuoteSerializer
+from .utils.quote_fetching import (
+    RANDOM_QUOTE_MODES, afetch_random_quote, afetch_random_quote_from_database, fetch_stream_quote_from_database,
+    fetch_weighted_quote_from_database,
+)
+from .utils.random_pool import get_random_quote_pool
+from .utils.votes import VOTE_DIRECTIONS, avote_on_quote
+
+
+@query_budget(max_queries=24)
+@require_GET
+async def get_random_quote(request: HttpRequest) -> JsonResponse:
+    """
+    Get a random quote (@see ``QuoteViewSet.get_random_quote``).
+    """
+    mode: str = request.GET.get('mode', 'random')
+
+    if mode not in RANDOM_QUOTE_MODES:
+        return JsonResponse(data={'error': f'Invalid mode provided, must be one of: {list(RANDOM_QUOTE_MODES)}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+    if mode == 'stream':
+        # Reads and writes the session, which is only available synchronously
+        quote: Quote | None = await sync_to_async(fetch_stream_quote_from_database)(session=request.session)
+    elif mode == 'weighted':
+        quote: Quote | None = await sync_to_async(fetch_weighted_quote_from_database)()
+    else:
+        if settings.QUOTES_RANDOM_POOL_ENABLED:
+            payload: dict[str, any] | None = get_random_quote_pool().pop()
+
+            if payload is not None:
+                return JsonResponse(data=payload, status=status.HTTP_200_OK)
+
+        quote: Quote | None = await afetch_random_quote()
+
+    if quote is None:
+        return JsonResponse(data='No quotes found', status=status.HTTP_404_NOT_FOUND, safe=False)
+
+    return JsonResponse(data=FastQuoteSerializer(instance=quote).data, status=status.HTTP_200_OK)
+
+
+# The category lookup, the sampling queries and the vote totals (with sharded votes)
+@query_budget(max_queries=6)
+@require_GET
+async def get_random_quote_by_category(request: HttpRequest) -> JsonResponse:
+    """
+    Get a random quote from the database, with given category (@see ``QuoteViewSet.get_random_quote_by_category``).
+    """
+    quote: Quote | None = await afetch_random_quote_from_database(category=request.GET.get('category'))
+
+    if quote is None:
+        return JsonResponse(data='No quotes found for category', status=status.HTTP_404_NOT_FOUND, safe=False)
+
+    return JsonResponse(data=FastQuoteSerializer(instance=quote).data, status=status.HTTP_200_OK)
+
+
+async def vote(request: HttpRequest, guid: str, vote_field: str) -> JsonResponse:
+    direction: str = request.GET.get('direction', 'increase')
+
+    if direction not in VOTE_DIRECTIONS:
+        return JsonResponse(data={'error': 'Invalid direction provided, must be one of: ["increase", "decrease"]'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+    reverse_opposite: bool = bool(strtobool(request.GET.get('reverse_opposite', '0')))
+    quote: Quote | None = await avote_on_quote(guid=guid, vote_field=vote_field, direction=direction,
+                                               reverse_opposite=reverse_opposite)
+
+    if quote is None:
+        return JsonResponse(data='Quote not found', status=status.HTTP_404_NOT_FOUND, safe=False)
+
+    return JsonResponse(data=QuoteSerializer(instance=quote).data, status=status.HTTP_200_OK)
+
+
+# Like ``QuoteViewSet``, which DRF exempts from CSRF checks
+@query_budget(max_queries=2)
+@csrf_exempt
+@require_http_methods(['PATCH'])
+async def like(request: HttpRequest, guid: str) -> JsonResponse:
+    """
+    Like a quote (@see ``QuoteViewSet.like``).
+    """
+    return await vote(request=request, guid=guid, vote_field='likes')
+
+
+@query_budget(max_queries=2)
+@csrf_exempt
+@require_http_methods(['PATCH'])
+async def dislike(request: HttpRequest, guid: str) -> JsonResponse:
+    """
+    Dislike a quote (@see ``QuoteViewSet.dislike``).
+    """
+    return await vote(request=request, guid=guid, vote_field='dislikes')
@@ -0,0 +1,121 @@
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+from quotes.api.clients import BaseQuoteAPIClient, ZenQuoteAPIClient
+from quotes.api.models import Quote as QuoteData
+from quotes.benchmarks.timing import measure_latency
+from quotes.utils.quote_fetching import fetch_random_quote_data_hedged
+
+# (median latency in seconds, chance of a slow response, slow latency in seconds, chance of an error)
+STUB_SERVER_PROFILES = {
+    'fast': (0.03, 0.01, 1.0, 0.01),
+    'flaky': (0.05, 0.05, 2.0, 0.20),
+    'slow': (0.25, 0.10, 3.0, 0.05),
+}
+
+
+class StubQuoteAPIClient(ZenQuoteAPIClient):
+    """
+    ZenQuotes-compatible client for a local stub server.
+    """
+
+    def __init__(self, api_client_key: str, base_url: str) -> None:
+        self._api_client_key = api_client_key
+        self._base_url = base_url
+
+    @property
+    def api_client_key(self) -> str:
+        return self._api_client_key
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @property
+    def random_quote_url(self) -> str:
+        return self._base_url + 'random'
+
+
+def make_stub_handler(profile: tuple[float, float, float, float]) -> type[BaseHTTPRequestHandler]:
+    median_latency, slow_chance, slow_latency, error_chance = profile
+
+    class StubQuoteHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            time.sleep(slow_latency if random.random() < slow_chance else random.expovariate(1 / median_latency))
+
+            if random.random() < error_chance:
+                self.send_response(500)
+                self.end_headers()
+                return
+
+            body: bytes = json.dumps([{'q': f'Stub quote {random.random()}', 'a': 'Stub author'}]).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return StubQuoteHandler
+
+
+@contextmanager
+def stub_api_clients() -> Iterator[list[BaseQuoteAPIClient]]:
+    """
+    Run a local stub quote API server per latency profile and yield API clients for them.
+    """
+    servers: list[ThreadingHTTPServer] = []
+
+    try:
+        for profile in STUB_SERVER_PROFILES.values():
+            server = ThreadingHTTPServer(('127.0.0.1', 0), make_stub_handler(profile=profile))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers.append(server)
+
+        yield [StubQuoteAPIClient(api_client_key=f'stub_{name}', base_url=f'http://127.0.0.1:{server.server_port}/')
+               for name, server in zip(STUB_SERVER_PROFILES, servers)]
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def fetch_random_quote_data_sequentially(api_clients: list[BaseQuoteAPIClient],
+                                         max_retries: int = 10) -> QuoteData | None:
+    """
+    Baseline mirroring ``fetch_random_quote_from_api_client``'s sequential retry loop (without saving the quote).
+    """
+    for _ in range(max_retries):
+        quote_data: QuoteData | None = random.choice(api_clients).fetch_random_quote()
+
+        if quote_data is not None:
+            return quote_data
+
+    return None
+
+
+def run(iterations: int, deadline: float = 5.0, hedge_delay: float = 0.1, **options) -> list[dict[str, any]]:
+    """
+    Compare the latency of the sequential and the hedged API fetch paths against local stub servers.
+    """
+    with stub_api_clients() as api_clients:
+        return [
+            {
+                'mode': 'sequential',
+                **measure_latency(func=lambda: fetch_random_quote_data_sequentially(api_clients=api_clients),
+                                  iterations=iterations),
+            },
+            {
+                'mode': 'hedged',
+                'hedge_delay': hedge_delay,
+                **measure_latency(func=lambda: fetch_random_quote_data_hedged(
+                    api_clients=api_clients, deadline=deadline, hedge_delay=hedge_delay), iterations=iterations),
+            },
+        ]
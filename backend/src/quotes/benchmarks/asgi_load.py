@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+from typing import Iterator
+from unittest import mock
+
+from asgiref.sync import ThreadSensitiveContext
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from quotes.benchmarks.api_fan_out import StubQuoteAPIClient, make_stub_handler
+from quotes.benchmarks.timing import summarize_timings
+from quotes.models import Author, Quote, QuoteOrigin
+
+CONCURRENCY_LEVELS = (1, 10, 50)
+
+
+class StubQuoteAPIServer(ThreadingHTTPServer):
+    # The default listen backlog (5) makes the extra simultaneous connections wait for a SYN retry (1 second)
+    request_queue_size = 256
+
+
+@contextmanager
+def slow_quote_api(latency: float) -> Iterator[StubQuoteAPIClient]:
+    """
+    Route every random quote request to a local stub quote API that answers after ``latency`` seconds, and delete the
+    quotes it created afterwards.
+    """
+    server = StubQuoteAPIServer(('127.0.0.1', 0), make_stub_handler(profile=(latency, 1.0, latency, 0.0)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_client = StubQuoteAPIClient(api_client_key='stub', base_url=f'http://127.0.0.1:{server.server_port}/')
+
+    try:
+        with mock.patch.dict('quotes.utils.quote_fetching.API_CLIENTS', {'stub': api_client}, clear=True), \
+                mock.patch('quotes.utils.quote_fetching.get_random_quote_source', return_value=mock.Mock()) as source, \
+                override_settings(QUOTES_RANDOM_POOL_ENABLED=False, QUOTES_API_FETCH_MODE='sequential',
+                                  QUOTES_IMAGE_ENRICHMENT_MODE='queue'):
+            source.return_value.name = 'stub'
+            yield api_client
+    finally:
+        server.shutdown()
+        server.server_close()
+        Quote.objects.filter(origin__url=api_client.base_url).delete()
+        QuoteOrigin.objects.filter(url=api_client.base_url).delete()
+        Author.objects.filter(name='Stub author', quote__isnull=True).delete()
+
+
+def run_wsgi(url: str, concurrency: int, rounds: int) -> list[float]:
+    """
+    One sync (WSGI) worker: the requests of a round arrive together and are handled one after another.
+    """
+    client = Client()
+    timings: list[float] = []
+
+    for _ in range(rounds):
+        start_time: float = time.perf_counter()
+
+        for _ in range(concurrency):
+            client.get(url)
+            timings.append(time.perf_counter() - start_time)
+
+    return timings
+
+
+async def run_asgi(url: str, concurrency: int, rounds: int) -> list[float]:
+    """
+    One async (ASGI) worker: the requests of a round arrive together and are handled concurrently by one event loop.
+    """
+    client = AsyncClient()
+    timings: list[float] = []
+
+    async def get(start_time: float) -> None:
+        # Like the ASGI handler, give every request its own thread for synchronous code
+        async with ThreadSensitiveContext():
+            await client.get(url)
+
+        timings.append(time.perf_counter() - start_time)
+
+    for _ in range(rounds):
+        start_time: float = time.perf_counter()
+        await asyncio.gather(*(get(start_time=start_time) for _ in range(concurrency)))
+
+    return timings
+
+
+def run(iterations: int, latency: float = 0.1, concurrency_levels: tuple[int, ...] = CONCURRENCY_LEVELS,
+        **options) -> list[dict[str, any]]:
+    """
+    Compare the concurrency a single WSGI worker (``QuoteViewSet.get_random_quote``) and a single ASGI worker (the
+    async variant) sustain when every random quote comes from a quote API that takes ``latency`` seconds to answer.
+    Each concurrency level sends about ``iterations`` requests in rounds of simultaneous requests; the latencies
+    include the time spent waiting for the worker.
+    """
+    results: list[dict[str, any]] = []
+
+    with slow_quote_api(latency=latency):
+        for concurrency in concurrency_levels:
+            rounds: int = max(1, iterations // concurrency)
+
+            for server, url, func in (
+                    ('wsgi', reverse(viewname='quotes-get-random-quote'), run_wsgi),
+                    ('asgi', reverse(viewname='async-quotes-get-random-quote'),
+                     lambda **kwargs: asyncio.run(run_asgi(**kwargs))),
+            ):
+                start_time: float = time.perf_counter()
+                timings: list[float] = func(url=url, concurrency=concurrency, rounds=rounds)
+                duration: float = time.perf_counter() - start_time
+
+                results.append({
+                    'server': server,
+                    'concurrency': concurrency,
+                    'requests': len(timings),
+                    'requests_per_s': round(len(timings) / duration, 1),
+                    **summarize_timings(timings=timings),
+                })
+
+    return results
@@ -0,0 +1,66 @@
+import time
+import uuid
+from typing import Iterator
+
+from django.db import connection, transaction
+
+from contrib.db import get_index_sizes
+from quotes.api.models import Quote as QuoteData
+from quotes.models import Quote
+from quotes.tests.factories import fake
+from quotes.utils.importing import import_quotes
+
+AUTHOR_COUNT = 1_000
+CATEGORY_COUNT = 50
+SENTENCE_POOL_SIZE = 5_000
+
+
+def generate_quote_data(size: int) -> Iterator[QuoteData]:
+    """
+    Generate ``size`` unique synthetic quote records (lazily, like a file would be read), with quote texts of a
+    realistic length.
+    """
+    token: str = uuid.uuid4().hex[:8]
+    sentences: list[str] = [fake.sentence(nb_words=12) for _ in range(SENTENCE_POOL_SIZE)]
+
+    for i in range(size):
+        yield QuoteData(
+            api_client_key='zen_quotes',
+            author=f'Author {token}-{i % AUTHOR_COUNT}',
+            category=f'category-{token}-{i % CATEGORY_COUNT}',
+            origin='https://zenquotes.io/api/',
+            quote_text=f'{sentences[i % SENTENCE_POOL_SIZE]} ({token}-{i})',
+        )
+
+
+def run(sizes: list[int], iterations: int, batch_size: int = 10_000, **options) -> list[dict[str, any]]:
+    """
+    Measure the import rate of ``import_quotes`` for each corpus size, with ``COPY`` (PostgreSQL only) and with bulk
+    ``INSERT``s, and the size of the quote indexes afterwards. The imported quotes are rolled back afterwards.
+    """
+    results: list[dict[str, any]] = []
+    methods: tuple[str, ...] = ('copy', 'bulk_create') if connection.vendor == 'postgresql' else ('bulk_create',)
+
+    for size in sizes:
+        for method in methods:
+            with transaction.atomic():
+                start_time: float = time.perf_counter()
+                inserted_count: int = sum(
+                    inserted for _, inserted in import_quotes(quotes_data=generate_quote_data(size=size),
+                                                              batch_size=batch_size, use_copy=method == 'copy',
+                                                              enqueue_images=False))
+                duration: float = time.perf_counter() - start_time
+                index_sizes: dict[str, int] = get_index_sizes(db_table=Quote._meta.db_table)
+
+                transaction.set_rollback(True)
+
+            results.append({
+                'size': size,
+                'method': method,
+                'inserted': inserted_count,
+                'duration_s': round(duration, 3),
+                'quotes_per_s': round(inserted_count / duration, 1),
+                'index_kb': round(sum(index_sizes.values()) / 1024),
+            })
+
+    return results
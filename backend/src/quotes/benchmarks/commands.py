@@ -0,0 +1,93 @@
+import io
+import itertools
+import tempfile
+import threading
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator
+from unittest import mock
+
+from django.core.management import call_command
+from tqdm import tqdm
+
+from quotes.api.models import Quote as QuoteData
+from quotes.benchmarks.bulk_import import generate_quote_data
+from quotes.benchmarks.corpus import synthetic_corpus
+from quotes.benchmarks.timing import measure
+from quotes.models import ImageEnrichmentJob, Quote
+
+IMAGE_LOOKUP_RESULT = ('https://images.unsplash.com/photo-benchmark', 'A synthetic image')
+
+
+def offline_commands(stack: ExitStack) -> None:
+    """
+    Replace the external APIs the management commands call (and their rate limiters) with instant local stubs, and hide
+    their progress bars.
+    """
+    quote_data: Iterator[QuoteData] = generate_quote_data(size=10 ** 12)
+    quote_data_lock = threading.Lock()
+
+    def fetch_quote_data() -> QuoteData:
+        # ``pre_populate_db`` fetches from several threads, and a generator can't be advanced concurrently
+        with quote_data_lock:
+            return next(quote_data)
+
+    stack.enter_context(mock.patch('contrib.api.clients.UnsplashImageAPIClient.get_random_image_with_parameters',
+                                   return_value=IMAGE_LOOKUP_RESULT))
+    stack.enter_context(mock.patch('quotes.management.commands.pre_populate_db.Command.fetch_quote_data',
+                                   side_effect=fetch_quote_data))
+
+    for command in ('add_missing_images', 'process_image_enrichment'):
+        stack.enter_context(mock.patch(f'quotes.management.commands.{command}.get_rate_limiter'))
+
+    for command in ('add_missing_images', 'import_quotes', 'pre_populate_db'):
+        stack.enter_context(mock.patch(f'quotes.management.commands.{command}.tqdm', partial(tqdm, disable=True)))
+
+
+def write_quote_records(path: Path, size: int) -> None:
+    with path.open('w', encoding='utf-8') as file:
+        for quote_data in generate_quote_data(size=size):
+            file.write(f'{quote_data.model_dump_json()}\n')
+
+
+def run(sizes: list[int], iterations: int, batch_size: int = 100, **options) -> list[dict[str, any]]:
+    """
+    Measure the latency, queries and peak memory of the management commands processing a batch of ``batch_size``
+    quotes on top of each corpus size, with the external APIs stubbed, so the benchmark runs offline. Every call
+    works on new quotes (or images), like consecutive runs would.
+    """
+    results: list[dict[str, any]] = []
+
+    with tempfile.TemporaryDirectory() as directory, ExitStack() as stack:
+        offline_commands(stack=stack)
+        records_paths: Iterator[Path] = (Path(directory) / f'quotes-{i}.jsonl' for i in itertools.count())
+
+        def import_quotes() -> None:
+            path: Path = next(records_paths)
+            write_quote_records(path=path, size=batch_size)
+            call_command('import_quotes', str(path), no_images=True, stdout=io.StringIO())
+
+        def process_image_enrichment() -> None:
+            ImageEnrichmentJob.objects.bulk_create(
+                [ImageEnrichmentJob(quote=quote) for quote in
+                 Quote.objects.filter(image_url__isnull=True, image_enrichment_job__isnull=True)[:batch_size]])
+            call_command('process_image_enrichment', once=True, batch_size=batch_size, stdout=io.StringIO())
+
+        cases: dict[str, Callable[[], any]] = {
+            'import_quotes': import_quotes,
+            'pre_populate_db': lambda: call_command('pre_populate_db', number_of_quotes=batch_size,
+                                                    batch_size=batch_size, stdout=io.StringIO(),
+                                                    stderr=io.StringIO()),
+            'add_missing_images': lambda: call_command('add_missing_images', number_of_quotes=batch_size,
+                                                       stdout=io.StringIO(), stderr=io.StringIO()),
+            'process_image_enrichment': process_image_enrichment,
+        }
+
+        for size in sizes:
+            with synthetic_corpus(size=size):
+                for case, func in cases.items():
+                    results.append({'size': size, 'case': case, 'batch_size': batch_size,
+                                    **measure(func=func, iterations=iterations)})
+
+    return results
@@ -0,0 +1,84 @@
+import random
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+import factory.random
+from django.db import connection, transaction
+
+from quotes.models import Author, Category, Quote, QuoteOrigin, compute_quote_hash
+from quotes.tests.factories import AuthorFactory, CategoryFactory, QuoteOriginFactory, fake
+from quotes.utils.categories import refresh_category_quote_counts
+from quotes.utils.db_operations import copy_quotes
+from quotes.utils.search import update_search_vectors
+
+AUTHOR_COUNT = 1_000
+CATEGORY_COUNT = 50
+SENTENCE_POOL_SIZE = 5_000
+
+
+def generate_corpus(size: int, batch_size: int = 10_000, seed: int = 0) -> list[Category]:
+    """
+    Bulk-insert ``size`` synthetic quotes (with a small set of authors, categories and origins built with the test
+    factories) and return the created categories.
+
+    The rows are built from a pool of factory data instead of a factory (and its sub-factories) per quote, and inserted
+    with ``COPY`` on PostgreSQL, so even a corpus of millions of quotes only takes minutes. The same ``seed`` generates
+    the same corpus (apart from a unique suffix that keeps the names unique between runs).
+    """
+    random.seed(seed)
+    # The module-level ``fake`` and the factories' ``factory.Faker`` declarations use different random generators
+    fake.seed_instance(seed)
+    factory.random.reseed_random(seed)
+    token: str = uuid.uuid4().hex[:8]
+    authors: list[Author] = Author.objects.bulk_create(
+        [Author(name=f'{author.name} ({token}-{i})') for i, author in
+         enumerate(AuthorFactory.build_batch(size=AUTHOR_COUNT))])
+    categories: list[Category] = Category.objects.bulk_create(
+        [Category(name=f'{category.name}-{token}-{i}') for i, category in
+         enumerate(CategoryFactory.build_batch(size=CATEGORY_COUNT))])
+    origin: QuoteOrigin = QuoteOriginFactory()
+    sentences: list[str] = [fake.sentence(nb_words=12) for _ in range(SENTENCE_POOL_SIZE)]
+
+    for batch_start in range(0, size, batch_size):
+        quotes: list[Quote] = []
+
+        for i in range(batch_start, min(batch_start + batch_size, size)):
+            quote_text: str = f'{sentences[i % SENTENCE_POOL_SIZE]} ({token}-{i})'
+            quote = Quote(
+                author=authors[i % AUTHOR_COUNT],
+                category=categories[i % CATEGORY_COUNT],
+                origin=origin,
+                quote_text=quote_text,
+                quote_hash=compute_quote_hash(quote_text=quote_text),
+                likes=i % 1_000,
+                dislikes=i % 97,
+            )
+            quote.update_ranking_scores()
+            quotes.append(quote)
+
+        if connection.vendor == 'postgresql':
+            copy_quotes(quotes=quotes)
+        else:
+            Quote.objects.bulk_create(quotes, batch_size=batch_size)
+
+    update_search_vectors(queryset=Quote.objects.filter(category__in=categories))
+    refresh_category_quote_counts(categories=Category.objects.filter(pk__in=[category.pk for category in categories]))
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(Quote._meta.db_table)}')
+
+    return categories
+
+
+@contextmanager
+def synthetic_corpus(size: int, seed: int = 0) -> Iterator[list[Category]]:
+    """
+    Generate a synthetic corpus for the duration of the ``with`` block and roll it back afterwards, leaving the
+    database untouched.
+    """
+    with transaction.atomic():
+        yield generate_corpus(size=size, seed=seed)
+
+        transaction.set_rollback(True)
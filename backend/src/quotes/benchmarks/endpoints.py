@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from quotes.benchmarks.corpus import synthetic_corpus
+from quotes.benchmarks.timing import measure
+from quotes.enums import QuoteSource
+from quotes.models import Category, Quote
+from quotes.sampling.weighted import get_weighted_sampler
+
+
+@contextmanager
+def offline_database_source() -> Iterator[None]:
+    """
+    Serve every random quote from the database (never from a quote API), without the random quote pool and the
+    response cache, so only the work of the endpoint itself is measured. The weighted sampler is reloaded for (and
+    after) the block, as the corpus is rolled back.
+    """
+    get_weighted_sampler().invalidate()
+
+    try:
+        with mock.patch('quotes.utils.quote_fetching.get_random_quote_source', return_value=QuoteSource.DATABASE), \
+                override_settings(QUOTES_RANDOM_POOL_ENABLED=False, RESPONSE_CACHE_TIMEOUT=0):
+            yield
+    finally:
+        get_weighted_sampler().invalidate()
+
+
+def get_endpoint_cases(client: APIClient, quote: Quote, category: Category) -> dict[str, Callable[[], any]]:
+    """
+    Get a request for each ``QuoteViewSet`` endpoint (and mode), by case name.
+    """
+    random_quote_url: str = reverse(viewname='quotes-get-random-quote')
+    requests: dict[str, tuple[str, str] | tuple[str, str, dict[str, any]]] = {
+        'list': ('get', reverse(viewname='quotes-list')),
+        'retrieve': ('get', reverse(viewname='quotes-detail', kwargs={'guid': quote.guid})),
+        'get_random_quote': ('get', random_quote_url),
+        'get_random_quote_stream': ('get', f'{random_quote_url}?mode=stream'),
+        'get_random_quote_weighted': ('get', f'{random_quote_url}?mode=weighted'),
+        'get_random_quotes': ('get', f'{reverse(viewname="quotes-get-random-quotes")}?count=10'),
+        'get_random_quote_by_category': (
+            'get', f'{reverse(viewname="quotes-get-random-quote-by-category")}?category={category.name}'),
+        'get_most_liked_quotes': ('get', reverse(viewname='quotes-get-most-liked-quotes')),
+        # Only reads the (empty) pool, the pool is not refilled until a quote is taken from it
+        'get_random_quote_pool_stats': ('get', reverse(viewname='quotes-get-random-quote-pool-stats'),
+                                        {'QUOTES_RANDOM_POOL_ENABLED': True}),
+        'get_quote_source_stats': ('get', reverse(viewname='quotes-get-quote-source-stats')),
+        'get_quote_ingestion_stats': ('get', reverse(viewname='quotes-get-quote-ingestion-stats')),
+        'like': ('patch', reverse(viewname='quotes-like', kwargs={'guid': quote.guid})),
+        'dislike': ('patch', reverse(viewname='quotes-dislike', kwargs={'guid': quote.guid})),
+    }
+
+    def make_request(method: str, url: str, overrides: dict[str, any] = None) -> Callable[[], any]:
+        def request() -> None:
+            with override_settings(**overrides or {}):
+                response = getattr(client, method)(url)
+
+            if response.status_code != 200:
+                raise RuntimeError(f'{method.upper()} {url} returned a {response.status_code}')
+
+        return request
+
+    return {case: make_request(*request) for case, request in requests.items()}
+
+
+def run(sizes: list[int], iterations: int, **options) -> list[dict[str, any]]:
+    """
+    Measure the latency, queries per request and peak memory of every ``QuoteViewSet`` endpoint, for each corpus size.
+    Random quotes always come from the database, so the benchmark runs offline.
+    """
+    results: list[dict[str, any]] = []
+    client = APIClient()
+
+    for size in sizes:
+        with synthetic_corpus(size=size) as categories, offline_database_source():
+            quote: Quote = Quote.objects.order_by('pk').first()
+
+            for case, func in get_endpoint_cases(client=client, quote=quote, category=categories[0]).items():
+                results.append({'size': size, 'case': case, **measure(func=func, iterations=iterations)})
+
+    return results
@@ -0,0 +1,69 @@
+import math
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.pagination import Cursor
+from rest_framework.test import APIClient
+
+from contrib.pagination import KeysetPagination
+from quotes.benchmarks.corpus import synthetic_corpus
+from quotes.benchmarks.timing import measure_latency
+from quotes.models import Quote
+
+
+def get_cursor_url(url: str, page: int, page_size: int) -> str:
+    """
+    Get the URL of a page in cursor mode, as if the client followed the ``next`` links from the first page.
+    """
+    if page == 1:
+        return url
+
+    paginator = KeysetPagination()
+    paginator.base_url = url
+    position: int = Quote.objects.order_by('-pk').values_list('pk', flat=True)[(page - 1) * page_size - 1]
+
+    return paginator.encode_cursor(Cursor(offset=0, reverse=False, position=str(position)))
+
+
+def run(sizes: list[int], iterations: int, page: int = 1000, **options) -> list[dict[str, any]]:
+    """
+    Compare the latency of a deep page of the quote list with page number pagination (``COUNT(*)`` and ``OFFSET``) and
+    cursor pagination (with and without an approximate count), for each corpus size.
+    """
+    results: list[dict[str, any]] = []
+    client = APIClient()
+    url: str = reverse(viewname='quotes-list')
+    page_size: int = settings.REST_FRAMEWORK['PAGE_SIZE']
+
+    for size in sizes:
+        with synthetic_corpus(size=size):
+            size_page: int = max(1, min(page, math.ceil(size / page_size)))
+            cases: dict[str, tuple[str, str]] = {
+                'page_number': ('page_number', f'{url}?page={size_page}'),
+                'cursor': ('cursor', get_cursor_url(url=url, page=size_page, page_size=page_size)),
+            }
+            cases['cursor_approximate_count'] = ('cursor', f'{cases["cursor"][1]}'
+                                                           f'{"&" if "?" in cases["cursor"][1] else "?"}'
+                                                           f'approximate_count=true')
+
+            for case, (pagination, page_url) in cases.items():
+                # Disable the response cache, every request is served from the database
+                with override_settings(QUOTES_LIST_PAGINATION=pagination, RESPONSE_CACHE_TIMEOUT=0):
+                    with CaptureQueriesContext(connection=connection) as queries:
+                        response = client.get(page_url)
+
+                    if response.status_code != 200:
+                        raise RuntimeError(f'{case} returned a {response.status_code} for {page_url}')
+
+                    results.append({
+                        'size': size,
+                        'page': size_page,
+                        'pagination': case,
+                        'queries': len(queries),
+                        **measure_latency(func=lambda: client.get(page_url), iterations=iterations),
+                    })
+
+    return results
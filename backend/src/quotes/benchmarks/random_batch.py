@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from quotes.benchmarks.corpus import synthetic_corpus
+from quotes.benchmarks.timing import measure_latency
+from quotes.enums import QuoteSource
+
+
+def run(sizes: list[int], iterations: int, count: int = 10, **options) -> list[dict[str, any]]:
+    """
+    Compare the latency (and number of queries) of fetching ``count`` random quotes with ``count`` calls to
+    ``get_random_quote`` and with a single ``get_random_quotes`` call, for each corpus size.
+
+    The single calls are forced to the database source (and the random quote pool is disabled), so both cases only
+    measure sampling and serialization.
+    """
+    results: list[dict[str, any]] = []
+    client = APIClient()
+    single_url: str = reverse(viewname='quotes-get-random-quote')
+    batch_url: str = f'{reverse(viewname="quotes-get-random-quotes")}?count={count}'
+
+    def fetch_single() -> None:
+        for _ in range(count):
+            response = client.get(single_url)
+
+            if response.status_code != 200:
+                raise RuntimeError(f'get_random_quote returned a {response.status_code}')
+
+    def fetch_batch() -> None:
+        response = client.get(batch_url)
+
+        if response.status_code != 200:
+            raise RuntimeError(f'get_random_quotes returned a {response.status_code}')
+
+    for size in sizes:
+        with synthetic_corpus(size=size), override_settings(QUOTES_RANDOM_POOL_ENABLED=False):
+            with mock.patch('quotes.utils.quote_fetching.get_random_quote_source', return_value=QuoteSource.DATABASE):
+                for case, func in (('single_calls', fetch_single), ('batch', fetch_batch)):
+                    with CaptureQueriesContext(connection=connection) as queries:
+                        func()
+
+                    results.append({
+                        'size': size,
+                        'count': count,
+                        'case': case,
+                        'requests': count if case == 'single_calls' else 1,
+                        'queries': len(queries),
+                        **measure_latency(func=func, iterations=iterations),
+                    })
+
+    return results
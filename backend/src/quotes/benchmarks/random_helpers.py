@@ -0,0 +1,40 @@
+from typing import Callable
+
+from django.contrib.sessions.backends.base import SessionBase
+
+from quotes.benchmarks.corpus import synthetic_corpus
+from quotes.benchmarks.endpoints import offline_database_source
+from quotes.benchmarks.timing import measure
+from quotes.models import Category
+from quotes.utils.quote_fetching import (
+    fetch_random_quote, fetch_random_quote_from_database, fetch_random_quotes_from_database,
+    fetch_stream_quote_from_database, fetch_weighted_quote_from_database,
+)
+
+
+def run(sizes: list[int], iterations: int, **options) -> list[dict[str, any]]:
+    """
+    Measure the latency, queries per call and peak memory of the random quote helpers of ``quote_fetching`` (without
+    the HTTP layer), for each corpus size. Random quotes always come from the database, so the benchmark runs offline.
+    """
+    results: list[dict[str, any]] = []
+
+    for size in sizes:
+        with synthetic_corpus(size=size) as categories, offline_database_source():
+            category: Category = categories[0]
+            # An in-memory session, like a new visitor's
+            session = SessionBase()
+            cases: dict[str, Callable[[], any]] = {
+                'fetch_random_quote': fetch_random_quote,
+                'fetch_random_quote_from_database': fetch_random_quote_from_database,
+                'fetch_random_quote_from_database_category': lambda: fetch_random_quote_from_database(
+                    category=category.name),
+                'fetch_random_quotes_from_database': lambda: fetch_random_quotes_from_database(count=10),
+                'fetch_stream_quote_from_database': lambda: fetch_stream_quote_from_database(session=session),
+                'fetch_weighted_quote_from_database': fetch_weighted_quote_from_database,
+            }
+
+            for case, func in cases.items():
+                results.append({'size': size, 'case': case, **measure(func=func, iterations=iterations)})
+
+    return results
@@ -0,0 +1,33 @@
+from quotes.benchmarks.corpus import synthetic_corpus
+from quotes.benchmarks.timing import measure_latency
+from quotes.models import Category, Quote
+from quotes.sampling.registry import RANDOM_SAMPLERS
+from quotes.sampling.samplers import BaseRandomSampler
+
+
+def run(sizes: list[int], iterations: int, **options) -> list[dict[str, any]]:
+    """
+    Compare the latency of every random sampler, with and without a category filter, for each corpus size.
+    """
+    results: list[dict[str, any]] = []
+
+    for size in sizes:
+        with synthetic_corpus(size=size) as categories:
+            category: Category = categories[0]
+
+            for sampler_key, sampler in RANDOM_SAMPLERS.items():
+                sampler: BaseRandomSampler
+                for category_filter in (None, category.name):
+                    queryset = Quote.objects.all()
+
+                    if category_filter:
+                        queryset = queryset.filter(category__name__icontains=category_filter)
+
+                    results.append({
+                        'size': size,
+                        'sampler': sampler_key,
+                        'category_filter': bool(category_filter),
+                        **measure_latency(func=lambda: sampler.sample(queryset=queryset), iterations=iterations),
+                    })
+
+    return results
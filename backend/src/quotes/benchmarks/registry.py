@@ -0,0 +1,19 @@
+from . import (
+    api_fan_out, asgi_load, bulk_import, commands, endpoints, pagination, random_batch, random_helpers, random_sampling,
+    search, serialization, vote_contention,
+)
+
+BENCHMARKS = {
+    'api_fan_out': api_fan_out.run,
+    'asgi_load': asgi_load.run,
+    'bulk_import': bulk_import.run,
+    'commands': commands.run,
+    'endpoints': endpoints.run,
+    'pagination': pagination.run,
+    'random_batch': random_batch.run,
+    'random_helpers': random_helpers.run,
+    'random_sampling': random_sampling.run,
+    'search': search.run,
+    'serialization': serialization.run,
+    'vote_contention': vote_contention.run,
+}
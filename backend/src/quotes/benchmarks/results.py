@@ -0,0 +1,80 @@
+import json
+import platform
+from pathlib import Path
+
+import django
+from django.db import connection
+from django.utils import timezone
+
+# Metrics that improve when they go down, by name or suffix (the ``*_per_s`` rates improve when they go up)
+LOWER_IS_BETTER_METRICS = ('queries',)
+LOWER_IS_BETTER_SUFFIXES = ('_ms', '_s', '_kb')
+HIGHER_IS_BETTER_SUFFIXES = ('_per_s',)
+
+
+def is_metric(key: str) -> bool:
+    return key in LOWER_IS_BETTER_METRICS or key.endswith(LOWER_IS_BETTER_SUFFIXES)
+
+
+def get_case_key(result: dict[str, any]) -> tuple:
+    """
+    Identify a result by its parameters (everything but the metrics), to match it with the same case of another run.
+    """
+    return tuple(sorted((key, value) for key, value in result.items() if not is_metric(key=key)))
+
+
+def save_results(path: Path, benchmark: str, results: list[dict[str, any]]) -> None:
+    """
+    Store the results of a benchmark run as JSON, with the environment they were measured in.
+    """
+    path.write_text(json.dumps({
+        'benchmark': benchmark,
+        'timestamp': timezone.now().isoformat(),
+        'environment': {
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }, indent=2), encoding='utf-8')
+
+
+def load_results(path: Path) -> dict[str, any]:
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def compare_results(results: list[dict[str, any]], baseline: list[dict[str, any]],
+                    threshold: float) -> list[dict[str, any]]:
+    """
+    Compare the metrics of each case with the same case of a baseline run, and return the regressions: metrics that
+    got worse by more than a factor ``threshold`` (e.g. 1.25 for 25% slower).
+    """
+    baseline_by_case: dict[tuple, dict[str, any]] = {get_case_key(result=result): result for result in baseline}
+    regressions: list[dict[str, any]] = []
+
+    for result in results:
+        baseline_result: dict[str, any] | None = baseline_by_case.get(get_case_key(result=result))
+
+        if baseline_result is None:
+            continue
+
+        for key, value in result.items():
+            baseline_value: int | float | None = baseline_result.get(key)
+
+            if not is_metric(key=key) or not baseline_value or not value:
+                continue
+
+            # How many times worse the metric got
+            ratio: float = baseline_value / value if key.endswith(HIGHER_IS_BETTER_SUFFIXES) else value / baseline_value
+
+            if ratio > threshold:
+                regressions.append({
+                    'case': {key: value for key, value in get_case_key(result=result)},
+                    'metric': key,
+                    'baseline': baseline_value,
+                    'value': value,
+                    'ratio': round(ratio, 2),
+                })
+
+    return regressions
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, QuerySet
+
+from quotes.benchmarks.corpus import synthetic_corpus
+from quotes.benchmarks.timing import measure
+from quotes.models import Quote
+from quotes.utils.search import search_quotes
+
+
+def naive_search(query: str) -> QuerySet:
+    """
+    What the search would be without an index: a case-insensitive substring scan of the quote text, author and
+    category of every quote.
+    """
+    return Quote.objects.filter(
+        Q(quote_text__icontains=query) | Q(author__name__icontains=query) | Q(category__name__icontains=query)
+    ).order_by('-pk')
+
+
+def run(sizes: list[int], iterations: int, **options) -> list[dict[str, any]]:
+    """
+    Compare the latency of the first page of search results (the count and page queries, like the ``search`` endpoint)
+    of ``search_quotes`` (full-text search on PostgreSQL, the substring fallback elsewhere) and of a naive ``icontains``
+    scan, for a common word, an author and a word that matches nothing, for each corpus size.
+    """
+    results: list[dict[str, any]] = []
+    page_size: int = settings.REST_FRAMEWORK['PAGE_SIZE']
+    method: str = 'full_text' if connection.vendor == 'postgresql' else 'fallback'
+
+    for size in sizes:
+        with synthetic_corpus(size=size):
+            quote: Quote = Quote.objects.select_related('author').order_by('pk').first()
+            queries: dict[str, str] = {
+                'word': max(quote.quote_text.split()[:-1], key=len).strip('.'),
+                'author': quote.author.name.split()[0],
+                'no_match': 'xylophonically',
+            }
+
+            for query_name, query in queries.items():
+                for case, get_queryset in ((method, search_quotes), ('icontains', naive_search)):
+                    def search() -> None:
+                        queryset: QuerySet = get_queryset(query=query)
+                        queryset.count()
+                        list(queryset[:page_size])
+
+                    results.append({'size': size, 'query': query_name, 'case': case,
+                                    **measure(func=search, iterations=iterations)})
+
+    return results
@@ -0,0 +1,41 @@
+import statistics
+import time
+
+from quotes.benchmarks.corpus import synthetic_corpus
+from quotes.models import Quote
+from quotes.serializers import FastQuoteSerializer, QuoteSerializer
+
+
+def run(sizes: list[int], iterations: int, **options) -> list[dict[str, any]]:
+    """
+    Compare the throughput (serialized quotes per second, excluding the query) of ``QuoteSerializer`` and
+    ``FastQuoteSerializer`` on model instances and on ``.values()`` rows, serializing ``size`` quotes at once.
+    """
+    results: list[dict[str, any]] = []
+
+    for size in sizes:
+        with synthetic_corpus(size=size):
+            quotes: list[Quote] = list(Quote.objects.select_related('author', 'category', 'origin'))
+            rows: list[dict[str, any]] = list(Quote.objects.values(*FastQuoteSerializer.values_fields))
+            cases: dict[str, tuple[type[QuoteSerializer | FastQuoteSerializer], list]] = {
+                'quote_serializer': (QuoteSerializer, quotes),
+                'fast_quote_serializer_instances': (FastQuoteSerializer, quotes),
+                'fast_quote_serializer_values': (FastQuoteSerializer, rows),
+            }
+
+            for case, (serializer_class, instances) in cases.items():
+                durations: list[float] = []
+
+                for _ in range(iterations):
+                    start_time: float = time.perf_counter()
+                    serializer_class(instance=instances, many=True).data  # noqa: B018
+                    durations.append(time.perf_counter() - start_time)
+
+                results.append({
+                    'size': size,
+                    'serializer': case,
+                    'median_ms': round(statistics.median(durations) * 1000, 3),
+                    'quotes_per_s': round(size / statistics.median(durations)),
+                })
+
+    return results
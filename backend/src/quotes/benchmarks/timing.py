@@ -0,0 +1,62 @@
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def summarize_timings(timings: list[float]) -> dict[str, float]:
+    """
+    Summarize a list of timings (in seconds) as latency percentiles in milliseconds.
+    """
+    timings_ms: list[float] = sorted(timing * 1000 for timing in timings)
+    percentiles: list[float] = statistics.quantiles(timings_ms, n=100, method='inclusive') if len(
+        timings_ms) > 1 else timings_ms * 99
+
+    return {
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+        'p99_ms': round(percentiles[98], 3),
+        'mean_ms': round(statistics.fmean(timings_ms), 3),
+        'max_ms': round(timings_ms[-1], 3),
+    }
+
+
+def measure_latency(func: Callable[[], any], iterations: int) -> dict[str, float]:
+    """
+    Call ``func`` ``iterations`` times and summarize the latency of the calls.
+    """
+    timings: list[float] = []
+
+    for _ in range(iterations):
+        start_time: float = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+
+    return summarize_timings(timings=timings)
+
+
+def measure_call(func: Callable[[], any]) -> dict[str, int | float]:
+    """
+    Call ``func`` once and return the number of queries it ran and its peak (traced) memory allocation.
+    """
+    tracemalloc.start()
+
+    try:
+        with CaptureQueriesContext(connection=connection) as queries:
+            func()
+
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'queries': len(queries), 'peak_memory_kb': round(peak_memory / 1024, 1)}
+
+
+def measure(func: Callable[[], any], iterations: int) -> dict[str, int | float]:
+    """
+    Measure the queries and peak memory of a single call to ``func``, and the latency of ``iterations`` calls.
+    """
+    return {**measure_call(func=func), **measure_latency(func=func, iterations=iterations)}
@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import override_settings
+
+from quotes.benchmarks.timing import summarize_timings
+from quotes.models import Quote
+from quotes.tests.factories import QuoteFactory
+from quotes.utils.votes import compact_vote_shards, vote_on_quote
+
+# Vote counter cases: direct updates of the quote row (no shards) and sharded counters with 1 and 16 shards
+SHARD_COUNTS = (0, 1, 16)
+
+
+def vote_concurrently(guid: str, threads: int, votes_per_thread: int) -> tuple[list[float], float]:
+    """
+    Like the same quote from ``threads`` threads at once (each with its own database connection), ``votes_per_thread``
+    times each, and return the latency of every vote and the total duration.
+    """
+    barrier = threading.Barrier(parties=threads)
+
+    def vote() -> list[float]:
+        timings: list[float] = []
+
+        try:
+            barrier.wait()
+
+            for _ in range(votes_per_thread):
+                start_time: float = time.perf_counter()
+                vote_on_quote(guid=guid, vote_field='likes', direction='increase')
+                timings.append(time.perf_counter() - start_time)
+        finally:
+            connection.close()
+
+        return timings
+
+    start_time: float = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='vote-contention') as executor:
+        futures = [executor.submit(vote) for _ in range(threads)]
+        timings: list[float] = [timing for future in futures for timing in future.result()]
+
+    return timings, time.perf_counter() - start_time
+
+
+def run(iterations: int, threads: int = 16, shard_counts: tuple[int, ...] = SHARD_COUNTS,
+        **options) -> list[dict[str, any]]:
+    """
+    Compare the throughput of concurrent likes of a single (hot) quote when every vote updates the quote row and when
+    the votes are spread over sharded counters (``QUOTES_VOTE_SHARDS``), with ``threads`` threads voting ``iterations``
+    times each.
+
+    The threads need to see the quote, so it is committed (and deleted afterwards) instead of rolled back. Every case
+    checks that no vote was lost once the shards are compacted.
+    """
+    results: list[dict[str, any]] = []
+
+    for shard_count in shard_counts:
+        quote: Quote = QuoteFactory(likes=0, dislikes=0)
+
+        try:
+            with override_settings(QUOTES_VOTE_SHARDS=shard_count, QUOTES_VOTE_WRITE_BEHIND=False,
+                                   QUOTES_RANDOM_POOL_ENABLED=False):
+                timings, duration = vote_concurrently(guid=str(quote.guid), threads=threads,
+                                                      votes_per_thread=iterations)
+                compact_vote_shards(batch_size=1)
+
+            quote.refresh_from_db()
+
+            if quote.likes != len(timings):
+                raise RuntimeError(
+                    f'Lost {len(timings) - quote.likes} of {len(timings)} votes with {shard_count} shards')
+
+            results.append({
+                'shards': shard_count,
+                'threads': threads,
+                'votes_per_s': round(len(timings) / duration, 1),
+                **summarize_timings(timings=timings),
+            })
+        finally:
+            quote.delete()
+
+    return results
@@ -1,5 +1,15 @@
 from enum import Enum
 
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
 from quotes.api.registry import API_CLIENTS
 
 QuoteSource = Enum('QuoteSource', {'DATABASE': 'database', **API_CLIENTS})
+
+
+class ImageEnrichmentStatus(models.TextChoices):
+    PENDING = 'pending', _('Pending')
+    PROCESSING = 'processing', _('Processing')
+    DONE = 'done', _('Done')
+    FAILED = 'failed', _('Failed')
@@ -1,16 +1,22 @@
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
 
 import humanize
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db.models import QuerySet
+from django.utils import timezone
 from pydantic import HttpUrl
 from tqdm import tqdm
 
 from contrib.api.clients import UnsplashImageAPIClient
-from quotes.api.clients import BaseQuoteAPIClient
-from quotes.api.registry import API_CLIENTS
-from quotes.models import Quote
+from contrib.api.rate_limiting import get_rate_limiter
+from quotes.enums import ImageEnrichmentStatus
+from quotes.models import ImageEnrichmentJob, Quote
+from quotes.utils.images import get_image_search_query
+from quotes.utils.random_pool import get_random_quote_pool
 
 logger = logging.getLogger('quotes')
 
@@ -22,21 +28,43 @@ class Command(BaseCommand):
         parser.add_argument(
             '--number_of_quotes',
             type=int,
-            help='Number of quotes to update (default: %(default)s)',
+            help='Number of quotes to update, 0 for all of them (default: %(default)s)',
             default=50,
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of concurrent image lookups (default: %(default)s)',
+            default=4,
+        )
+        parser.add_argument(
+            '--chunk_size', '--chunk-size',
+            type=int,
+            help='Number of quotes to read and update at once (default: %(default)s)',
+            default=500,
+        )
 
     def handle(self, *args, **options) -> None:
         start_time = time.time()
         number_of_quotes: int = options['number_of_quotes']
+        chunk_size: int = options['chunk_size']
 
-        self.stdout.write(self.style.SUCCESS(f'Searching for missing images for {number_of_quotes} quotes.'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Searching for missing images for {number_of_quotes or "all"} quotes.'))
 
         success_count: int
         fail_count: int
         success_count, fail_count = 0, 0
-        quotes_without_images: QuerySet = Quote.objects.filter(image_url__isnull=True).order_by('created')[
-                                          :number_of_quotes]
+        quotes_without_images: QuerySet = (
+            Quote.objects
+            .filter(image_url__isnull=True)
+            .select_related('origin', 'category')
+            .order_by('created')
+        )
+
+        if number_of_quotes:
+            quotes_without_images = quotes_without_images[:number_of_quotes]
+
         quotes_without_images_count: int = quotes_without_images.count()
 
         if quotes_without_images_count == 0:
@@ -49,40 +77,65 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.NOTICE(f'Found {quotes_without_images_count} quotes with missing images.'))
 
-        with tqdm(total=quotes_without_images_count, desc="Processing missing images") as progress_bar:
-            image_api_client = UnsplashImageAPIClient()
-
-            for quote in quotes_without_images:
-                try:
-                    api_client: BaseQuoteAPIClient = API_CLIENTS.get(quote.origin.api_client_key)
-
-                    if hasattr(api_client, 'image_search_query'):
-                        image_search_query: str = getattr(api_client, 'image_search_query')
-                    else:
-                        image_search_query: str = quote.category.name
+        image_api_client = UnsplashImageAPIClient()
 
-                    image_url: HttpUrl | None
-                    image_alt_text: str | None
-                    image_url, image_alt_text = image_api_client.get_random_image_with_parameters(
-                        image_search_query=image_search_query)
+        with tqdm(total=quotes_without_images_count, desc="Processing missing images") as progress_bar, \
+                ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='add-missing-images') as executor:
+            # Stream the quotes, so only one chunk is in memory at a time
+            for chunk in batched(quotes_without_images.iterator(chunk_size=chunk_size), chunk_size):
+                results = executor.map(lambda quote: self.lookup_image(image_api_client=image_api_client, quote=quote),
+                                       chunk)
+                updated_quotes: list[Quote] = []
+                now = timezone.now()
 
+                for quote, (image_url, image_alt_text) in zip(chunk, results):
                     if image_url is None:
                         fail_count += 1
-                        continue
-
-                    quote.image_url = image_url
-                    quote.image_alt_text = image_alt_text
-                    quote.save()
-                    success_count += 1
-                except Exception as e:
-                    logger.exception(msg=e)
-                    fail_count += 1
-                finally:
+                    else:
+                        quote.image_url = str(image_url)
+                        quote.image_alt_text = image_alt_text
+                        quote.modified = now
+                        updated_quotes.append(quote)
+
                     progress_bar.update(1)
 
+                success_count += self.save_images(quotes=updated_quotes)
+
         end_time = time.time()
         time_elapsed = humanize.precisedelta(end_time - start_time)
 
         self.stdout.write(
             self.style.SUCCESS(
                 f'Added images to {success_count} quotes ({fail_count} failed) - took {time_elapsed}.'))
+
+    @staticmethod
+    def lookup_image(image_api_client: UnsplashImageAPIClient, quote: Quote) -> tuple[HttpUrl | None, str | None]:
+        try:
+            image_search_query: str | None = get_image_search_query(quote=quote)
+            get_rate_limiter(key=image_api_client.BREAKER_KEY).acquire()
+
+            return image_api_client.get_random_image_with_parameters(image_search_query=image_search_query)
+        except Exception as e:
+            logger.exception(msg=e)
+
+            return None, None
+
+    @staticmethod
+    def save_images(quotes: list[Quote]) -> int:
+        if not quotes:
+            return 0
+
+        try:
+            Quote.objects.bulk_update(quotes, fields=('image_url', 'image_alt_text', 'modified'))
+            ImageEnrichmentJob.objects.filter(quote__in=quotes).update(status=ImageEnrichmentStatus.DONE,
+                                                                       modified=timezone.now())
+        except Exception as e:
+            logger.exception(msg=e)
+
+            return 0
+
+        if settings.QUOTES_RANDOM_POOL_ENABLED:
+            for quote in quotes:
+                get_random_quote_pool().evict(guid=quote.guid)
+
+        return len(quotes)
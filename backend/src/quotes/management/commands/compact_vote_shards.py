@@ -0,0 +1,49 @@
+import time
+
+import humanize
+from django.core.management.base import BaseCommand
+
+from quotes.utils.votes import compact_vote_shards
+
+
+class Command(BaseCommand):
+    help = 'Fold the sharded vote counters into the votes of their quotes (runs until interrupted, unless --once).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            help='Number of quotes to compact per transaction (default: %(default)s)',
+            default=500,
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Seconds to wait between compactions (default: %(default)s)',
+            default=60.0,
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Stop after a single compaction',
+        )
+
+    def handle(self, *args, **options) -> None:
+        start_time = time.time()
+        updated_count: int = 0
+
+        try:
+            while True:
+                updated_count += compact_vote_shards(batch_size=options['batch_size'])
+
+                if options['once']:
+                    break
+
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.NOTICE('Interrupted, stopping.'))
+
+        end_time = time.time()
+        time_elapsed = humanize.precisedelta(end_time - start_time)
+
+        self.stdout.write(self.style.SUCCESS(f'Compacted the votes of {updated_count} quotes - took {time_elapsed}.'))
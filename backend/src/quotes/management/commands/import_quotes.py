@@ -0,0 +1,84 @@
+import time
+from pathlib import Path
+
+import humanize
+from django.core.management.base import BaseCommand, CommandError
+from tqdm import tqdm
+
+from quotes.utils.importing import IMPORT_FORMATS, import_quotes, read_quote_records
+
+
+class Command(BaseCommand):
+    help = 'Import quotes from a JSONL or CSV file with the fields of quotes.api.models.Quote.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=Path,
+            help='JSONL or CSV file to import',
+        )
+        parser.add_argument(
+            '--format',
+            type=str,
+            choices=IMPORT_FORMATS,
+            help='Format of the file (default: based on the file extension)',
+            default=None,
+        )
+        parser.add_argument(
+            '--batch_size', '--batch-size',
+            type=int,
+            help='Number of quotes to insert at once (default: %(default)s)',
+            default=10_000,
+        )
+        parser.add_argument(
+            '--no_copy',
+            action='store_true',
+            help='Insert with bulk INSERTs instead of COPY on PostgreSQL',
+        )
+        parser.add_argument(
+            '--no_images',
+            action='store_true',
+            help='Do not queue image lookups for the imported quotes',
+        )
+        parser.add_argument(
+            '--random_likes',
+            action='store_true',
+            help='Set random likes and dislikes',
+        )
+
+    def handle(self, *args, **options) -> None:
+        start_time = time.time()
+        path: Path = options['path']
+
+        if not path.is_file():
+            raise CommandError(f'File "{path}" does not exist.')
+
+        self.stdout.write(self.style.SUCCESS(f'Importing quotes from "{path}" (batches of {options["batch_size"]}).'))
+
+        processed_count: int
+        success_count: int
+        processed_count, success_count = 0, 0
+
+        try:
+            quotes_data = read_quote_records(path=path, import_format=options['format'])
+
+            with tqdm(desc="Importing quotes", unit=' quotes') as progress_bar:
+                for batch_count, inserted_count in import_quotes(quotes_data=quotes_data,
+                                                                 batch_size=options['batch_size'],
+                                                                 use_copy=not options['no_copy'],
+                                                                 enqueue_images=not options['no_images'],
+                                                                 random_votes=options['random_likes']):
+                    processed_count += batch_count
+                    success_count += inserted_count
+                    progress_bar.update(batch_count)
+        except ValueError as e:
+            raise CommandError(e)
+
+        end_time = time.time()
+        time_elapsed = humanize.precisedelta(end_time - start_time)
+        throughput: float = success_count / max(end_time - start_time, 1e-9)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Imported {success_count} quotes ({processed_count - success_count} invalid or duplicate) - took '
+                f'{time_elapsed} ({throughput:.2f} quotes/s).'))
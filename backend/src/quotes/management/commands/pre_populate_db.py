@@ -1,14 +1,19 @@
 import logging
 import random
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 import humanize
 from django.core.management.base import BaseCommand
+from django.db import DatabaseError, transaction
 from tqdm import tqdm
 
-from quotes.enums import QuoteSource
-from quotes.models import Quote
-from quotes.utils.quote_fetching import get_random_quote_source, fetch_random_quote_from_api_client
+from contrib.api.http import is_source_available
+from contrib.api.rate_limiting import get_rate_limiter
+from quotes.api.clients import BaseQuoteAPIClient
+from quotes.api.models import Quote as QuoteData
+from quotes.api.registry import API_CLIENTS
+from quotes.utils.db_operations import bulk_create_quotes
 
 logger = logging.getLogger('quotes')
 
@@ -29,40 +34,136 @@ class Command(BaseCommand):
             help='Set random likes and dislikes (default: %(default)s)',
             default=True,
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of concurrent API requests (default: %(default)s)',
+            default=4,
+        )
+        parser.add_argument(
+            '--batch_size', '--batch-size',
+            type=int,
+            help='Number of quotes to save at once (default: %(default)s)',
+            default=500,
+        )
 
     def handle(self, *args, **options) -> None:
         start_time = time.time()
         number_of_quotes: int = options['number_of_quotes']
+        workers: int = options['workers']
+        batch_size: int = options['batch_size']
 
-        self.stdout.write(self.style.SUCCESS(f'Pre-populating database with {number_of_quotes} quotes.'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Pre-populating database with {number_of_quotes} quotes ({workers} workers, batches of {batch_size}).'))
 
         random_likes: bool = options['random_likes']
         success_count: int
         fail_count: int
         success_count, fail_count = 0, 0
+        submitted_count: int = 0
+        quotes_data: list[QuoteData] = []
+        pending: set[Future] = set()
+
+        with tqdm(total=number_of_quotes, desc="Processing quotes") as progress_bar, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pre-populate') as executor:
+            while submitted_count < number_of_quotes or pending:
+                # Keep every worker busy, without queueing up all requests at once
+                while submitted_count < number_of_quotes and len(pending) < workers * 2:
+                    pending.add(executor.submit(self.fetch_quote_data))
+                    submitted_count += 1
+
+                done: set[Future]
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    quote_data: QuoteData | None = future.result()
+
+                    if quote_data is None:
+                        fail_count += 1
+                    else:
+                        quotes_data.append(quote_data)
 
-        with tqdm(total=number_of_quotes, desc="Processing quotes") as progress_bar:
-            for i in range(number_of_quotes):
-                try:
-                    quote_source: QuoteSource = get_random_quote_source(excluded_sources=(QuoteSource.DATABASE,))
-                    quote: Quote | None = fetch_random_quote_from_api_client(quote_source=quote_source)
-
-                    if quote is not None and random_likes:
-                        # set random likes/dislikes
-                        lower, upper = 0, 99_9999
-                        quote.likes = random.randint(lower, upper)
-                        quote.dislikes = random.randint(lower, upper)
-                        quote.save()
-                        success_count += 1
-                except Exception as e:
-                    logger.exception(msg=e)
-                    fail_count += 1
-                finally:
                     progress_bar.update(1)
 
+                if len(quotes_data) >= batch_size or (not pending and submitted_count >= number_of_quotes):
+                    inserted_count: int = self.save_quotes(quotes_data=quotes_data, random_likes=random_likes)
+                    success_count += inserted_count
+                    fail_count += len(quotes_data) - inserted_count
+                    quotes_data = []
+
         end_time = time.time()
         time_elapsed = humanize.precisedelta(end_time - start_time)
+        throughput: float = success_count / max(end_time - start_time, 1e-9)
 
         self.stdout.write(
             self.style.SUCCESS(
-                f'Pre-populated the database with {success_count} quotes ({fail_count} failed) - took {time_elapsed}.'))
+                f'Pre-populated the database with {success_count} quotes ({fail_count} failed or duplicate) - took '
+                f'{time_elapsed} ({throughput:.2f} quotes/s).'))
+
+    @staticmethod
+    def acquire_api_client() -> BaseQuoteAPIClient | None:
+        """
+        Pick an API client that may be called right away: the available clients are tried in random order without
+        blocking, so a slow rate limit (e.g. Zen Quotes) does not hold up the workers while the others have tokens left.
+        When all of them are rate limited, wait for the first one to allow a request.
+        """
+        while True:
+            api_clients: list[BaseQuoteAPIClient] = [
+                api_client for api_client in API_CLIENTS.values() if is_source_available(key=api_client.api_client_key)]
+
+            if not api_clients:
+                return None
+
+            random.shuffle(api_clients)
+            wait_times: list[float] = []
+
+            for api_client in api_clients:
+                wait_time: float = get_rate_limiter(key=api_client.api_client_key).try_acquire()
+
+                if wait_time == 0:
+                    return api_client
+
+                wait_times.append(wait_time)
+
+            time.sleep(min(wait_times))
+
+    def fetch_quote_data(self) -> QuoteData | None:
+        """
+        Fetch a random quote from an API client that is not rate limited (@see ``acquire_api_client``).
+        """
+        try:
+            api_client: BaseQuoteAPIClient | None = self.acquire_api_client()
+
+            if api_client is None:
+                return None
+
+            return api_client.fetch_random_quote()
+        except Exception as e:
+            logger.exception(msg=e)
+
+            return None
+
+    @staticmethod
+    def save_quotes(quotes_data: list[QuoteData], random_likes: bool) -> int:
+        try:
+            with transaction.atomic():
+                return bulk_create_quotes(quotes_data=quotes_data, random_votes=random_likes)
+        except DatabaseError as e:
+            logger.exception(msg=e)
+        except Exception as e:
+            logger.exception(msg=e)
+
+            return 0
+
+        # A single invalid quote (e.g. with a category name that is too long) fails the whole batch, so the quotes are
+        # saved one by one instead, to only lose the invalid ones
+        inserted_count: int = 0
+
+        for quote_data in quotes_data:
+            try:
+                with transaction.atomic():
+                    inserted_count += bulk_create_quotes(quotes_data=[quote_data], random_votes=random_likes)
+            except Exception as e:
+                logger.exception(msg=e)
+
+        return inserted_count
@@ -0,0 +1,101 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import humanize
+from django.core.management.base import BaseCommand
+from pydantic import HttpUrl
+
+from contrib.api.clients import UnsplashImageAPIClient
+from contrib.api.rate_limiting import get_rate_limiter
+from quotes.models import ImageEnrichmentJob
+from quotes.utils.images import claim_image_enrichment_jobs, complete_image_enrichment_job, get_image_search_query
+
+logger = logging.getLogger('quotes')
+
+
+class Command(BaseCommand):
+    help = 'Process queued image lookups for quotes (runs until interrupted, unless --once is given).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Number of concurrent image lookups (default: %(default)s)',
+            default=4,
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            help='Number of jobs to claim at once (default: %(default)s)',
+            default=20,
+        )
+        parser.add_argument(
+            '--poll_interval',
+            type=float,
+            help='Seconds to wait when there are no jobs (default: %(default)s)',
+            default=5.0,
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Stop when there are no more jobs to process',
+        )
+
+    def handle(self, *args, **options) -> None:
+        start_time = time.time()
+        concurrency: int = options['concurrency']
+        batch_size: int = options['batch_size']
+
+        self.stdout.write(self.style.SUCCESS(f'Processing image enrichment jobs ({concurrency} concurrent lookups).'))
+
+        success_count: int
+        fail_count: int
+        success_count, fail_count = 0, 0
+        image_api_client = UnsplashImageAPIClient()
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='image-enrichment') as executor:
+            try:
+                while True:
+                    jobs: list[ImageEnrichmentJob] = claim_image_enrichment_jobs(batch_size=batch_size)
+
+                    if not jobs:
+                        if options['once']:
+                            break
+
+                        time.sleep(options['poll_interval'])
+                        continue
+
+                    # Only the image lookups run concurrently, the results are stored from this thread
+                    results = executor.map(lambda job: self.lookup_image(image_api_client=image_api_client, job=job),
+                                           jobs)
+
+                    for job, (image_url, image_alt_text, error) in zip(jobs, results):
+                        if complete_image_enrichment_job(job=job, image_url=image_url, image_alt_text=image_alt_text,
+                                                         error=error):
+                            success_count += 1
+                        else:
+                            fail_count += 1
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.NOTICE('Interrupted, stopping.'))
+
+        end_time = time.time()
+        time_elapsed = humanize.precisedelta(end_time - start_time)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Added images to {success_count} quotes ({fail_count} failed) - took {time_elapsed}.'))
+
+    @staticmethod
+    def lookup_image(image_api_client: UnsplashImageAPIClient,
+                     job: ImageEnrichmentJob) -> tuple[HttpUrl | None, str | None, str | None]:
+        try:
+            image_search_query: str | None = job.image_search_query or get_image_search_query(quote=job.quote)
+            get_rate_limiter(key=image_api_client.BREAKER_KEY).acquire()
+            image_url, image_alt_text = image_api_client.get_random_image_with_parameters(
+                image_search_query=image_search_query)
+
+            return image_url, image_alt_text, None
+        except Exception as e:
+            logger.exception(msg=e)
+
+            return None, None, str(e)
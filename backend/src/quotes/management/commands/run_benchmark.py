@@ -0,0 +1,98 @@
+import time
+from pathlib import Path
+
+import humanize
+from django.core.management.base import BaseCommand, CommandError
+
+from quotes.benchmarks.registry import BENCHMARKS
+from quotes.benchmarks.results import compare_results, load_results, save_results
+
+
+class Command(BaseCommand):
+    help = 'Run a benchmark against synthetic data (the generated data is rolled back afterwards).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'benchmark',
+            type=str,
+            choices=list(BENCHMARKS),
+            help='Benchmark to run',
+        )
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            help='Corpus sizes to benchmark (default: %(default)s)',
+            default=[10_000, 1_000_000, 10_000_000],
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            help='Number of measured calls per case (default: %(default)s)',
+            default=200,
+        )
+        parser.add_argument(
+            '--output',
+            type=Path,
+            help='Store the results as JSON in this file',
+        )
+        parser.add_argument(
+            '--baseline',
+            type=Path,
+            help='JSON results of an earlier run (@see --output) to compare the results with',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            help='Flag a metric as a regression when it is this many times worse than the baseline (default: '
+                 '%(default)s)',
+            default=1.25,
+        )
+        parser.add_argument(
+            '--fail_on_regression',
+            action='store_true',
+            help='Exit with an error when a regression is flagged',
+        )
+
+    def handle(self, *args, **options) -> None:
+        start_time = time.time()
+        benchmark: str = options['benchmark']
+
+        self.stdout.write(self.style.SUCCESS(f'Running the "{benchmark}" benchmark.'))
+
+        results: list[dict[str, any]] = BENCHMARKS[benchmark](sizes=options['sizes'], iterations=options['iterations'])
+
+        for result in results:
+            self.stdout.write(' '.join(f'{key}={value}' for key, value in result.items()))
+
+        if options['output']:
+            save_results(path=options['output'], benchmark=benchmark, results=results)
+            self.stdout.write(self.style.SUCCESS(f'Stored the results in "{options["output"]}".'))
+
+        regressions: list[dict[str, any]] = []
+
+        if options['baseline']:
+            baseline: dict[str, any] = load_results(path=options['baseline'])
+
+            if baseline['benchmark'] != benchmark:
+                raise CommandError(f'The baseline is a "{baseline["benchmark"]}" run, not a "{benchmark}" run.')
+
+            regressions = compare_results(results=results, baseline=baseline['results'],
+                                          threshold=options['threshold'])
+
+            for regression in regressions:
+                case: str = ' '.join(f'{key}={value}' for key, value in regression['case'].items())
+                self.stdout.write(self.style.WARNING(
+                    f'Regression: {case} {regression["metric"]}={regression["value"]} (baseline '
+                    f'{regression["baseline"]}, {regression["ratio"]}x worse)'))
+
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS(f'No regressions compared to "{options["baseline"]}".'))
+
+        end_time = time.time()
+        time_elapsed = humanize.precisedelta(end_time - start_time)
+
+        self.stdout.write(self.style.SUCCESS(f'Finished the "{benchmark}" benchmark - took {time_elapsed}.'))
+
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'Found {len(regressions)} regressions compared to "{options["baseline"]}".')
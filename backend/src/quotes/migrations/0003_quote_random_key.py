@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:50
+
+import random
+
+import quotes.models
+from django.db import migrations, models
+
+
+def backfill_random_keys(apps, schema_editor):
+    """
+    ``AddField`` evaluates the default only once, so give every existing quote its own random key.
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('UPDATE quotes_quote SET random_key = random()')
+        return
+
+    Quote = apps.get_model('quotes', 'Quote')
+    quotes = list(Quote.objects.only('pk'))
+
+    for quote in quotes:
+        quote.random_key = random.random()
+
+    Quote.objects.bulk_update(quotes, fields=['random_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0002_alter_quoteorigin_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='random_key',
+            field=models.FloatField(db_index=True, default=quotes.models.generate_random_key, editable=False),
+        ),
+        migrations.RunPython(code=backfill_random_keys, reverse_code=migrations.RunPython.noop),
+    ]
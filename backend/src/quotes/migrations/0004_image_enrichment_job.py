@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0003_quote_random_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageEnrichmentJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('image_search_query', models.CharField(blank=True, max_length=255, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('quote', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='image_enrichment_job', to='quotes.quote')),
+            ],
+            options={
+                'verbose_name': 'Image enrichment job',
+                'verbose_name_plural': 'Image enrichment jobs',
+                'ordering': ('available_at',),
+                'indexes': [models.Index(fields=['status', 'available_at'], name='quotes_imag_status_0232e9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:04
+
+from django.db import migrations, models
+from django.db.models import BigIntegerField, Case, ExpressionWrapper, F, FloatField, Value, When
+from django.db.models.functions import Cast, Sqrt
+from django.db.models.lookups import GreaterThan
+
+# z-score of the 95% confidence interval of the Wilson score
+WILSON_Z = 1.96
+
+
+def backfill_ranking_scores(apps, schema_editor):
+    """
+    Compute the ranking scores of the existing quotes in a single ``UPDATE`` (the expressions of
+    ``quotes.models.get_ranking_score_expressions`` as of this migration).
+    """
+    Quote = apps.get_model('quotes', 'Quote')
+    likes_float = Cast(F('likes'), output_field=FloatField())
+    dislikes_float = Cast(F('dislikes'), output_field=FloatField())
+    total = likes_float + dislikes_float
+
+    Quote.objects.update(
+        net_score=ExpressionWrapper(F('likes') - F('dislikes'), output_field=BigIntegerField()),
+        wilson_score=Case(
+            When(
+                GreaterThan(total, Value(0.0)),
+                then=(likes_float + Value(WILSON_Z ** 2 / 2) - Value(WILSON_Z) * Sqrt(
+                    likes_float * dislikes_float / total + Value(WILSON_Z ** 2 / 4))) / (total + Value(WILSON_Z ** 2)),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0004_image_enrichment_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='net_score',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='wilson_score',
+            field=models.FloatField(db_index=True, default=0.0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='quote',
+            name='likes',
+            field=models.PositiveBigIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(code=backfill_ranking_scores, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_category_quote_counts(apps, schema_editor):
+    """
+    Count the existing quotes of every category in a single ``UPDATE``.
+    """
+    Category = apps.get_model('quotes', 'Category')
+    Quote = apps.get_model('quotes', 'Quote')
+    quote_counts = (
+        Quote.objects.filter(category=OuterRef('pk')).order_by().values('category').annotate(count=Count('pk'))
+        .values('count')
+    )
+    Category.objects.update(quote_count=Coalesce(Subquery(quote_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0006_quote_modified_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('alias', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Category alias',
+                'verbose_name_plural': 'Category aliases',
+                'ordering': ('alias',),
+            },
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='quote_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['category', 'random_key'], name='quotes_quot_categor_2d07e8_idx'),
+        ),
+        migrations.AddField(
+            model_name='categoryalias',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='quotes.category'),
+        ),
+        migrations.RunPython(code=backfill_category_quote_counts, reverse_code=migrations.RunPython.noop),
+    ]
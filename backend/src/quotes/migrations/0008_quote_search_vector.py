@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:02
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+SEARCH_VECTOR_INDEX = 'quotes_quote_search_vector_gin'
+
+
+def create_search_vector_index(apps, schema_editor):
+    """
+    Index the search vectors with GIN (PostgreSQL only, other databases search without the vectors) and fill them for
+    the existing quotes.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Author = apps.get_model('quotes', 'Author')
+    Category = apps.get_model('quotes', 'Category')
+    Quote = apps.get_model('quotes', 'Quote')
+    # Frozen copy of ``quotes.utils.search.get_search_vector``, built from the historical models
+    config: str = settings.QUOTES_SEARCH_CONFIG
+    author_name = Subquery(Author.objects.filter(pk=OuterRef('author_id')).order_by().values('name'))
+    category_name = Subquery(Category.objects.filter(pk=OuterRef('category_id')).order_by().values('name'))
+
+    Quote.objects.order_by().update(search_vector=(
+        SearchVector('quote_text', weight='A', config=config)
+        + SearchVector(author_name, weight='B', config=config)
+        + SearchVector(category_name, weight='C', config=config)
+    ))
+    schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {SEARCH_VECTOR_INDEX} ON {Quote._meta.db_table} '
+                          f'USING gin (search_vector)')
+
+
+def drop_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {SEARCH_VECTOR_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0007_category_lookup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(code=create_search_vector_index, reverse_code=drop_search_vector_index),
+    ]
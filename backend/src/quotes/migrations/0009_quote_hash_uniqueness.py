@@ -0,0 +1,130 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:10
+
+import re
+import unicodedata
+from hashlib import sha256
+
+from django.db import migrations, models
+from django.db.models import (
+    BigIntegerField, Case, Count, ExpressionWrapper, F, FloatField, Min, OuterRef, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce, Sqrt
+from django.db.models.lookups import GreaterThan
+
+# The normalization of ``quotes.models.compute_quote_hash`` and the z-score of the ranking scores as of this migration
+NON_WORD_CHARACTERS = re.compile(r'[^\w\s]|_')
+WILSON_Z = 1.96
+CHUNK_SIZE = 10_000
+
+
+def compute_quote_hash(quote_text: str) -> str:
+    quote_text = unicodedata.normalize('NFKC', quote_text).casefold()
+
+    return sha256(' '.join(NON_WORD_CHARACTERS.sub(' ', quote_text).split()).encode('utf-8')).hexdigest()
+
+
+def get_ranking_score_expressions(likes, dislikes) -> dict:
+    likes_float = Cast(likes, output_field=FloatField())
+    dislikes_float = Cast(dislikes, output_field=FloatField())
+    total = likes_float + dislikes_float
+
+    return {
+        'net_score': ExpressionWrapper(likes - dislikes, output_field=BigIntegerField()),
+        'wilson_score': Case(
+            When(
+                GreaterThan(total, Value(0.0)),
+                then=(likes_float + Value(WILSON_Z ** 2 / 2) - Value(WILSON_Z) * Sqrt(
+                    likes_float * dislikes_float / total + Value(WILSON_Z ** 2 / 4))) / (total + Value(WILSON_Z ** 2)),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    }
+
+
+def rehash_and_dedupe_quotes(apps, schema_editor):
+    """
+    Rehash the existing quotes with their normalized text, a chunk at a time, then merge the quotes that turn out to be
+    (cosmetic) duplicates into the oldest one, which gets the votes of all of them.
+    """
+    Category = apps.get_model('quotes', 'Category')
+    Quote = apps.get_model('quotes', 'Quote')
+    last_pk: int = 0
+
+    while True:
+        chunk: list = list(
+            Quote.objects.filter(pk__gt=last_pk).order_by('pk').only('quote_text', 'quote_hash')[:CHUNK_SIZE])
+
+        if not chunk:
+            break
+
+        last_pk = chunk[-1].pk
+        rehashed_quotes: list = []
+
+        for quote in chunk:
+            quote_hash: str = compute_quote_hash(quote_text=quote.quote_text)
+
+            if quote_hash != quote.quote_hash:
+                quote.quote_hash = quote_hash
+                rehashed_quotes.append(quote)
+
+        Quote.objects.bulk_update(rehashed_quotes, fields=('quote_hash',), batch_size=1000)
+
+    # The duplicates are found by the database, per hash. Merged hashes drop out of the query, so it is repeated until
+    # none are left
+    duplicate_hashes = (
+        Quote.objects.order_by().values('quote_hash').annotate(original_pk=Min('pk'), count=Count('pk'))
+        .filter(count__gt=1).values_list('quote_hash', 'original_pk')
+    )
+    has_duplicates: bool = False
+
+    while batch := list(duplicate_hashes[:1000]):
+        has_duplicates = True
+
+        for quote_hash, original_pk in batch:
+            duplicates = Quote.objects.filter(quote_hash=quote_hash).exclude(pk=original_pk)
+            votes: dict[str, int] = duplicates.aggregate(likes=Sum('likes'), dislikes=Sum('dislikes'))
+            likes = F('likes') + votes['likes']
+            dislikes = F('dislikes') + votes['dislikes']
+            Quote.objects.filter(pk=original_pk).update(likes=likes, dislikes=dislikes,
+                                                        **get_ranking_score_expressions(likes=likes, dislikes=dislikes))
+            duplicates.delete()
+
+    if has_duplicates:
+        quote_counts = (
+            Quote.objects.filter(category=OuterRef('pk')).order_by().values('category').annotate(count=Count('pk'))
+            .values('count')
+        )
+        Category.objects.update(quote_count=Coalesce(Subquery(quote_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0008_quote_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='quote',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='quote',
+            name='quote_text',
+            field=models.TextField(),
+        ),
+        # Without the unique index while rehashing, a new hash may (briefly) be the old hash of another quote. A plain
+        # index keeps the lookups of the duplicates of a hash fast
+        migrations.AlterField(
+            model_name='quote',
+            name='quote_hash',
+            field=models.CharField(db_index=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(code=rehash_and_dedupe_quotes, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='quote',
+            name='quote_hash',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:52
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_origins(apps, schema_editor):
+    """
+    Point the quotes of duplicate origins (same URL and API client) to the oldest one, and delete the others.
+    """
+    Quote = apps.get_model('quotes', 'Quote')
+    QuoteOrigin = apps.get_model('quotes', 'QuoteOrigin')
+    duplicates = (
+        QuoteOrigin.objects.filter(url__isnull=False).order_by().values('url', 'api_client_key')
+        .annotate(original_pk=Min('pk'), count=Count('pk')).filter(count__gt=1)
+    )
+
+    for duplicate in duplicates:
+        duplicate_origins = QuoteOrigin.objects.filter(url=duplicate['url'], api_client_key=duplicate['api_client_key'])
+        duplicate_origins = duplicate_origins.exclude(pk=duplicate['original_pk'])
+        Quote.objects.filter(origin__in=duplicate_origins).update(origin_id=duplicate['original_pk'])
+        duplicate_origins.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0009_quote_hash_uniqueness'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=merge_duplicate_origins, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='quoteorigin',
+            constraint=models.UniqueConstraint(fields=('url', 'api_client_key'),
+                                               name='quotes_quoteorigin_unique_url_api_client'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0010_quoteorigin_unique_url_api_client'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuoteVoteShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('likes', models.BigIntegerField(default=0)),
+                ('dislikes', models.BigIntegerField(default=0)),
+                ('quote', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_shards', to='quotes.quote')),
+            ],
+            options={
+                'verbose_name': 'Quote vote shard',
+                'verbose_name_plural': 'Quote vote shards',
+                'constraints': [models.UniqueConstraint(fields=('quote', 'shard'), name='quotes_quotevoteshard_unique_quote_shard')],
+            },
+        ),
+    ]
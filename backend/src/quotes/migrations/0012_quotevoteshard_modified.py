@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0011_quote_vote_shard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quotevoteshard',
+            name='modified',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,10 +1,103 @@
+import math
+import random
+import re
+import unicodedata
 from hashlib import sha256
+from typing import Any
 
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import BigIntegerField, Case, Expression, ExpressionWrapper, F, FloatField, Value, When
+from django.db.models.functions import Cast, Sqrt
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from contrib.models import GUIDModelMixin, TimestampMixin
 from quotes.api.registry import API_CLIENTS
+from quotes.enums import ImageEnrichmentStatus
+
+
+def generate_random_key() -> float:
+    """
+    Default for ``Quote.random_key``, a uniform value in [0, 1) used by the random key sampler.
+    """
+    return random.random()
+
+
+# Anything but letters, digits and whitespace (``\w`` includes the underscore)
+NON_WORD_CHARACTERS = re.compile(r'[^\w\s]|_')
+
+
+def normalize_quote_text(quote_text: str) -> str:
+    """
+    Normalize a quote text for deduplication: Unicode (NFKC) normalized and case-folded, with punctuation and symbols
+    (including every kind of quote mark) and collapsed whitespace folded into single spaces, so cosmetic variants of a
+    quote, e.g. from different APIs, are equal.
+    """
+    quote_text = unicodedata.normalize('NFKC', quote_text).casefold()
+
+    return ' '.join(NON_WORD_CHARACTERS.sub(' ', quote_text).split())
+
+
+def compute_quote_hash(quote_text: str) -> str:
+    """
+    Compute the ``Quote.quote_hash`` for the given quote text (also for bulk inserts, which bypass ``Quote.save()``):
+    the hash of the normalized text (@see ``normalize_quote_text``), which identifies a quote.
+    """
+    return sha256(normalize_quote_text(quote_text=quote_text).encode('utf-8')).hexdigest()
+
+
+# z-score of the 95% confidence interval of the Wilson score
+WILSON_Z = 1.96
+
+
+def compute_wilson_score(likes: int, dislikes: int) -> float:
+    """
+    Compute the lower bound of the Wilson score interval of the like ratio, which ranks a quote with 90 likes out of 100
+    votes above one with a single like (and no other votes).
+    """
+    total: int = likes + dislikes
+
+    if total == 0:
+        return 0.0
+
+    return (likes + WILSON_Z ** 2 / 2 - WILSON_Z * math.sqrt(likes * dislikes / total + WILSON_Z ** 2 / 4)) / (
+            total + WILSON_Z ** 2)
+
+
+def get_ranking_score_expressions(likes: Expression | None = None,
+                                  dislikes: Expression | None = None) -> dict[str, Expression]:
+    """
+    Get the ``UPDATE`` expressions of the ranking scores of a quote (``net_score`` and ``wilson_score``), given
+    expressions for its (new) likes and dislikes, so they can be updated in the same statement as the votes.
+    """
+    likes = F('likes') if likes is None else likes
+    dislikes = F('dislikes') if dislikes is None else dislikes
+    likes_float = Cast(likes, output_field=FloatField())
+    dislikes_float = Cast(dislikes, output_field=FloatField())
+    total = likes_float + dislikes_float
+
+    return {
+        'net_score': ExpressionWrapper(likes - dislikes, output_field=BigIntegerField()),
+        'wilson_score': Case(
+            When(
+                GreaterThan(total, Value(0.0)),
+                then=(likes_float + Value(WILSON_Z ** 2 / 2) - Value(WILSON_Z) * Sqrt(
+                    likes_float * dislikes_float / total + Value(WILSON_Z ** 2 / 4))) / (total + Value(WILSON_Z ** 2)),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    }
+
+
+def normalize_category_name(name: str) -> str:
+    """
+    Normalize a category name (or alias) for lookups: case-folded, with collapsed whitespace.
+    """
+    return ' '.join(name.split()).casefold()
 
 
 class Author(GUIDModelMixin, TimestampMixin, models.Model):
@@ -21,6 +114,8 @@ class Author(GUIDModelMixin, TimestampMixin, models.Model):
 
 class Category(GUIDModelMixin, TimestampMixin, models.Model):
     name = models.CharField(max_length=50, unique=True)
+    # Number of quotes in the category, kept up to date incrementally (@see ``quotes.utils.categories``)
+    quote_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = _('Category')
@@ -31,6 +126,27 @@ class Category(GUIDModelMixin, TimestampMixin, models.Model):
         return self.name
 
 
+class CategoryAlias(TimestampMixin, models.Model):
+    """
+    Alternative name of a category (e.g. "programming" for "Programming quotes"), for looking up categories by name.
+    """
+    alias = models.CharField(max_length=50, unique=True)
+    category = models.ForeignKey(to=Category, on_delete=models.CASCADE, related_name='aliases')
+
+    class Meta:
+        verbose_name = _('Category alias')
+        verbose_name_plural = _('Category aliases')
+        ordering = ('alias',)
+
+    def __str__(self) -> str:
+        return self.alias
+
+    def save(self, *args, **kwargs) -> None:
+        self.alias = normalize_category_name(name=self.alias)
+
+        super().save(*args, **kwargs)
+
+
 class QuoteOrigin(GUIDModelMixin, TimestampMixin, models.Model):
     url = models.URLField(null=True)
     api_client_key = models.CharField(max_length=255, null=True,
@@ -40,6 +156,10 @@ class QuoteOrigin(GUIDModelMixin, TimestampMixin, models.Model):
         verbose_name = _('Origin')
         verbose_name_plural = _('Origins')
         ordering = ('api_client_key', 'url')
+        constraints = (
+            # The natural key, for upserts (@see ``quotes.utils.dimensions``)
+            models.UniqueConstraint(fields=('url', 'api_client_key'), name='quotes_quoteorigin_unique_url_api_client'),
+        )
 
     def __str__(self) -> str:
         return self.url
@@ -48,19 +168,32 @@ class QuoteOrigin(GUIDModelMixin, TimestampMixin, models.Model):
 class Quote(GUIDModelMixin, TimestampMixin, models.Model):
     author = models.ForeignKey(to=Author, on_delete=models.SET_NULL, null=True, blank=True)
     category = models.ForeignKey(to=Category, on_delete=models.SET_NULL, null=True, blank=True)
-    quote_text = models.TextField(unique=True)
+    quote_text = models.TextField()
+    # The only uniqueness constraint of a quote (@see ``compute_quote_hash``), a narrow index instead of full text ones
     quote_hash = models.CharField(max_length=64, unique=True, editable=False)
     image_url = models.URLField(null=True)
     image_alt_text = models.CharField(max_length=255, null=True)
     origin = models.ForeignKey(to=QuoteOrigin, on_delete=models.SET_NULL, null=True, blank=True)
-    likes = models.PositiveBigIntegerField(default=0)
+    likes = models.PositiveBigIntegerField(default=0, db_index=True)
     dislikes = models.PositiveBigIntegerField(default=0)
+    net_score = models.BigIntegerField(default=0, db_index=True, editable=False)
+    wilson_score = models.FloatField(default=0.0, db_index=True, editable=False)
+    random_key = models.FloatField(default=generate_random_key, db_index=True, editable=False)
+    # Full-text search document of the quote text, author and category, kept up to date on save (PostgreSQL only, @see
+    # ``quotes.utils.search``)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = _('Quote')
         verbose_name_plural = _('Quotes')
         ordering = ('category', '-likes')
-        unique_together = ('author', 'quote_text')
+        indexes = (
+            # Latest modification, for the ETag/Last-Modified of the quote list
+            models.Index(fields=('modified',)),
+            # Random quotes per category, without sorting (@see ``quotes.utils.categories``)
+            models.Index(fields=('category', 'random_key')),
+            # The GIN index of ``search_vector`` is created by migration 0008, on PostgreSQL only
+        )
 
     def __str__(self) -> str:
         author: str = _(f' by {self.author.name}' if self.author else ' (Unknown Author)')
@@ -68,12 +201,42 @@ class Quote(GUIDModelMixin, TimestampMixin, models.Model):
 
         return _(f'"{self.quote_text[:24]}{"..." if len(self.quote_text) > 24 else ""}"{author}{category}').__str__()
 
+    @classmethod
+    def from_db(cls, db: str, field_names: list[str], values: list[Any]) -> 'Quote':
+        instance: Quote = super().from_db(db, field_names, values)
+        # Remember the category as loaded, so a move to another category can update both category quote counts
+        instance._loaded_category_id = instance.__dict__.get('category_id')
+
+        return instance
+
+    def clean(self) -> None:
+        # ``quote_hash`` is not editable, so model forms (e.g. the admin) don't validate its uniqueness
+        if not self.quote_text:
+            return
+
+        duplicates = Quote.objects.filter(quote_hash=compute_quote_hash(quote_text=self.quote_text))
+
+        if self.pk:
+            duplicates = duplicates.exclude(pk=self.pk)
+
+        if duplicates.exists():
+            raise ValidationError({'quote_text': _('A quote with this text already exists.')})
+
     def save(self, *args, **kwargs) -> None:
         if not self.quote_hash or not self.pk or self.quote_has_changed():
-            self.quote_hash = sha256(self.quote_text.encode('utf-8')).hexdigest()
+            self.quote_hash = compute_quote_hash(quote_text=self.quote_text)
+
+        self.update_ranking_scores()
 
         super().save(*args, **kwargs)
 
+    def update_ranking_scores(self) -> None:
+        """
+        Update the ranking scores from the likes and dislikes (also for bulk inserts, which bypass ``Quote.save()``).
+        """
+        self.net_score = self.likes - self.dislikes
+        self.wilson_score = compute_wilson_score(likes=self.likes, dislikes=self.dislikes)
+
     def quote_has_changed(self) -> bool:
         """
         Check if the quote has changed.
@@ -87,3 +250,49 @@ class Quote(GUIDModelMixin, TimestampMixin, models.Model):
         original: Quote = Quote.objects.filter(pk=self.pk).first()
 
         return original and original.quote_text != self.quote_text
+
+
+class QuoteVoteShard(models.Model):
+    """
+    One of the ``QUOTES_VOTE_SHARDS`` counters of the votes of a quote that are not yet folded into its ``likes`` and
+    ``dislikes`` (@see ``quotes.utils.votes.shard_vote``). The counts are deltas, so they can be negative.
+    """
+    quote = models.ForeignKey(to=Quote, on_delete=models.CASCADE, related_name='vote_shards')
+    shard = models.PositiveSmallIntegerField()
+    likes = models.BigIntegerField(default=0)
+    dislikes = models.BigIntegerField(default=0)
+    # Time of the latest vote, which does not change the ``modified`` of the quote (@see ``QuoteViewSet``)
+    modified = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = _('Quote vote shard')
+        verbose_name_plural = _('Quote vote shards')
+        constraints = (
+            models.UniqueConstraint(fields=('quote', 'shard'), name='quotes_quotevoteshard_unique_quote_shard'),
+        )
+
+    def __str__(self) -> str:
+        return _(f'Vote shard {self.shard} of quote {self.quote_id}').__str__()
+
+
+class ImageEnrichmentJob(TimestampMixin, models.Model):
+    """
+    Queued lookup of an image for a quote, processed by the ``process_image_enrichment`` management command.
+    """
+    quote = models.OneToOneField(to=Quote, on_delete=models.CASCADE, related_name='image_enrichment_job')
+    image_search_query = models.CharField(max_length=255, null=True, blank=True)
+    status = models.CharField(max_length=16, choices=ImageEnrichmentStatus, default=ImageEnrichmentStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Image enrichment job')
+        verbose_name_plural = _('Image enrichment jobs')
+        ordering = ('available_at',)
+        indexes = (
+            models.Index(fields=('status', 'available_at')),
+        )
+
+    def __str__(self) -> str:
+        return _(f'Image for quote {self.quote_id} ({self.status})').__str__()
@@ -0,0 +1,23 @@
+from django.conf import settings
+
+from .samplers import BaseRandomSampler, IdRangeSampler, OrderByRandomSampler, RandomKeySampler, TableSampleSampler
+
+RANDOM_SAMPLERS = {
+    IdRangeSampler().sampler_key: IdRangeSampler(),
+    OrderByRandomSampler().sampler_key: OrderByRandomSampler(),
+    RandomKeySampler().sampler_key: RandomKeySampler(),
+    TableSampleSampler().sampler_key: TableSampleSampler(),
+}
+
+
+def get_random_sampler(sampler_key: str = None) -> BaseRandomSampler:
+    """
+    Get a random sampler by its key, or the one configured with ``QUOTES_RANDOM_SAMPLER``.
+    """
+    sampler_key: str = sampler_key or settings.QUOTES_RANDOM_SAMPLER
+    sampler: BaseRandomSampler | None = RANDOM_SAMPLERS.get(sampler_key)
+
+    if sampler is None:
+        raise ValueError(f'Unknown random sampler "{sampler_key}", must be one of: {list(RANDOM_SAMPLERS)}')
+
+    return sampler
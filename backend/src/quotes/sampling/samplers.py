@@ -0,0 +1,286 @@
+import logging
+import random
+from abc import ABC, abstractmethod
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.db.models import Max, Min, Model, Q, QuerySet, Subquery
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from contrib.db import get_estimated_row_count
+
+logger = logging.getLogger('quotes')
+
+
+def get_instance_pk(instance: Model | dict[str, any]) -> any:
+    """
+    Get the primary key of a sampled model instance or ``.values()`` row.
+    """
+    return instance['pk'] if isinstance(instance, dict) else instance.pk
+
+
+class BaseRandomSampler(ABC):
+    """
+    Abstract Base Class for picking a uniformly random row from a queryset without sorting the whole table.
+    """
+
+    @property
+    @abstractmethod
+    def sampler_key(self) -> str:
+        raise NotImplementedError('Subclasses must implement ``sampler_key``!')
+
+    @abstractmethod
+    def sample(self, queryset: QuerySet) -> Model | None:
+        raise NotImplementedError('Subclasses must implement ``sample``!')
+
+    async def asample(self, queryset: QuerySet) -> Model | None:
+        """
+        Async variant of ``sample``. Runs ``sample`` in a thread, subclasses override it with the async ORM.
+        """
+        return await sync_to_async(self.sample)(queryset=queryset)
+
+    def sample_many(self, queryset: QuerySet, count: int) -> list[Model]:
+        """
+        Pick up to ``count`` distinct random rows. Falls back to repeated ``sample`` calls, subclasses override it to
+        pick the rows with a single sampling query.
+        """
+        instances: dict[any, Model] = {}
+
+        for _ in range(count * 2):
+            if len(instances) >= count:
+                break
+
+            instance: Model | None = self.sample(queryset=queryset)
+
+            if instance is None:
+                break
+
+            instances.setdefault(get_instance_pk(instance=instance), instance)
+
+        return list(instances.values())
+
+
+class OrderByRandomSampler(BaseRandomSampler):
+    """
+    The original ``ORDER BY RANDOM()`` strategy: exact, but sorts every matching row (O(n log n)).
+    """
+
+    @property
+    def sampler_key(self) -> str:
+        return 'order_by_random'
+
+    def sample(self, queryset: QuerySet) -> Model | None:
+        return queryset.order_by('?').first()
+
+    async def asample(self, queryset: QuerySet) -> Model | None:
+        return await queryset.order_by('?').afirst()
+
+    def sample_many(self, queryset: QuerySet, count: int) -> list[Model]:
+        return list(queryset.order_by('?')[:count])
+
+
+class IdRangeSampler(BaseRandomSampler):
+    """
+    Probes random primary keys between the lowest and highest key of the queryset (O(log n) per probe).
+
+    Every probe is an independent, uniform pick, so rejecting misses keeps the distribution exactly uniform. When the
+    key space is too sparse (e.g. a small category), it falls back to a uniform ``COUNT`` + ``OFFSET`` pick.
+    """
+
+    def __init__(self, max_probes: int = 8) -> None:
+        self.max_probes = max_probes
+
+    @property
+    def sampler_key(self) -> str:
+        return 'id_range'
+
+    def sample(self, queryset: QuerySet) -> Model | None:
+        queryset = queryset.order_by()
+        bounds: dict[str, int | None] = queryset.aggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+        min_pk: int | None = bounds['min_pk']
+        max_pk: int | None = bounds['max_pk']
+
+        if min_pk is None:
+            return None
+
+        for _ in range(self.max_probes):
+            instance: Model | None = queryset.filter(pk=random.randint(min_pk, max_pk)).first()
+
+            if instance is not None:
+                return instance
+
+        count: int = queryset.count()
+
+        return queryset.order_by('pk')[random.randrange(count)] if count else None
+
+    async def asample(self, queryset: QuerySet) -> Model | None:
+        queryset = queryset.order_by()
+        bounds: dict[str, int | None] = await queryset.aaggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+        min_pk: int | None = bounds['min_pk']
+        max_pk: int | None = bounds['max_pk']
+
+        if min_pk is None:
+            return None
+
+        for _ in range(self.max_probes):
+            instance: Model | None = await queryset.filter(pk=random.randint(min_pk, max_pk)).afirst()
+
+            if instance is not None:
+                return instance
+
+        count: int = await queryset.acount()
+
+        return await queryset.order_by('pk')[random.randrange(count):].afirst() if count else None
+
+    def sample_many(self, queryset: QuerySet, count: int) -> list[Model]:
+        """
+        Probes ``count`` random primary keys (oversampled to make up for misses) with a single ``IN`` query per round.
+        Every found key is a uniform pick, so the result is a uniform sample without replacement.
+        """
+        queryset = queryset.order_by()
+        bounds: dict[str, int | None] = queryset.aggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+        min_pk: int | None = bounds['min_pk']
+        max_pk: int | None = bounds['max_pk']
+
+        if min_pk is None:
+            return []
+
+        instances: dict[int, Model] = {}
+        key_space: int = max_pk - min_pk + 1
+
+        for _ in range(self.max_probes):
+            missing: int = count - len(instances)
+            probe_count: int = min(key_space, missing * 2)
+            found: int = 0
+            probed: list[Model] = list(queryset.filter(pk__in=random.sample(range(min_pk, max_pk + 1), k=probe_count)))
+            # The rows come back in key order, shuffle them so the ones that are kept are not the lowest keys
+            random.shuffle(probed)
+
+            for instance in probed:
+                if len(instances) < count and get_instance_pk(instance=instance) not in instances:
+                    instances[get_instance_pk(instance=instance)] = instance
+                    found += 1
+
+            if len(instances) >= count or probe_count == key_space:
+                # Either done, or every key was probed so the queryset has no other rows
+                return list(instances.values())
+
+            if not found:
+                break
+
+        # Too sparse: fall back to a (uniform) random order of the remaining rows
+        remaining: QuerySet = queryset.exclude(pk__in=list(instances)).order_by('?')
+
+        return list(instances.values()) + list(remaining[:count - len(instances)])
+
+
+class RandomKeySampler(BaseRandomSampler):
+    """
+    Seeks the first row at or after a random point on the indexed ``random_key`` column (O(log n)), wrapping around at
+    the end of the index.
+
+    The keys are independent uniform values, so the distribution is uniform up to the (small) variance of the gaps
+    between neighbouring keys.
+    """
+
+    @property
+    def sampler_key(self) -> str:
+        return 'random_key'
+
+    def sample(self, queryset: QuerySet) -> Model | None:
+        queryset = queryset.order_by('random_key')
+        instance: Model | None = queryset.filter(random_key__gte=random.random()).first()
+
+        return instance if instance is not None else queryset.first()
+
+    async def asample(self, queryset: QuerySet) -> Model | None:
+        queryset = queryset.order_by('random_key')
+        instance: Model | None = await queryset.filter(random_key__gte=random.random()).afirst()
+
+        return instance if instance is not None else await queryset.afirst()
+
+    def sample_many(self, queryset: QuerySet, count: int, oversampling: int = 2) -> list[Model]:
+        """
+        Seeks ``count * oversampling`` independent random points of the ``random_key`` index (each wrapping around)
+        with a single query, one ``OR``-ed subquery per point, and picks ``count`` of the distinct rows found. Unlike
+        reading a run of neighbouring rows, the picks are not correlated. Small querysets, where the seeks keep
+        hitting the same rows, are topped up with a random order of the remaining rows.
+        """
+        if count < 1:
+            return []
+
+        queryset = queryset.order_by()
+        seeks: QuerySet = queryset.order_by('random_key').values('pk')
+        first_pk = Subquery(seeks[:1])
+        condition = Q()
+
+        for _ in range(count * oversampling):
+            condition |= Q(pk=Coalesce(Subquery(seeks.filter(random_key__gte=random.random())[:1]), first_pk))
+
+        instances: list[Model] = list(queryset.filter(condition))
+        random.shuffle(instances)
+        instances = instances[:count]
+
+        if len(instances) < count:
+            found_pks: list = [get_instance_pk(instance=instance) for instance in instances]
+            instances += list(queryset.exclude(pk__in=found_pks).order_by('?')[:count - len(instances)])
+
+        return instances
+
+
+class TableSampleSampler(BaseRandomSampler):
+    """
+    Uses PostgreSQL's ``TABLESAMPLE`` to read a small random subset of pages and picks a row from that subset, so only
+    the sample is sorted. Falls back to ``ORDER BY RANDOM()`` on other database vendors, on tables that have not been
+    analyzed yet and when the sample contains no matching rows (e.g. a very selective filter).
+    """
+
+    def __init__(self, sample_rows: int = 100, method: str = 'SYSTEM') -> None:
+        self.sample_rows = sample_rows
+        self.method = method
+        self.fallback = OrderByRandomSampler()
+
+    @property
+    def sampler_key(self) -> str:
+        return 'table_sample'
+
+    def sample(self, queryset: QuerySet) -> Model | None:
+        if connection.vendor != 'postgresql':
+            return self.fallback.sample(queryset=queryset)
+
+        opts = queryset.model._meta
+        estimated_rows: float = get_estimated_row_count(db_table=opts.db_table)
+
+        if estimated_rows <= 0:
+            return self.fallback.sample(queryset=queryset)
+
+        percentage: float = min(100.0, 100.0 * self.sample_rows / estimated_rows)
+        sampled_pks = RawSQL(
+            f'SELECT {connection.ops.quote_name(opts.pk.column)} '
+            f'FROM {connection.ops.quote_name(opts.db_table)} TABLESAMPLE {self.method} (%s)',
+            (percentage,),
+        )
+        instance: Model | None = queryset.filter(pk__in=sampled_pks).order_by('?').first()
+
+        return instance if instance is not None else self.fallback.sample(queryset=queryset)
+
+    def sample_many(self, queryset: QuerySet, count: int) -> list[Model]:
+        if connection.vendor != 'postgresql':
+            return self.fallback.sample_many(queryset=queryset, count=count)
+
+        opts = queryset.model._meta
+        estimated_rows: float = get_estimated_row_count(db_table=opts.db_table)
+
+        if estimated_rows <= 0:
+            return self.fallback.sample_many(queryset=queryset, count=count)
+
+        percentage: float = min(100.0, 100.0 * max(self.sample_rows, count * 4) / estimated_rows)
+        sampled_pks = RawSQL(
+            f'SELECT {connection.ops.quote_name(opts.pk.column)} '
+            f'FROM {connection.ops.quote_name(opts.db_table)} TABLESAMPLE {self.method} (%s)',
+            (percentage,),
+        )
+        instances: list[Model] = list(queryset.filter(pk__in=sampled_pks).order_by('?')[:count])
+
+        return instances if len(instances) >= count else self.fallback.sample_many(queryset=queryset, count=count)
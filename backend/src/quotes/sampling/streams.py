@@ -0,0 +1,129 @@
+import logging
+import random
+from hashlib import blake2b
+
+from django.contrib.sessions.backends.base import SessionBase
+from django.db.models import Max, Min, Model, QuerySet
+
+logger = logging.getLogger('quotes')
+
+STREAM_SESSION_KEY = 'quotes_stream'
+
+
+class FeistelPermutation:
+    """
+    Pseudo-random permutation of ``range(size)``, defined by a seed only: a Feistel network on the smallest even number
+    of bits that covers ``size``, with cycle walking to map the values outside of the range back into it. Looking up
+    the value at an index is O(1) (on average fewer than 4 network evaluations), without storing the permutation.
+    """
+
+    def __init__(self, size: int, seed: int, rounds: int = 4) -> None:
+        self.size = size
+        self.seed = seed
+        self.rounds = rounds
+        self.half_bits = max(1, (max(size - 1, 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+
+    def _round(self, value: int, round_number: int) -> int:
+        digest: bytes = blake2b(f'{self.seed}:{round_number}:{value}'.encode(), digest_size=8).digest()
+
+        return int.from_bytes(digest, 'big') & self.half_mask
+
+    def _encrypt(self, value: int) -> int:
+        left: int = value >> self.half_bits
+        right: int = value & self.half_mask
+
+        for round_number in range(self.rounds):
+            left, right = right, left ^ self._round(value=right, round_number=round_number)
+
+        return (left << self.half_bits) | right
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError(f'Index {index} is out of range for a permutation of size {self.size}')
+
+        value: int = self._encrypt(value=index)
+
+        # The network permutes the whole power of 4, so following the cycle always leads back into the range
+        while value >= self.size:
+            value = self._encrypt(value=value)
+
+        return value
+
+
+class QuoteStream:
+    """
+    Per-session stream of random quotes without repeats: walks a pseudo-random permutation of the primary key range of
+    the quotes, stored in the session as a seed, a cursor and an epoch (plus the key range of the epoch).
+
+    Deleted quotes (and gaps in the keys) are skipped, quotes added during an epoch join the stream in the next one.
+    An epoch ends when the permutation is exhausted, i.e. after every quote has been served once.
+    """
+
+    def __init__(self, session: SessionBase, probe_batch_size: int = 16, max_probe_batches: int = 4) -> None:
+        self.session = session
+        self.probe_batch_size = probe_batch_size
+        self.max_probe_batches = max_probe_batches
+
+    def get_state(self) -> dict[str, int] | None:
+        return self.session.get(STREAM_SESSION_KEY)
+
+    def start_epoch(self, queryset: QuerySet, epoch: int) -> dict[str, int] | None:
+        bounds: dict[str, int | None] = queryset.order_by().aggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+
+        if bounds['min_pk'] is None:
+            return None
+
+        return {
+            'seed': random.getrandbits(32),
+            'cursor': 0,
+            'epoch': epoch,
+            'low': bounds['min_pk'],
+            'size': bounds['max_pk'] - bounds['min_pk'] + 1,
+        }
+
+    def next(self, queryset: QuerySet) -> Model | None:
+        """
+        Get the next quote of the stream, with a single query for a batch of upcoming keys in the common case.
+        """
+        state: dict[str, int] | None = self.get_state()
+
+        if state is None:
+            state = self.start_epoch(queryset=queryset, epoch=0)
+
+        # A restarted epoch may again start with missing keys, so allow one extra round of probing
+        for _ in range(self.max_probe_batches + 1):
+            if state is None:
+                return None
+
+            permutation = FeistelPermutation(size=state['size'], seed=state['seed'])
+            candidates: list[int] = [
+                state['low'] + permutation[index]
+                for index in range(state['cursor'], min(state['cursor'] + self.probe_batch_size, state['size']))
+            ]
+            instances: dict[int, Model] = {instance.pk: instance for instance in queryset.filter(pk__in=candidates)}
+
+            for offset, pk in enumerate(candidates):
+                if pk in instances:
+                    state['cursor'] += offset + 1
+                    self.save_state(state=state)
+
+                    return instances[pk]
+
+            state['cursor'] += len(candidates)
+
+            if state['cursor'] >= state['size']:
+                logger.debug(msg=f'Random quote stream epoch {state["epoch"]} exhausted, starting a new one')
+                state = self.start_epoch(queryset=queryset, epoch=state['epoch'] + 1)
+
+        # The key range is too sparse to find a quote in a few batches, serve this one without the stream
+        logger.warning(msg='Random quote stream found no quote in the probed keys, sampling without the stream')
+        self.save_state(state=state)
+
+        return queryset.order_by('?').first()
+
+    def save_state(self, state: dict[str, int] | None) -> None:
+        self.session[STREAM_SESSION_KEY] = state
@@ -0,0 +1,281 @@
+import logging
+import random
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+from ..models import Quote
+
+logger = logging.getLogger('quotes')
+
+
+def compute_quote_weight(likes: int, dislikes: int, prior_likes: float, prior_dislikes: float) -> float:
+    """
+    Weight of a quote: the posterior mean of its like ratio with a Beta(``prior_likes``, ``prior_dislikes``) prior, so
+    quotes without votes get the prior mean instead of nothing.
+    """
+    return (likes + prior_likes) / (likes + dislikes + prior_likes + prior_dislikes)
+
+
+class FenwickTree:
+    """
+    Binary indexed tree of non-negative weights: updating a weight, appending one and finding the index at a
+    cumulative weight are O(log n).
+    """
+
+    def __init__(self, weights: list[float] = ()) -> None:
+        # 1-based, ``self._tree[i]`` holds the sum of the weights (i - lowbit(i), i]
+        self._tree: array = array('d', [0.0])
+        self._weights: array = array('d')
+
+        for weight in weights:
+            self.append(weight=weight)
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    @property
+    def total(self) -> float:
+        return self.prefix_sum(count=len(self._weights))
+
+    def prefix_sum(self, count: int) -> float:
+        """
+        Sum of the first ``count`` weights.
+        """
+        total: float = 0.0
+
+        while count > 0:
+            total += self._tree[count]
+            count &= count - 1
+
+        return total
+
+    def append(self, weight: float) -> int:
+        """
+        Append a weight and return its index.
+        """
+        self._weights.append(weight)
+        position: int = len(self._weights)
+        lowest_bit: int = position & -position
+        self._tree.append(weight + self.prefix_sum(count=position - 1) - self.prefix_sum(count=position - lowest_bit))
+
+        return position - 1
+
+    def set(self, index: int, weight: float) -> None:
+        delta: float = weight - self._weights[index]
+        self._weights[index] = weight
+        position: int = index + 1
+
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def find(self, value: float) -> int:
+        """
+        Get the index of the weight whose cumulative range contains ``value`` (0 <= ``value`` < ``total``).
+        """
+        position: int = 0
+        step: int = 1 << (len(self._tree) - 1).bit_length()
+
+        while step:
+            next_position: int = position + step
+
+            if next_position < len(self._tree) and self._tree[next_position] <= value:
+                position = next_position
+                value -= self._tree[next_position]
+
+            step >>= 1
+
+        return min(position, len(self._weights) - 1)
+
+
+class WeightedQuoteSampler:
+    """
+    Per-process, in-memory sampler that picks quotes with a probability proportional to their weight (@see
+    ``compute_quote_weight``) in O(log n), without sorting in the database.
+
+    The weights are loaded once (a single scan of the primary keys and vote counts) and kept up to date incrementally
+    by the votes and saves of this process. Votes in other processes are picked up by rebuilding the sampler once it
+    is older than ``max_age`` seconds: a single request rebuilds it while the others keep sampling the old weights
+    (@see ``refresh``).
+    """
+
+    def __init__(self, prior_likes: float, prior_dislikes: float, max_age: float, max_attempts: int = 8) -> None:
+        self.prior_likes = prior_likes
+        self.prior_dislikes = prior_dislikes
+        self.max_age = max_age
+        self.max_attempts = max_attempts
+        self._tree: FenwickTree | None = None
+        self._pks: array = array('q')
+        self._positions: dict[int, int] = {}
+        self._built_at: float = 0.0
+        self._generation: int = 0
+        # Guards the weights, while ``_build_lock`` lets a single thread at a time load them
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._tree is not None
+
+    def build(self) -> None:
+        with self._lock:
+            generation: int = self._generation
+
+        tree = FenwickTree()
+        pks: array = array('q')
+        positions: dict[int, int] = {}
+
+        for pk, likes, dislikes in Quote.objects.order_by().values_list('pk', 'likes', 'dislikes').iterator():
+            positions[pk] = tree.append(weight=self.get_weight(likes=likes, dislikes=dislikes))
+            pks.append(pk)
+
+        with self._lock:
+            self._tree, self._pks, self._positions = tree, pks, positions
+            # Invalidated while loading (e.g. by a bulk insert): the weights may miss quotes, keep them until the next
+            # sample rebuilds them
+            self._built_at = time.monotonic() if generation == self._generation else 0.0
+
+        logger.debug(msg=f'Built the weighted quote sampler with {len(pks)} quotes')
+
+    def invalidate(self) -> None:
+        """
+        Drop the weights, they are loaded again on the next sample (e.g. after a bulk insert).
+        """
+        with self._lock:
+            self._tree, self._pks, self._positions = None, array('q'), {}
+            self._generation += 1
+
+    def refresh(self) -> None:
+        """
+        Rebuild the sampler when it is missing or older than ``max_age``. Only one thread rebuilds it: while the old
+        weights can still be sampled the other threads don't wait for it, otherwise they wait for the rebuilt weights.
+        """
+        with self._lock:
+            is_built: bool = self._tree is not None
+            is_stale: bool = time.monotonic() - self._built_at > self.max_age
+
+        if is_built and not is_stale:
+            return
+
+        if not self._build_lock.acquire(blocking=not is_built):
+            return
+
+        try:
+            with self._lock:
+                # Rebuilt by the thread that held the lock
+                is_current: bool = self._tree is not None and time.monotonic() - self._built_at <= self.max_age
+
+            if not is_current:
+                self.build()
+        finally:
+            self._build_lock.release()
+
+    def get_weight(self, likes: int, dislikes: int) -> float:
+        return compute_quote_weight(likes=likes, dislikes=dislikes, prior_likes=self.prior_likes,
+                                    prior_dislikes=self.prior_dislikes)
+
+    def update(self, quote: Quote) -> None:
+        """
+        Update (or add) the weight of a quote after a vote or a save. Does nothing until the sampler is built.
+        """
+        with self._lock:
+            if self._tree is None:
+                return
+
+            weight: float = self.get_weight(likes=quote.likes, dislikes=quote.dislikes)
+            position: int | None = self._positions.get(quote.pk)
+
+            if position is None:
+                self._positions[quote.pk] = self._tree.append(weight=weight)
+                self._pks.append(quote.pk)
+            else:
+                self._tree.set(index=position, weight=weight)
+
+    def remove(self, pk: int) -> None:
+        with self._lock:
+            position: int | None = self._positions.get(pk) if self._tree is not None else None
+
+            if position is not None:
+                self._tree.set(index=position, weight=0.0)
+
+    def sample_pks(self, count: int) -> list[int]:
+        """
+        Draw up to ``count`` distinct primary keys, weighted (without replacement, by rejecting repeated draws).
+        """
+        self.refresh()
+        pks: dict[int, None] = {}
+
+        with self._lock:
+            # Invalidated since the refresh
+            if self._tree is None:
+                return []
+
+            total: float = self._tree.total
+
+            if total <= 0:
+                return []
+
+            for _ in range(count * 4):
+                if len(pks) >= count:
+                    break
+
+                pks.setdefault(self._pks[self._tree.find(value=random.random() * total)])
+
+        return list(pks)
+
+    def sample_many(self, queryset: QuerySet, count: int) -> list[Quote]:
+        """
+        Pick up to ``count`` distinct weighted random quotes with a single query per attempt. Quotes that no longer
+        exist (deleted by another process) are dropped from the sampler.
+        """
+        quotes: dict[int, Quote] = {}
+
+        for _ in range(self.max_attempts):
+            pks: list[int] = [pk for pk in self.sample_pks(count=count - len(quotes)) if pk not in quotes]
+
+            if not pks:
+                break
+
+            found: dict[int, Quote] = {quote.pk: quote for quote in queryset.filter(pk__in=pks)}
+
+            for pk in pks:
+                if pk in found:
+                    quotes[pk] = found[pk]
+                else:
+                    self.remove(pk=pk)
+
+            if len(quotes) >= count:
+                break
+
+        return list(quotes.values())
+
+    def sample(self, queryset: QuerySet) -> Quote | None:
+        quotes: list[Quote] = self.sample_many(queryset=queryset, count=1)
+
+        return quotes[0] if quotes else None
+
+
+_weighted_sampler: WeightedQuoteSampler | None = None
+_weighted_sampler_lock = threading.Lock()
+
+
+def get_weighted_sampler() -> WeightedQuoteSampler:
+    """
+    Get this process' weighted quote sampler, configured with the ``QUOTES_WEIGHTED_*`` settings.
+    """
+    global _weighted_sampler
+
+    if _weighted_sampler is None:
+        with _weighted_sampler_lock:
+            if _weighted_sampler is None:
+                _weighted_sampler = WeightedQuoteSampler(
+                    prior_likes=settings.QUOTES_WEIGHTED_PRIOR_LIKES,
+                    prior_dislikes=settings.QUOTES_WEIGHTED_PRIOR_DISLIKES,
+                    max_age=settings.QUOTES_WEIGHTED_MAX_AGE,
+                )
+
+    return _weighted_sampler
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from quotes.models import Author, Category, Quote, QuoteOrigin
+from quotes.utils.vote_totals import apply_vote_totals, get_annotated_vote_totals
 
 
 class AuthorSerializer(serializers.ModelSerializer):
@@ -29,4 +30,101 @@ class QuoteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Quote
         fields = ['guid', 'created', 'modified', 'author', 'category', 'quote_text', 'image_url', 'image_alt_text',
-                  'origin', 'likes', 'dislikes']
+                  'origin', 'likes', 'dislikes', 'net_score', 'wilson_score']
+
+
+class FastQuoteSerializer:
+    """
+    Read-only fast path that produces the same output as ``QuoteSerializer``, without DRF's (nested) field machinery.
+
+    It serializes ``Quote`` instances (with ``author``, ``category`` and ``origin`` selected) as well as the flat rows of
+    ``queryset.values(*FastQuoteSerializer.values_fields)``, which skip model instantiation altogether. It mirrors the
+    ``data``/``many`` interface of DRF serializers, but does no validation.
+
+    With sharded votes (``QUOTES_VOTE_SHARDS``) the votes include the ones on the shards: from the ``total_likes`` and
+    ``total_dislikes`` annotations (@see ``get_vote_total_annotations``), or else from the cached totals.
+    """
+    values_fields = (
+        'pk', 'guid', 'created', 'modified', 'author_id', 'author__name', 'category_id', 'category__name',
+        'quote_text', 'image_url', 'image_alt_text', 'origin_id', 'origin__api_client_key', 'origin__url', 'likes',
+        'dislikes', 'net_score', 'wilson_score',
+    )
+    # Used for its formatting of datetimes only (which depends on the REST_FRAMEWORK settings and the time zone)
+    _datetime_field = serializers.DateTimeField()
+
+    def __init__(self, instance: Quote | dict[str, any] | list[Quote | dict[str, any]] | None, many: bool = False,
+                 **kwargs) -> None:
+        self.instance = instance
+        self.many = many
+
+    @property
+    def data(self) -> dict[str, any] | list[dict[str, any]]:
+        if self.instance is None:
+            # Like ``QuoteSerializer``: no quotes, or the empty values of the fields
+            return [] if self.many else QuoteSerializer().data
+
+        instances: list[Quote | dict[str, any]] = list(self.instance) if self.many else [self.instance]
+        payloads: list[dict[str, any]] = [self.to_representation(instance=instance) for instance in instances]
+        # The totals of the quotes that were not annotated with them, at once
+        apply_vote_totals(payloads=[
+            payload for payload, instance in zip(payloads, instances)
+            if get_annotated_vote_totals(instance=instance) is None
+        ])
+
+        return payloads if self.many else payloads[0]
+
+    @classmethod
+    def to_representation(cls, instance: Quote | dict[str, any]) -> dict[str, any]:
+        payload: dict[str, any] = (
+            cls.row_to_representation(row=instance) if isinstance(instance, dict)
+            else cls.instance_to_representation(instance=instance)
+        )
+        totals: tuple[int, int] | None = get_annotated_vote_totals(instance=instance)
+
+        if totals is not None:
+            apply_vote_totals(payloads=[payload], totals={payload['guid']: totals})
+
+        return payload
+
+    @classmethod
+    def instance_to_representation(cls, instance: Quote) -> dict[str, any]:
+        author: Author | None = instance.author
+        category: Category | None = instance.category
+        origin: QuoteOrigin | None = instance.origin
+
+        return {
+            'guid': str(instance.guid),
+            'created': cls._datetime_field.to_representation(value=instance.created),
+            'modified': cls._datetime_field.to_representation(value=instance.modified),
+            'author': None if author is None else {'name': author.name},
+            'category': None if category is None else {'name': category.name},
+            'quote_text': instance.quote_text,
+            'image_url': instance.image_url,
+            'image_alt_text': instance.image_alt_text,
+            'origin': None if origin is None else {'api_client_key': origin.api_client_key, 'url': origin.url},
+            'likes': instance.likes,
+            'dislikes': instance.dislikes,
+            'net_score': instance.net_score,
+            'wilson_score': instance.wilson_score,
+        }
+
+    @classmethod
+    def row_to_representation(cls, row: dict[str, any]) -> dict[str, any]:
+        return {
+            'guid': str(row['guid']),
+            'created': cls._datetime_field.to_representation(value=row['created']),
+            'modified': cls._datetime_field.to_representation(value=row['modified']),
+            'author': None if row['author_id'] is None else {'name': row['author__name']},
+            'category': None if row['category_id'] is None else {'name': row['category__name']},
+            'quote_text': row['quote_text'],
+            'image_url': row['image_url'],
+            'image_alt_text': row['image_alt_text'],
+            'origin': None if row['origin_id'] is None else {
+                'api_client_key': row['origin__api_client_key'],
+                'url': row['origin__url'],
+            },
+            'likes': row['likes'],
+            'dislikes': row['dislikes'],
+            'net_score': row['net_score'],
+            'wilson_score': row['wilson_score'],
+        }
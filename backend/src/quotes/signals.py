@@ -0,0 +1,135 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from contrib.versions import bump_model_version
+from .models import Author, Category, CategoryAlias, Quote, QuoteOrigin
+from .sampling.weighted import get_weighted_sampler
+from .utils.categories import invalidate_category_ids, update_category_quote_counts
+from .utils.leaderboard import remove_from_leaderboards, update_leaderboards
+from .utils.random_pool import get_random_quote_pool
+from .utils.search import update_search_vectors
+
+
+@receiver(signal=(post_save, post_delete), sender=Quote)
+def evict_quote_from_random_quote_pool(sender: type[Quote], instance: Quote, **kwargs) -> None:
+    """
+    Make sure an edited (or deleted) quote is never served from a stale random quote pool entry.
+    """
+    if settings.QUOTES_RANDOM_POOL_ENABLED:
+        get_random_quote_pool().evict(guid=instance.guid)
+
+
+@receiver(signal=post_save, sender=Quote)
+def update_quote_on_leaderboards(sender: type[Quote], instance: Quote, **kwargs) -> None:
+    update_leaderboards(quote=instance)
+
+
+@receiver(signal=post_delete, sender=Quote)
+def remove_quote_from_leaderboards(sender: type[Quote], instance: Quote, **kwargs) -> None:
+    remove_from_leaderboards(quote=instance)
+
+
+@receiver(signal=post_delete, sender=Quote)
+def bump_quote_version(sender: type[Quote], instance: Quote, **kwargs) -> None:
+    """
+    Make sure cached quote lists are not served after a quote was deleted.
+    """
+    bump_model_version(model=Quote)
+
+
+@receiver(signal=(post_save, post_delete), sender=Author)
+@receiver(signal=(post_save, post_delete), sender=Category)
+@receiver(signal=(post_save, post_delete), sender=QuoteOrigin)
+def bump_quote_version_on_rename(sender: type[Author | Category | QuoteOrigin],
+                                 instance: Author | Category | QuoteOrigin, created: bool = False, **kwargs) -> None:
+    """
+    Make sure cached quotes are not served with the old name of a renamed (or deleted) author, category or origin. A
+    deletion sets the foreign keys of the quotes to NULL with a single UPDATE, which changes neither their ``modified``
+    nor sends any quote signal.
+    """
+    if not created:
+        bump_model_version(model=Quote)
+
+
+@receiver(signal=post_save, sender=Quote)
+def count_saved_quote(sender: type[Quote], instance: Quote, created: bool, **kwargs) -> None:
+    """
+    Keep the quote counts of the categories up to date when a quote is created or moved to another category.
+    """
+    loaded_category_id: int | None = getattr(instance, '_loaded_category_id', None)
+
+    if created:
+        update_category_quote_counts(deltas={instance.category_id: 1})
+    elif loaded_category_id != instance.category_id and hasattr(instance, '_loaded_category_id'):
+        update_category_quote_counts(deltas={loaded_category_id: -1, instance.category_id: 1})
+
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(signal=post_delete, sender=Quote)
+def count_deleted_quote(sender: type[Quote], instance: Quote, **kwargs) -> None:
+    update_category_quote_counts(deltas={instance.category_id: -1})
+
+
+@receiver(signal=(post_save, post_delete), sender=Category)
+@receiver(signal=(post_save, post_delete), sender=CategoryAlias)
+def invalidate_category_lookup(sender: type[Category | CategoryAlias], instance: Category | CategoryAlias,
+                               **kwargs) -> None:
+    invalidate_category_ids()
+
+
+@receiver(signal=post_save, sender=Quote)
+def update_weighted_sampler(sender: type[Quote], instance: Quote, **kwargs) -> None:
+    get_weighted_sampler().update(quote=instance)
+
+
+@receiver(signal=post_delete, sender=Quote)
+def remove_from_weighted_sampler(sender: type[Quote], instance: Quote, **kwargs) -> None:
+    get_weighted_sampler().remove(pk=instance.pk)
+
+
+@receiver(signal=post_save, sender=Quote)
+def update_quote_search_vector(sender: type[Quote], instance: Quote, update_fields: frozenset[str] | None,
+                               **kwargs) -> None:
+    if update_fields is None or update_fields & {'quote_text', 'author', 'category'}:
+        update_search_vectors(queryset=Quote.objects.filter(pk=instance.pk))
+
+
+@receiver(signal=post_save, sender=Author)
+@receiver(signal=post_save, sender=Category)
+def update_search_vectors_of_quotes(sender: type[Author | Category], instance: Author | Category, created: bool,
+                                   **kwargs) -> None:
+    """
+    Make sure a renamed author or category is found by (and only by) its new name.
+    """
+    if not created:
+        update_search_vectors(queryset=Quote.objects.filter(**{sender._meta.model_name: instance}))
+
+
+@receiver(signal=pre_delete, sender=Author)
+@receiver(signal=pre_delete, sender=Category)
+def update_search_vectors_of_quotes_on_delete(sender: type[Author | Category], instance: Author | Category,
+                                              **kwargs) -> None:
+    """
+    Make sure quotes are no longer found by the name of a deleted author or category. Their foreign keys are only set
+    to NULL by the deletion, so the quotes are collected before it and updated once it is committed.
+    """
+    pks: list[int] = list(Quote.objects.filter(**{sender._meta.model_name: instance}).values_list('pk', flat=True))
+
+    if pks:
+        transaction.on_commit(lambda: update_search_vectors(queryset=Quote.objects.filter(pk__in=pks)))
+
+
+@receiver(signal=(post_save, post_delete), sender=Author)
+@receiver(signal=(post_save, post_delete), sender=Category)
+@receiver(signal=(post_save, post_delete), sender=QuoteOrigin)
+def invalidate_dimension_ids(sender: type[Author | Category | QuoteOrigin], instance: Author | Category | QuoteOrigin,
+                             created: bool = False, **kwargs) -> None:
+    """
+    Make sure the ingestion of every process stops resolving the old name of a renamed (or deleted) author, category or
+    origin to its id (@see ``quotes.utils.dimensions``).
+    """
+    if not created:
+        bump_model_version(model=sender)
@@ -13,6 +13,7 @@ fake = Faker(locale=locale)
 class AuthorFactory(DjangoModelFactory):
     class Meta:
         model = Author
+        django_get_or_create = ('name',)
 
     name = factory.Faker(provider='name', locale=locale)
 
@@ -20,6 +21,7 @@ class AuthorFactory(DjangoModelFactory):
 class CategoryFactory(DjangoModelFactory):
     class Meta:
         model = Category
+        django_get_or_create = ('name',)
 
     name = factory.Faker(provider='word', locale=locale)
 
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from quotes.api.clients import BaseQuoteAPIClient
+from quotes.api.models import Quote as QuoteData
+from quotes.enums import QuoteSource
+from quotes.models import Quote
+from quotes.tests.factories import CategoryFactory, QuoteFactory
+from quotes.utils.quote_fetching import afetch_random_quote_from_api_client
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class AsyncQuotesAPITests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cache.clear()
+        cls.quote = QuoteFactory(category=CategoryFactory(name='Some Category'), likes=1, dislikes=1)
+
+    @mock.patch('quotes.utils.quote_fetching.get_random_quote_source', return_value=QuoteSource.DATABASE)
+    async def test_get_random_quote(self, _) -> None:
+        url = reverse(viewname='async-quotes-get-random-quote')
+
+        response = await self.async_client.get(url)
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['guid'], second=str(self.quote.guid))
+
+        response = await self.async_client.get(url, query_params={'mode': 'stream'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['guid'], second=str(self.quote.guid))
+
+        response = await self.async_client.get(url, query_params={'mode': 'sequential'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+    async def test_get_random_quote_by_category(self) -> None:
+        url = reverse(viewname='async-quotes-get-random-quote-by-category')
+
+        response = await self.async_client.get(url, query_params={'category': 'some category'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['guid'], second=str(self.quote.guid))
+
+        response = await self.async_client.get(url, query_params={'category': 'unknown'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_404_NOT_FOUND)
+
+    async def test_like(self) -> None:
+        response = await self.async_client.patch(
+            f'{reverse(viewname="async-quotes-like", kwargs={"guid": self.quote.guid})}?direction=increase')
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['likes'], second=2)
+
+        response = await self.async_client.patch(
+            f'{reverse(viewname="async-quotes-dislike", kwargs={"guid": self.quote.guid})}?direction=decrease')
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['dislikes'], second=0)
+
+        response = await self.async_client.get(reverse(viewname='async-quotes-like', kwargs={'guid': self.quote.guid}))
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @override_settings(QUOTES_IMAGE_ENRICHMENT_MODE='queue')
+    async def test_fetch_random_quote_from_api_client(self) -> None:
+        quote_data = QuoteData(api_client_key='zen_quotes', author='Author', category='zen', image_search_query='zen',
+                               origin='https://zenquotes.io/api/', quote_text='An async quote')
+
+        with mock.patch.object(BaseQuoteAPIClient, 'afetch_random_quote', return_value=quote_data) as fetch:
+            quote = await afetch_random_quote_from_api_client()
+
+        fetch.assert_awaited_once()
+        self.assertEqual(first=quote.quote_text, second='An async quote')
+        self.assertTrue(expr=await Quote.objects.filter(quote_text='An async quote', category__name='zen').aexists())
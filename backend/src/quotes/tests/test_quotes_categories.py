@@ -0,0 +1,114 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from quotes.api.models import Quote as QuoteData
+from quotes.models import Category, CategoryAlias, Quote
+from quotes.tests.factories import CategoryFactory, QuoteFactory
+from quotes.utils.categories import refresh_category_quote_counts, resolve_category_ids, sample_quote_from_categories
+from quotes.utils.db_operations import bulk_create_quotes, insert_quotes
+from quotes.utils.quote_fetching import fetch_random_quote_from_database
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_resolve_category_ids():
+    category = CategoryFactory(name='Inspirational  Quotes')
+    CategoryAlias.objects.create(alias='Inspiration', category=category)
+
+    assert resolve_category_ids(name='inspirational quotes') == [category.pk]
+    assert resolve_category_ids(name=' INSPIRATION ') == [category.pk]
+    assert resolve_category_ids(name='inspirational') == []
+
+    # The map is cached, and invalidated when a category changes
+    with CaptureQueriesContext(connection=connection) as context:
+        assert resolve_category_ids(name='inspiration') == [category.pk]
+    assert len(context.captured_queries) == 0
+
+    category.name = 'Motivation'
+    category.save()
+
+    assert resolve_category_ids(name='motivation') == [category.pk]
+
+
+@pytest.mark.django_db
+def test_fetch_random_quote_from_database_by_category():
+    quote = QuoteFactory(category=CategoryFactory(name='Zen'))
+    QuoteFactory(category=CategoryFactory(name='Love'))
+
+    assert fetch_random_quote_from_database(category='zen') == quote
+    assert fetch_random_quote_from_database(category='unknown') is None
+    assert sample_quote_from_categories(category_ids=[CategoryFactory(name='empty').pk]) is None
+
+
+@pytest.mark.django_db
+def test_category_quote_counts():
+    zen = CategoryFactory(name='Zen')
+    love = CategoryFactory(name='Love')
+    quotes = QuoteFactory.create_batch(size=3, category=zen)
+
+    zen.refresh_from_db()
+    assert zen.quote_count == 3
+
+    quote = Quote.objects.get(pk=quotes[0].pk)
+    quote.category = love
+    quote.save()
+    quotes[1].delete()
+
+    assert dict(Category.objects.values_list('name', 'quote_count')) == {'Zen': 1, 'Love': 1}
+
+    Category.objects.update(quote_count=0)
+    refresh_category_quote_counts()
+
+    assert dict(Category.objects.values_list('name', 'quote_count')) == {'Zen': 1, 'Love': 1}
+
+
+@pytest.mark.django_db
+def test_bulk_create_quotes_counts_categories():
+    assert resolve_category_ids(name='zen') == []
+
+    quotes_data = [
+        QuoteData(api_client_key='zen_quotes', author='Author', category='zen', image_search_query='zen',
+                  origin='https://zenquotes.io/api/', quote_text=f'Quote {i}') for i in range(3)
+    ]
+
+    assert bulk_create_quotes(quotes_data=quotes_data, enqueue_images=False) == 3
+    assert Category.objects.get(name='zen').quote_count == 3
+    assert resolve_category_ids(name='Zen') == [Category.objects.get(name='zen').pk]
+
+
+@pytest.mark.django_db
+def test_resolve_category_ids_stale_map():
+    zen = CategoryFactory(name='Zen')
+    assert resolve_category_ids(name='zen') == [zen.pk]
+
+    # Imported by another process, which only invalidated its own cache
+    Category.objects.bulk_create([Category(name='Stoic')])
+    stoic = Category.objects.get(name='Stoic')
+
+    assert resolve_category_ids(name='unknown') == []
+    assert resolve_category_ids(name=' STOIC ') == [stoic.pk]
+    # The stale map was dropped and is rebuilt with the new category
+    with CaptureQueriesContext(connection=connection) as context:
+        assert resolve_category_ids(name='stoic') == [stoic.pk]
+    assert len(context.captured_queries) == 2
+
+
+@pytest.mark.django_db
+def test_insert_quotes_skips_conflicts():
+    existing_quote = QuoteFactory(category=CategoryFactory(name='Zen'))
+    new_quote = QuoteFactory.build(author=existing_quote.author, category=existing_quote.category,
+                                   origin=existing_quote.origin)
+    conflicting_quote = QuoteFactory.build(author=existing_quote.author, category=existing_quote.category,
+                                           origin=existing_quote.origin, quote_text=existing_quote.quote_text,
+                                           quote_hash=existing_quote.quote_hash)
+
+    assert insert_quotes(quotes=[conflicting_quote, new_quote]) == [new_quote]
+    assert Quote.objects.count() == 2
@@ -0,0 +1,143 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from quotes.api.models import Quote as QuoteData
+from quotes.models import Author, ImageEnrichmentJob, Quote, QuoteOrigin
+from quotes.tests.factories import QuoteFactory
+from quotes.utils import db_operations
+from quotes.utils.db_operations import bulk_create_quotes, get_ingestion_stats, get_or_create_quote
+
+
+def make_quote_data(quote_text: str, author: str = 'Author') -> QuoteData:
+    return QuoteData(api_client_key='zen_quotes', author=author, category='zen', image_search_query='zen',
+                     origin='https://zenquotes.io/api/', quote_text=quote_text)
+
+
+@pytest.mark.django_db
+def test_bulk_create_quotes():
+    existing_quote = QuoteFactory(quote_text='Existing quote')
+    quotes_data = [
+        make_quote_data(quote_text='First quote', author='First author'),
+        make_quote_data(quote_text='Second quote', author='Second author'),
+        make_quote_data(quote_text='First quote', author='First author'),
+        make_quote_data(quote_text='Existing quote'),
+    ]
+
+    assert bulk_create_quotes(quotes_data=quotes_data, random_votes=True) == 2
+    assert Quote.objects.count() == 3
+    assert set(Author.objects.values_list('name', flat=True)) >= {'First author', 'Second author'}
+    assert QuoteOrigin.objects.filter(api_client_key='zen_quotes').count() == 1
+
+    quote = Quote.objects.get(quote_text='Second quote')
+    assert quote.author.name == 'Second author'
+    assert quote.category.name == 'zen'
+    assert len(quote.quote_hash) == 64
+    assert set(ImageEnrichmentJob.objects.values_list('quote__quote_text', flat=True)) == {
+        'First quote', 'Second quote'}
+    assert not ImageEnrichmentJob.objects.filter(quote=existing_quote).exists()
+
+    # Running the same batch again (or cosmetic variants of it) inserts nothing
+    assert bulk_create_quotes(quotes_data=quotes_data) == 0
+    assert bulk_create_quotes(quotes_data=[make_quote_data(quote_text='“first   QUOTE.”')]) == 0
+
+
+@pytest.mark.django_db
+def test_get_or_create_quote_variant(settings):
+    settings.QUOTES_IMAGE_ENRICHMENT_MODE = 'queue'
+    quote = get_or_create_quote(quote_data=make_quote_data(quote_text='Stay hungry, stay foolish.'))
+
+    assert get_or_create_quote(quote_data=make_quote_data(quote_text='stay hungry stay foolish', author='Other')) == quote
+    assert Quote.objects.count() == 1
+
+
+@pytest.mark.django_db
+@patch('quotes.utils.db_operations.UnsplashImageAPIClient.get_random_image_with_parameters',
+       return_value=('https://images.unsplash.com/photo', 'Alt text'))
+def test_get_or_create_quote_existing(get_random_image, settings):
+    settings.QUOTES_IMAGE_ENRICHMENT_MODE = 'sync'
+    quote_data = make_quote_data(quote_text='Be yourself; everyone else is already taken.')
+    quote = get_or_create_quote(quote_data=quote_data)
+    stats: dict[str, int] = get_ingestion_stats()
+
+    assert quote.image_url == 'https://images.unsplash.com/photo'
+    assert get_random_image.call_count == 1
+
+    # The existing quote is returned by the hash lookup alone, without an image lookup
+    with CaptureQueriesContext(connection=connection) as context:
+        assert get_or_create_quote(quote_data=quote_data) == quote
+    assert len(context.captured_queries) == 1
+
+    assert get_random_image.call_count == 1
+    assert get_ingestion_stats() == {
+        'created': stats['created'],
+        'existing': stats['existing'] + 1,
+        'unsplash_calls_saved': stats['unsplash_calls_saved'] + 1,
+    }
+
+    # Without inline image lookups, no lookup is saved
+    settings.QUOTES_IMAGE_ENRICHMENT_MODE = 'queue'
+    get_or_create_quote(quote_data=quote_data)
+
+    assert get_ingestion_stats()['existing'] == stats['existing'] + 2
+    assert get_ingestion_stats()['unsplash_calls_saved'] == stats['unsplash_calls_saved'] + 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('file_name, content', [
+    ('quotes.jsonl', '\n'.join([
+        '{"api_client_key": "zen_quotes", "author": "First author", "category": "zen", '
+        '"origin": "https://zenquotes.io/api/", "quote_text": "First quote"}',
+        '{"api_client_key": "zen_quotes", "author": "Second author", "category": "zen", '
+        '"origin": "https://zenquotes.io/api/", "quote_text": "Second quote", "image_search_query": "zen"}',
+        '{"author": "Invalid record"}',
+        '{"api_client_key": "zen_quotes", "author": "First author", "category": "zen", '
+        '"origin": "https://zenquotes.io/api/", "quote_text": "First quote"}',
+    ])),
+    ('quotes.csv', '\n'.join([
+        'api_client_key,author,category,image_search_query,origin,quote_text',
+        'zen_quotes,First author,zen,,https://zenquotes.io/api/,First quote',
+        'zen_quotes,Second author,zen,zen,https://zenquotes.io/api/,"Second quote, with a comma"',
+        'zen_quotes,Invalid record,zen,,not a url,Invalid quote',
+        'zen_quotes,First author,zen,,https://zenquotes.io/api/,First quote',
+    ])),
+])
+def test_import_quotes_command(tmp_path, file_name, content):
+    path = tmp_path / file_name
+    path.write_text(content, encoding='utf-8')
+
+    call_command('import_quotes', str(path), batch_size=2)
+
+    assert Quote.objects.count() == 2
+    assert ImageEnrichmentJob.objects.count() == 2
+    assert set(Quote.objects.values_list('author__name', flat=True)) == {'First author', 'Second author'}
+    assert Quote.objects.get(author__name='Second author').image_enrichment_job.image_search_query == 'zen'
+
+    # Importing the same file again inserts nothing
+    call_command('import_quotes', str(path), batch_size=2, no_images=True)
+
+    assert Quote.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_pre_populate_db_command_invalid_quote():
+    quotes_data = [make_quote_data(quote_text=f'Quote {i}') for i in range(3)]
+    invalid_quote_data = make_quote_data(quote_text='Invalid quote')
+
+    def bulk_create_valid_quotes(quotes_data, **kwargs) -> int:
+        # Like a category name that is too long for the column
+        if invalid_quote_data in quotes_data:
+            raise IntegrityError('Invalid quote')
+
+        return db_operations.bulk_create_quotes(quotes_data=quotes_data, **kwargs)
+
+    with patch('quotes.management.commands.pre_populate_db.Command.fetch_quote_data',
+               side_effect=[*quotes_data, invalid_quote_data]), \
+            patch('quotes.management.commands.pre_populate_db.bulk_create_quotes', side_effect=bulk_create_valid_quotes):
+        call_command('pre_populate_db', number_of_quotes=4, workers=1)
+
+    # Only the invalid quote is lost, not the whole batch
+    assert set(Quote.objects.values_list('quote_text', flat=True)) == {'Quote 0', 'Quote 1', 'Quote 2'}
@@ -0,0 +1,128 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from contrib.versions import bump_model_version
+from quotes.api.models import Quote as QuoteData
+from quotes.models import Author, Category, QuoteOrigin
+from quotes.tests.factories import AuthorFactory, CategoryFactory
+from quotes.utils.db_operations import get_quote_dimensions
+from quotes.utils.dimensions import DimensionCache
+
+
+@pytest.mark.django_db
+def test_get_ids(django_capture_on_commit_callbacks):
+    existing_author = AuthorFactory(name='Existing author')
+    dimension_cache = DimensionCache(model=Author, max_size=10)
+    keys = {('Existing author',), ('New author',), ('Other author',)}
+
+    # The version of the table, then the insert of the missing rows and a single select of the ids of all of them
+    with CaptureQueriesContext(connection=connection) as context, django_capture_on_commit_callbacks(execute=True):
+        ids = dimension_cache.get_ids(keys=keys)
+    assert len(context.captured_queries) == 3
+
+    assert set(ids) == keys
+    assert ids[('Existing author',)] == existing_author.pk
+    assert Author.objects.get(pk=ids[('New author',)]).name == 'New author'
+
+    # Only the version
+    with CaptureQueriesContext(connection=connection) as context:
+        assert dimension_cache.get_ids(keys=keys) == ids
+    assert len(context.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_get_ids_rolled_back(django_capture_on_commit_callbacks):
+    dimension_cache = DimensionCache(model=Author, max_size=10)
+
+    # The transaction is never committed, so the new row is not cached
+    with django_capture_on_commit_callbacks(execute=False):
+        dimension_cache.get_ids(keys={('New author',)})
+
+    assert len(dimension_cache) == 0
+
+
+@pytest.mark.django_db
+def test_get_instance(django_capture_on_commit_callbacks):
+    dimension_cache = DimensionCache(model=QuoteOrigin, max_size=10)
+    key = ('https://zenquotes.io/api/', 'zen_quotes')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        dimension_cache.get_instance(key=key)
+
+    with CaptureQueriesContext(connection=connection) as context:
+        origin = dimension_cache.get_instance(key=key)
+    assert len(context.captured_queries) == 1
+
+    assert (origin.url, origin.api_client_key) == key
+    assert origin.pk == QuoteOrigin.objects.get(url=key[0]).pk
+    assert origin.get_deferred_fields() == {'guid', 'created', 'modified'}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('change', ['rename', 'delete'])
+def test_invalidation(change, django_capture_on_commit_callbacks):
+    category = CategoryFactory(name='Old name')
+    dimension_cache = DimensionCache(model=Category, max_size=10)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert dimension_cache.get_id(key=('Old name',)) == category.pk
+
+    if change == 'rename':
+        category.name = 'New name'
+        category.save()
+    else:
+        category.delete()
+
+    # The old name resolves to a new row
+    new_category_id = dimension_cache.get_id(key=('Old name',))
+
+    assert new_category_id != category.pk
+    assert Category.objects.get(pk=new_category_id).name == 'Old name'
+
+
+@pytest.mark.django_db
+def test_lru_eviction(django_capture_on_commit_callbacks):
+    dimension_cache = DimensionCache(model=Category, max_size=2)
+
+    # Recently used, so "second" is evicted instead of "first"
+    for name in ('first', 'second', 'first', 'third'):
+        with django_capture_on_commit_callbacks(execute=True):
+            dimension_cache.get_ids(keys={(name,)})
+
+    assert list(dimension_cache._ids) == [('first',), ('third',)]
+
+
+@pytest.mark.django_db
+def test_version_bumped_by_another_process(django_capture_on_commit_callbacks):
+    category = CategoryFactory(name='Old name')
+    dimension_cache = DimensionCache(model=Category, max_size=10)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert dimension_cache.get_id(key=('Old name',)) == category.pk
+
+    # Renamed by another process, whose signal only bumped the version in the database
+    Category.objects.filter(pk=category.pk).update(name='New name')
+    bump_model_version(model=Category)
+
+    assert dimension_cache.get_id(key=('Old name',)) != category.pk
+
+
+@pytest.mark.django_db
+# The process' caches would keep the ids of the rolled back rows
+@mock.patch.dict('quotes.utils.dimensions._dimension_caches', clear=True)
+def test_get_quote_dimensions(django_capture_on_commit_callbacks):
+    quote_data = QuoteData(api_client_key='zen_quotes', author='Author', category='zen', image_search_query='zen',
+                           origin='https://zenquotes.io/api/', quote_text='Quote')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        get_quote_dimensions(quote_data=quote_data)
+
+    # The versions of the three tables are read with a single query
+    with CaptureQueriesContext(connection=connection) as context:
+        author, category, origin = get_quote_dimensions(quote_data=quote_data)
+    assert len(context.captured_queries) == 1
+
+    assert (author.name, category.name, origin.api_client_key) == ('Author', 'zen', 'zen_quotes')
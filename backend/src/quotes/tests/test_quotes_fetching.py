@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from quotes.api.clients import BaseQuoteAPIClient
+from quotes.api.models import Quote as QuoteData
+from quotes.utils.quote_fetching import afetch_random_quote_data_hedged, fetch_random_quote_data_hedged
+
+
+class FakeQuoteAPIClient(BaseQuoteAPIClient):
+    def __init__(self, api_client_key: str, latency: float, fails: bool = False) -> None:
+        self._api_client_key = api_client_key
+        self.latency = latency
+        self.fails = fails
+
+    @property
+    def api_client_key(self) -> str:
+        return self._api_client_key
+
+    @property
+    def base_url(self) -> str:
+        return 'https://example.com/'
+
+    @property
+    def random_quote_url(self) -> str:
+        return self.base_url
+
+    def fetch_random_quote(self) -> QuoteData | None:
+        time.sleep(self.latency)
+
+        if self.fails:
+            return None
+
+        return QuoteData(api_client_key=self.api_client_key, author='Author', category='category',
+                         origin=self.base_url, quote_text=f'Quote from {self.api_client_key}')
+
+
+def test_hedged_fetch_returns_fastest_valid_quote():
+    api_clients = [
+        FakeQuoteAPIClient(api_client_key='slow', latency=2.0),
+        FakeQuoteAPIClient(api_client_key='broken', latency=0.0, fails=True),
+        FakeQuoteAPIClient(api_client_key='fast', latency=0.05),
+    ]
+    start_time = time.monotonic()
+    quote_data = fetch_random_quote_data_hedged(api_clients=api_clients, deadline=1.0, hedge_delay=0.01)
+
+    assert quote_data.api_client_key == 'fast'
+    assert time.monotonic() - start_time < 1.0
+
+
+def test_hedged_fetch_deadline():
+    api_clients = [FakeQuoteAPIClient(api_client_key='slow', latency=1.0)]
+    start_time = time.monotonic()
+
+    assert fetch_random_quote_data_hedged(api_clients=api_clients, deadline=0.1, hedge_delay=0.01) is None
+    assert time.monotonic() - start_time < 0.5
+
+
+def test_hedged_fetch_all_failing():
+    api_clients = [FakeQuoteAPIClient(api_client_key=f'broken_{i}', latency=0.0, fails=True) for i in range(3)]
+
+    assert fetch_random_quote_data_hedged(api_clients=api_clients, deadline=1.0, hedge_delay=0.5) is None
+
+
+def test_async_hedged_fetch_returns_fastest_valid_quote():
+    api_clients = [
+        FakeQuoteAPIClient(api_client_key='slow', latency=2.0),
+        FakeQuoteAPIClient(api_client_key='broken', latency=0.0, fails=True),
+        FakeQuoteAPIClient(api_client_key='fast', latency=0.05),
+    ]
+    start_time = time.monotonic()
+    quote_data = asyncio.run(afetch_random_quote_data_hedged(api_clients=api_clients, deadline=1.0, hedge_delay=0.01))
+
+    assert quote_data.api_client_key == 'fast'
+    assert time.monotonic() - start_time < 1.0
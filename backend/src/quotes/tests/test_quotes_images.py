@@ -0,0 +1,78 @@
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from pydantic import HttpUrl
+
+from quotes.api.models import Quote as QuoteData
+from quotes.enums import ImageEnrichmentStatus
+from quotes.models import ImageEnrichmentJob, Quote
+from quotes.tests.factories import QuoteFactory
+from quotes.utils.db_operations import get_or_create_quote
+from quotes.utils.images import claim_image_enrichment_jobs, complete_image_enrichment_job
+
+QUOTE_DATA = QuoteData(api_client_key='zen_quotes', author='Author', category='zen', image_search_query='zen,yoga',
+                       origin='https://zenquotes.io/api/', quote_text='Some quote')
+
+
+@pytest.mark.django_db
+def test_get_or_create_quote_queues_image_lookup():
+    with mock.patch('quotes.utils.db_operations.UnsplashImageAPIClient') as image_api_client:
+        quote = get_or_create_quote(quote_data=QUOTE_DATA)
+
+    image_api_client.assert_not_called()
+    assert quote.image_url is None
+    assert quote.image_enrichment_job.status == ImageEnrichmentStatus.PENDING
+    assert quote.image_enrichment_job.image_search_query == 'zen,yoga'
+
+
+@pytest.mark.django_db
+def test_claim_and_complete_image_enrichment_job():
+    quote = QuoteFactory(image_url=None, image_alt_text=None)
+    ImageEnrichmentJob.objects.create(quote=quote)
+    jobs = claim_image_enrichment_jobs(batch_size=10)
+
+    assert [job.quote for job in jobs] == [quote]
+    assert claim_image_enrichment_jobs(batch_size=10) == []
+    assert complete_image_enrichment_job(job=jobs[0], image_url=HttpUrl('https://images.example.com/1.jpg'),
+                                         image_alt_text='An image') is True
+
+    quote = Quote.objects.get(pk=quote.pk)
+    assert quote.image_url == 'https://images.example.com/1.jpg'
+    assert quote.image_alt_text == 'An image'
+    assert quote.image_enrichment_job.status == ImageEnrichmentStatus.DONE
+
+
+@pytest.mark.django_db
+@override_settings(QUOTES_IMAGE_ENRICHMENT_MAX_ATTEMPTS=2)
+def test_image_enrichment_job_retries():
+    job = ImageEnrichmentJob.objects.create(quote=QuoteFactory(image_url=None))
+
+    assert complete_image_enrichment_job(job=job, image_url=None, image_alt_text=None) is False
+    assert job.status == ImageEnrichmentStatus.PENDING
+    # Backed off, so not claimable yet
+    assert claim_image_enrichment_jobs(batch_size=10) == []
+
+    complete_image_enrichment_job(job=job, image_url=None, image_alt_text=None, error='Timeout')
+
+    assert job.status == ImageEnrichmentStatus.FAILED
+    assert job.last_error == 'Timeout'
+
+
+@pytest.mark.django_db
+def test_add_missing_images_command():
+    quotes = QuoteFactory.create_batch(size=5, image_url=None, image_alt_text=None)
+    ImageEnrichmentJob.objects.create(quote=quotes[0])
+    QuoteFactory(image_url='https://images.example.com/existing.jpg')
+    image_urls = iter([(HttpUrl(f'https://images.example.com/{i}.jpg'), f'Image {i}') for i in range(4)] +
+                      [(None, None)])
+
+    with mock.patch('quotes.management.commands.add_missing_images.UnsplashImageAPIClient') as image_api_client:
+        image_api_client.BREAKER_KEY = 'unsplash'
+        image_api_client.return_value.BREAKER_KEY = 'unsplash'
+        image_api_client.return_value.get_random_image_with_parameters.side_effect = lambda **kwargs: next(image_urls)
+        call_command('add_missing_images', number_of_quotes=0, workers=2, chunk_size=2)
+
+    assert Quote.objects.filter(image_url__isnull=True).count() == 1
+    assert Quote.objects.filter(image_url__startswith='https://images.example.com/').count() == 5
@@ -0,0 +1,76 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from quotes.models import Quote, compute_wilson_score
+from quotes.tests.factories import QuoteFactory
+from quotes.utils.leaderboard import get_leaderboard
+from quotes.utils.votes import apply_vote, vote_on_quote
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_compute_wilson_score():
+    assert compute_wilson_score(likes=0, dislikes=0) == 0.0
+    # Many votes with a high ratio outrank a single like
+    assert compute_wilson_score(likes=90, dislikes=10) > compute_wilson_score(likes=1, dislikes=0)
+    assert 0.0 < compute_wilson_score(likes=1, dislikes=1) < 0.5
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('vote_field, direction, reverse_opposite', [
+    ('likes', 'increase', False),
+    ('likes', 'increase', True),
+    ('dislikes', 'decrease', False),
+])
+def test_apply_vote_updates_ranking_scores(vote_field, direction, reverse_opposite):
+    quote = QuoteFactory(likes=10, dislikes=3)
+
+    assert quote.net_score == 7
+    assert apply_vote(guid=quote.guid, vote_field=vote_field, direction=direction, reverse_opposite=reverse_opposite)
+
+    quote.refresh_from_db()
+    assert quote.net_score == quote.likes - quote.dislikes
+    assert quote.wilson_score == pytest.approx(compute_wilson_score(likes=quote.likes, dislikes=quote.dislikes))
+
+
+@pytest.mark.django_db
+@override_settings(QUOTES_LEADERBOARD_SIZE=3)
+def test_leaderboard_is_served_from_cache(django_assert_num_queries):
+    quotes = [QuoteFactory(likes=likes, dislikes=dislikes) for likes, dislikes in ((5, 0), (50, 40), (30, 1), (1, 0))]
+
+    assert [payload['guid'] for payload in get_leaderboard(metric='likes', count=10)] == [
+        str(quotes[1].guid), str(quotes[2].guid), str(quotes[0].guid)]
+    assert [payload['guid'] for payload in get_leaderboard(metric='net_score', count=2)] == [
+        str(quotes[2].guid), str(quotes[1].guid)]
+
+    with django_assert_num_queries(num=0):
+        get_leaderboard(metric='likes', count=3)
+
+
+@pytest.mark.django_db
+@override_settings(QUOTES_LEADERBOARD_SIZE=3)
+def test_leaderboard_is_updated_by_votes():
+    quotes = [QuoteFactory(likes=likes, dislikes=0) for likes in (10, 20, 30, 10)]
+    get_leaderboard(metric='likes', count=3)
+
+    # A quote that climbs onto the leaderboard is added without a query
+    Quote.objects.filter(pk=quotes[3].pk).update(likes=39)
+    vote_on_quote(guid=quotes[3].guid, vote_field='likes', direction='increase')
+    leaderboard = get_leaderboard(metric='likes', count=3)
+
+    assert [payload['guid'] for payload in leaderboard] == [
+        str(quotes[3].guid), str(quotes[2].guid), str(quotes[1].guid)]
+    assert leaderboard[0]['likes'] == 40
+
+    # A quote that drops off the bottom invalidates the leaderboard, as an unknown quote may take its place
+    Quote.objects.filter(pk=quotes[1].pk).update(likes=1)
+    vote_on_quote(guid=quotes[1].guid, vote_field='likes', direction='decrease')
+
+    assert [payload['guid'] for payload in get_leaderboard(metric='likes', count=3)] == [
+        str(quotes[3].guid), str(quotes[2].guid), str(quotes[0].guid)]
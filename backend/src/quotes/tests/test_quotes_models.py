@@ -3,7 +3,7 @@ from pydantic import HttpUrl
 
 from contrib.constants import POSITIVE_BIT_INTEGER_MIN, POSITIVE_BIT_INTEGER_MAX
 from contrib.tests.assertions import is_valid_sha256
-from quotes.models import Quote, Author, Category, QuoteOrigin
+from quotes.models import Quote, Author, Category, QuoteOrigin, compute_quote_hash, normalize_quote_text
 from quotes.tests.factories import QuoteFactory
 
 
@@ -33,3 +33,20 @@ def test_quote_model():
     assert isinstance(quote.origin.url, str)
     assert quote.origin.url.startswith('http')
     assert isinstance(quote.origin.api_client_key, str)
+
+
+@pytest.mark.parametrize('variant', [
+    'Life is like riding a bicycle. To keep your balance, you must keep moving.',
+    '  life is like riding a bicycle -- to keep your balance you must keep moving  ',
+    '“Life is like riding a bicycle. To keep your balance, you must keep moving.”',
+    '"LIFE IS LIKE RIDING A BICYCLE; TO KEEP YOUR BALANCE, YOU MUST KEEP MOVING!"',
+])
+def test_compute_quote_hash_folds_cosmetic_variants(variant):
+    assert compute_quote_hash(quote_text=variant) == compute_quote_hash(
+        quote_text='Life is like riding a bicycle. To keep your balance, you must keep moving.')
+    assert normalize_quote_text(quote_text=variant) == (
+        'life is like riding a bicycle to keep your balance you must keep moving')
+
+
+def test_compute_quote_hash_distinguishes_words():
+    assert compute_quote_hash(quote_text="Don't stop") != compute_quote_hash(quote_text='Do stop')
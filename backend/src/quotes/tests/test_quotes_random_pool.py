@@ -0,0 +1,52 @@
+import pytest
+
+from quotes.serializers import QuoteSerializer
+from quotes.tests.factories import QuoteFactory
+from quotes.utils.random_pool import RandomQuotePool
+
+
+def make_pool(**kwargs) -> RandomQuotePool:
+    options = {'size': 10, 'refill_batch': 5, 'low_water_mark': 2, 'max_age': 60.0, 'background': False}
+    options.update(kwargs)
+
+    return RandomQuotePool(**options)
+
+
+@pytest.mark.django_db
+def test_random_pool_refill_and_pop():
+    quotes = QuoteFactory.create_batch(size=3)
+    pool = make_pool()
+
+    assert pool.pop() is None
+    assert 0 < pool.refill() <= 3
+
+    payload = pool.pop()
+    quote = next(quote for quote in quotes if str(quote.guid) == payload['guid'])
+
+    assert payload == QuoteSerializer(instance=quote).data
+    assert pool.stats()['hits'] == 1
+    assert pool.stats()['misses'] == 1
+
+
+@pytest.mark.django_db
+def test_random_pool_eviction():
+    quote = QuoteFactory()
+    pool = make_pool()
+    pool.refill()
+
+    assert len(pool) == 1
+
+    pool.evict(guid=quote.guid)
+
+    assert len(pool) == 0
+    assert pool.stats()['evictions'] == 1
+
+
+@pytest.mark.django_db
+def test_random_pool_expired_entries():
+    QuoteFactory()
+    pool = make_pool(max_age=-1.0)
+    pool.refill()
+
+    assert pool.pop() is None
+    assert len(pool) == 0
@@ -0,0 +1,174 @@
+from collections import Counter
+from unittest import mock
+
+import pytest
+
+from quotes.models import Quote
+from quotes.sampling.registry import RANDOM_SAMPLERS, get_random_sampler
+from quotes.sampling.streams import FeistelPermutation, QuoteStream
+from quotes.sampling.weighted import FenwickTree, WeightedQuoteSampler, compute_quote_weight
+from quotes.tests.factories import CategoryFactory, QuoteFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('sampler_key', list(RANDOM_SAMPLERS))
+def test_sampler_empty_queryset(sampler_key: str):
+    assert get_random_sampler(sampler_key=sampler_key).sample(queryset=Quote.objects.all()) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('sampler_key', list(RANDOM_SAMPLERS))
+def test_sampler_honours_filter(sampler_key: str):
+    category = CategoryFactory(name='some-category')
+    quotes = QuoteFactory.create_batch(size=3, category=category)
+    QuoteFactory.create_batch(size=20)
+    queryset = Quote.objects.filter(category__name__icontains='some-category')
+
+    for _ in range(20):
+        assert get_random_sampler(sampler_key=sampler_key).sample(queryset=queryset) in quotes
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('sampler_key', list(RANDOM_SAMPLERS))
+def test_sampler_reaches_every_row(sampler_key: str):
+    quotes = QuoteFactory.create_batch(size=5)
+    # Punch a hole in the primary key range and spread the random keys evenly
+    quotes.pop(2).delete()
+    for i, quote in enumerate(quotes):
+        Quote.objects.filter(pk=quote.pk).update(random_key=i / len(quotes))
+    sampler = get_random_sampler(sampler_key=sampler_key)
+    counts = Counter(sampler.sample(queryset=Quote.objects.all()) for _ in range(400))
+
+    assert set(counts) == set(quotes)
+    assert min(counts.values()) > 40
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('sampler_key', list(RANDOM_SAMPLERS))
+def test_sampler_sample_many(sampler_key: str):
+    sampler = get_random_sampler(sampler_key=sampler_key)
+    assert sampler.sample_many(queryset=Quote.objects.all(), count=3) == []
+
+    category = CategoryFactory(name='some-category')
+    quotes = QuoteFactory.create_batch(size=6, category=category)
+    QuoteFactory.create_batch(size=20)
+    queryset = Quote.objects.filter(category=category)
+
+    for _ in range(10):
+        sampled = sampler.sample_many(queryset=queryset, count=4)
+
+        assert len(sampled) == 4
+        assert len(set(sampled)) == 4
+        assert set(sampled) <= set(quotes)
+
+    # Fewer rows than requested: all of them
+    assert set(sampler.sample_many(queryset=queryset, count=10)) == set(quotes)
+
+
+def test_unknown_sampler():
+    with pytest.raises(ValueError):
+        get_random_sampler(sampler_key='does-not-exist')
+
+
+@pytest.mark.parametrize('size', [1, 2, 5, 16, 17, 1000])
+def test_feistel_permutation(size: int):
+    permutation = FeistelPermutation(size=size, seed=42)
+
+    assert sorted(permutation[index] for index in range(size)) == list(range(size))
+    assert [permutation[index] for index in range(size)] == [
+        FeistelPermutation(size=size, seed=42)[index] for index in range(size)]
+
+    with pytest.raises(IndexError):
+        permutation[size]  # noqa: B018
+
+
+@pytest.mark.django_db
+def test_quote_stream():
+    session = {}
+    stream = QuoteStream(session=session, probe_batch_size=4)
+    assert stream.next(queryset=Quote.objects.all()) is None
+
+    quotes = QuoteFactory.create_batch(size=10)
+    quotes.pop(3).delete()
+    quotes.pop(6).delete()
+    served = [stream.next(queryset=Quote.objects.all()) for _ in range(4)]
+    new_quote = QuoteFactory()
+
+    served += [stream.next(queryset=Quote.objects.all()) for _ in range(4)]
+
+    # Every remaining quote exactly once, the new quote only joins the next epoch
+    assert sorted(quote.pk for quote in served) == sorted(quote.pk for quote in quotes)
+    assert session['quotes_stream']['epoch'] == 0
+
+    served = [stream.next(queryset=Quote.objects.all()) for _ in range(9)]
+
+    assert sorted(quote.pk for quote in served) == sorted(quote.pk for quote in [*quotes, new_quote])
+    assert session['quotes_stream']['epoch'] == 1
+
+
+def test_fenwick_tree():
+    weights = [0.5, 0.0, 2.0, 1.0, 0.25]
+    tree = FenwickTree(weights=weights[:3])
+    tree.append(weight=weights[3])
+    tree.append(weight=weights[4])
+
+    assert tree.total == pytest.approx(sum(weights))
+    assert [tree.find(value=value) for value in (0.0, 0.49, 0.5, 2.49, 2.5, 3.6)] == [0, 0, 2, 2, 3, 4]
+
+    tree.set(index=2, weight=0.0)
+
+    assert tree.total == pytest.approx(1.75)
+    assert tree.find(value=0.5) == 3
+
+
+@pytest.mark.django_db
+def test_weighted_quote_sampler():
+    sampler = WeightedQuoteSampler(prior_likes=1.0, prior_dislikes=1.0, max_age=300.0)
+    assert sampler.sample(queryset=Quote.objects.all()) is None
+
+    liked_quote = QuoteFactory(likes=98, dislikes=0)
+    disliked_quote = QuoteFactory(likes=0, dislikes=98)
+    # Only the process' own sampler is updated on save
+    sampler.invalidate()
+    counts = Counter(sampler.sample(queryset=Quote.objects.all()) for _ in range(500))
+
+    # Weights 0.99 and 0.01
+    assert counts[liked_quote] > 450
+    assert compute_quote_weight(likes=0, dislikes=0, prior_likes=1.0, prior_dislikes=1.0) == 0.5
+
+    # Incremental updates, without rebuilding
+    disliked_quote.likes, disliked_quote.dislikes = 98, 0
+    sampler.update(quote=disliked_quote)
+    new_quote = QuoteFactory(likes=0, dislikes=0)
+    sampler.update(quote=new_quote)
+    liked_quote.delete()
+    counts = Counter(sampler.sample(queryset=Quote.objects.all()) for _ in range(500))
+
+    assert set(counts) == {disliked_quote, new_quote}
+    assert counts[disliked_quote] > counts[new_quote]
+    assert len(sampler.sample_many(queryset=Quote.objects.all(), count=5)) == 2
+
+
+@pytest.mark.django_db
+def test_weighted_quote_sampler_refresh():
+    quote = QuoteFactory()
+    sampler = WeightedQuoteSampler(prior_likes=1.0, prior_dislikes=1.0, max_age=300.0)
+    assert sampler.sample_pks(count=1) == [quote.pk]
+
+    # Stale while another thread rebuilds it: the old weights are sampled without waiting
+    sampler.max_age = 0.0
+    new_quote = QuoteFactory()
+
+    with sampler._build_lock, mock.patch.object(sampler, 'build') as build:
+        assert sampler.sample_pks(count=2) == [quote.pk]
+    build.assert_not_called()
+
+    # Invalidated while another thread rebuilds it: nothing to sample meanwhile
+    sampler.invalidate()
+
+    with mock.patch.object(sampler, '_build_lock', mock.Mock(acquire=mock.Mock(return_value=False))):
+        assert sampler.sample_pks(count=2) == []
+
+    # Rebuilt with the new quote (which a weighted draw may miss)
+    assert sampler.sample_pks(count=1)
+    assert set(sampler._pks) == {quote.pk, new_quote.pk}
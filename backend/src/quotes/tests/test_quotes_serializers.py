@@ -0,0 +1,28 @@
+import pytest
+from django.test import override_settings
+
+from quotes.models import Quote
+from quotes.serializers import FastQuoteSerializer, QuoteSerializer
+from quotes.tests.factories import QuoteFactory, QuoteOriginFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('time_zone', ['UTC', 'Europe/Brussels'])
+def test_fast_quote_serializer_parity(time_zone):
+    QuoteFactory.create_batch(size=3)
+    QuoteFactory(author=None, category=None, origin=None, image_url=None, image_alt_text=None)
+    QuoteFactory(origin=QuoteOriginFactory(url=None, api_client_key=None))
+
+    with override_settings(TIME_ZONE=time_zone):
+        quotes = list(Quote.objects.select_related('author', 'category', 'origin').order_by('pk'))
+        rows = list(Quote.objects.order_by('pk').values(*FastQuoteSerializer.values_fields))
+        expected = QuoteSerializer(instance=quotes, many=True).data
+
+        assert FastQuoteSerializer(instance=quotes, many=True).data == expected
+        assert FastQuoteSerializer(instance=rows, many=True).data == expected
+        assert FastQuoteSerializer(instance=quotes[0]).data == QuoteSerializer(instance=quotes[0]).data
+
+
+def test_fast_quote_serializer_none():
+    assert FastQuoteSerializer(instance=None).data == QuoteSerializer(instance=None).data
+    assert FastQuoteSerializer(instance=None, many=True).data == []
@@ -1,14 +1,29 @@
+import uuid
+from unittest import mock
+
 import pytest
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from contrib.constants import POSITIVE_BIT_INTEGER_MIN, POSITIVE_BIT_INTEGER_MAX
-from quotes.tests.factories import QuoteFactory, CategoryFactory
+from quotes.enums import QuoteSource
+from quotes.models import CategoryAlias, Quote
+from quotes.sampling.weighted import get_weighted_sampler
+from quotes.tests.factories import AuthorFactory, CategoryFactory, QuoteFactory
+from quotes.utils import votes
+from quotes.utils.vote_totals import get_vote_totals
 
 
+@override_settings(QUERY_BUDGET_STRICT=True)
 class QuotesAPITests(APITestCase):
-    def test_get_random_quote(self) -> None:
+    # Served from the database, so the test does not depend on the (external) quote APIs
+    @mock.patch('quotes.utils.quote_fetching.get_random_quote_source', return_value=QuoteSource.DATABASE)
+    def test_get_random_quote(self, _) -> None:
+        QuoteFactory(image_url=None, image_alt_text=None)
+
         response = self.client.get(reverse(viewname='quotes-get-random-quote'))
 
         self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
@@ -132,6 +147,112 @@ class QuotesAPITests(APITestCase):
         self.assertIsInstance(obj=dislikes, cls=int)
         self.assertEqual(first=dislikes, second=1)
 
+    def test_like_decrease_impossible(self) -> None:
+        quote = QuoteFactory(likes=0, dislikes=3)
+        response = self.client.patch(reverse(viewname='quotes-like', kwargs={'guid': quote.guid}),
+                                     query_params={'direction': 'decrease'})
+        data = response.json()
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=data.get('likes'), second=0)
+        self.assertEqual(first=data.get('dislikes'), second=3)
+
+    def test_like_invalid_direction(self) -> None:
+        quote = QuoteFactory()
+        response = self.client.patch(reverse(viewname='quotes-like', kwargs={'guid': quote.guid}),
+                                     query_params={'direction': 'sideways'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+    def test_like_unknown_quote(self) -> None:
+        response = self.client.patch(reverse(viewname='quotes-like', kwargs={'guid': uuid.uuid4()}))
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_404_NOT_FOUND)
+
+    @override_settings(QUOTES_VOTE_WRITE_BEHIND=True)
+    def test_like_write_behind(self) -> None:
+        quote = QuoteFactory(likes=0, dislikes=1)
+        vote_buffer = votes.VoteBuffer(flush_interval=0, batch_size=100)
+
+        with mock.patch.object(votes, '_vote_buffer', vote_buffer):
+            for _ in range(3):
+                response = self.client.patch(reverse(viewname='quotes-like', kwargs={'guid': quote.guid}),
+                                             query_params={'reverse_opposite': True})
+            data = response.json()
+
+            self.assertEqual(first=data.get('likes'), second=3)
+            self.assertEqual(first=data.get('dislikes'), second=0)
+            quote.refresh_from_db()
+            self.assertEqual(first=quote.likes, second=0)
+
+            self.assertEqual(first=vote_buffer.flush(), second=1)
+
+        quote = Quote.objects.get(pk=quote.pk)
+        self.assertEqual(first=quote.likes, second=3)
+        self.assertEqual(first=quote.dislikes, second=0)
+
+    @override_settings(QUOTES_VOTE_SHARDS=4)
+    def test_like_sharded(self) -> None:
+        quote = QuoteFactory(likes=0, dislikes=1)
+
+        for _ in range(3):
+            response = self.client.patch(reverse(viewname='quotes-like', kwargs={'guid': quote.guid}),
+                                         query_params={'reverse_opposite': True})
+        data = response.json()
+
+        self.assertEqual(first=data.get('likes'), second=3)
+        self.assertEqual(first=data.get('dislikes'), second=0)
+        quote.refresh_from_db()
+        self.assertEqual(first=quote.likes, second=0)
+        self.assertEqual(first=sum(quote.vote_shards.values_list('likes', flat=True)), second=3)
+
+        # Compaction folds the shards into the quote, without changing the totals
+        self.assertEqual(first=votes.compact_vote_shards(batch_size=100), second=1)
+        self.assertEqual(first=get_vote_totals(guid=quote.guid), second=(3, 0))
+
+        quote = Quote.objects.get(pk=quote.pk)
+        self.assertEqual(first=quote.likes, second=3)
+        self.assertEqual(first=quote.dislikes, second=0)
+        self.assertEqual(first=quote.net_score, second=3)
+        self.assertFalse(quote.vote_shards.exclude(likes=0, dislikes=0).exists())
+
+    @override_settings(QUOTES_VOTE_SHARDS=4)
+    def test_read_sharded_votes(self) -> None:
+        cache.clear()
+        quote = QuoteFactory(likes=1, dislikes=0, category=CategoryFactory(name='some-category'))
+        quote.update_ranking_scores()
+        quote.save()
+        detail_url = reverse(viewname='quotes-detail', kwargs={'guid': quote.guid})
+        list_url = reverse(viewname='quotes-list')
+        etags = [self.client.get(url).headers['ETag'] for url in (detail_url, list_url)]
+        leaderboard = self.client.get(reverse(viewname='quotes-get-most-liked-quotes')).json()
+        self.assertEqual(first=leaderboard[0]['likes'], second=1)
+
+        self.client.patch(reverse(viewname='quotes-like', kwargs={'guid': quote.guid}))
+        # Like a vote of another process, which neither updated this process' cached totals nor its leaderboards
+        cache.clear()
+
+        # The sharded vote changes the validators, and is served everywhere before it is compacted
+        for url, etag in zip((detail_url, list_url), etags):
+            response = self.client.get(url, headers={'If-None-Match': etag})
+
+            self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+
+        payloads = [
+            self.client.get(detail_url).json(),
+            self.client.get(list_url).json()['results'][0],
+            self.client.get(reverse(viewname='quotes-get-random-quote-by-category'),
+                            query_params={'category': 'some-category'}).json(),
+            self.client.get(reverse(viewname='quotes-get-random-quotes')).json()[0],
+            self.client.get(reverse(viewname='quotes-get-most-liked-quotes')).json()[0],
+        ]
+
+        for payload in payloads:
+            self.assertEqual(first=(payload['likes'], payload['net_score']), second=(2, 2))
+
+        quote.refresh_from_db()
+        self.assertEqual(first=quote.likes, second=1)
+
     def test_get_random_quote_by_category(self) -> None:
         category = CategoryFactory(name='some-category')
         quote = QuoteFactory(category=category)
@@ -159,6 +280,10 @@ class QuotesAPITests(APITestCase):
         self.assertEqual(first=category_name, second='some-category')
         self.assertEqual(first=category_name, second=quote.category.name)
 
+        response = self.client.get(reverse(viewname='quotes-get-random-quote-by-category'),
+                                   query_params={'category': 'unknown-category'})
+        self.assertEqual(first=response.status_code, second=status.HTTP_404_NOT_FOUND)
+
     def test_get_15_most_liked_quotes(self) -> None:
         # quotes = QuoteFactory.create_batch(size=15)
         response = self.client.get(reverse(viewname='quotes-get-most-liked-quotes'), query_params={'count': 15})
@@ -201,3 +326,254 @@ class QuotesAPITests(APITestCase):
             self.assertIsInstance(obj=dislikes, cls=int)
             self.assertGreaterEqual(a=dislikes, b=POSITIVE_BIT_INTEGER_MIN)
             self.assertLessEqual(a=dislikes, b=POSITIVE_BIT_INTEGER_MAX)
+
+    @override_settings(QUOTES_LEADERBOARD_SIZE=5)
+    def test_most_liked_quotes_metric_and_count(self) -> None:
+        cache.clear()
+        QuoteFactory.create_batch(size=7)
+        url = reverse(viewname='quotes-get-most-liked-quotes')
+
+        response = self.client.get(url, query_params={'count': 100, 'metric': 'wilson_score'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        scores = [quote['wilson_score'] for quote in response.json()]
+        self.assertEqual(first=len(scores), second=5)
+        self.assertEqual(first=scores, second=sorted(scores, reverse=True))
+
+        response = self.client.get(url, query_params={'metric': 'unknown'})
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, query_params={'count': 'many'})
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, query_params={'count': 0})
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve_conditional_get(self) -> None:
+        cache.clear()
+        quote = QuoteFactory()
+        url = reverse(viewname='quotes-detail', kwargs={'guid': quote.guid})
+
+        response = self.client.get(url)
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['guid'], second=str(quote.guid))
+        etag = response.headers['ETag']
+        self.assertIn(member='Last-Modified', container=response.headers)
+
+        # Unchanged: a 304 with only the validators query
+        with self.assertNumQueries(num=1):
+            response = self.client.get(url, headers={'If-None-Match': etag})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_304_NOT_MODIFIED)
+
+        # Without validators the payload is served from the cache
+        with self.assertNumQueries(num=1):
+            response = self.client.get(url)
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.headers['ETag'], second=etag)
+
+        # Changed: a new payload and ETag
+        self.client.patch(reverse(viewname='quotes-like', kwargs={'guid': quote.guid}))
+        response = self.client.get(url, headers={'If-None-Match': etag})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertNotEqual(first=response.headers['ETag'], second=etag)
+        self.assertEqual(first=response.json()['likes'], second=quote.likes + 1)
+        etag = response.headers['ETag']
+
+        # Renaming the author does not change the quote, but does change its payload
+        quote.author.name = 'Renamed author'
+        quote.author.save()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['author']['name'], second='Renamed author')
+
+        response = self.client.get(reverse(viewname='quotes-detail', kwargs={'guid': uuid.uuid4()}))
+        self.assertEqual(first=response.status_code, second=status.HTTP_404_NOT_FOUND)
+
+    def test_list_conditional_get(self) -> None:
+        cache.clear()
+        quotes = QuoteFactory.create_batch(size=3)
+        url = reverse(viewname='quotes-list')
+
+        response = self.client.get(url)
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        etag = response.headers['ETag']
+
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(first=response.status_code, second=status.HTTP_304_NOT_MODIFIED)
+
+        # Other pages have their own ETag
+        response = self.client.get(url, query_params={'page': 1, 'page_size': 2}, headers={'If-None-Match': etag})
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+
+        quotes[0].delete()
+        # The version is not kept in the (per-process) cache, so another process or a restart sees the deletion too
+        cache.clear()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['count'], second=2)
+
+    def test_conditional_get_after_author_deletion(self) -> None:
+        cache.clear()
+        quote = QuoteFactory()
+        detail_url = reverse(viewname='quotes-detail', kwargs={'guid': quote.guid})
+        list_url = reverse(viewname='quotes-list')
+        etags = [self.client.get(url).headers['ETag'] for url in (detail_url, list_url)]
+
+        # Sets the author of the quote to NULL without saving (or changing ``modified`` of) the quote
+        quote.author.delete()
+
+        for url, etag in zip((detail_url, list_url), etags):
+            response = self.client.get(url, headers={'If-None-Match': etag})
+
+            self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+            self.assertNotEqual(first=response.headers['ETag'], second=etag)
+
+        self.assertIsNone(self.client.get(detail_url).json()['author'])
+        self.assertIsNone(self.client.get(list_url).json()['results'][0]['author'])
+
+    @override_settings(QUOTES_LIST_PAGINATION='cursor')
+    def test_list_cursor_pagination(self) -> None:
+        cache.clear()
+        quotes = QuoteFactory.create_batch(size=15)
+        url = reverse(viewname='quotes-list')
+
+        response = self.client.get(url, query_params={'approximate_count': 'true'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        data = response.json()
+        self.assertNotIn(member='count', container=data)
+        self.assertEqual(first=data['approximate_count'], second=15)
+        self.assertIsNone(obj=data['previous'])
+        guids = [quote['guid'] for quote in data['results']]
+
+        response = self.client.get(data['next'])
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        data = response.json()
+        self.assertIsNone(obj=data['next'])
+        guids += [quote['guid'] for quote in data['results']]
+
+        # Newest first, every quote exactly once
+        self.assertEqual(first=guids, second=[str(quote.guid) for quote in reversed(quotes)])
+
+    def test_get_random_quote_by_category_alias(self) -> None:
+        cache.clear()
+        category = CategoryFactory(name='Inspirational')
+        CategoryAlias.objects.create(alias='inspiration', category=category)
+        quote = QuoteFactory(category=category)
+        url = reverse(viewname='quotes-get-random-quote-by-category')
+
+        response = self.client.get(url, query_params={'category': 'Inspiration'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['guid'], second=str(quote.guid))
+
+        response = self.client.get(url, query_params={'category': 'unknown'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_404_NOT_FOUND)
+
+    def test_get_random_quotes(self) -> None:
+        category = CategoryFactory(name='some-category')
+        quotes = QuoteFactory.create_batch(size=3, category=category)
+        QuoteFactory.create_batch(size=5)
+        url = reverse(viewname='quotes-get-random-quotes')
+
+        response = self.client.get(url, query_params={'count': 4})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        guids = [quote['guid'] for quote in response.json()]
+        self.assertEqual(first=len(guids), second=4)
+        self.assertEqual(first=len(set(guids)), second=4)
+
+        response = self.client.get(url, query_params={'count': 10, 'category': 'Some-Category'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertCountEqual(first=[quote['guid'] for quote in response.json()],
+                              second=[str(quote.guid) for quote in quotes])
+
+        with override_settings(QUOTES_RANDOM_BATCH_MAX_COUNT=2):
+            response = self.client.get(url, query_params={'count': 10})
+
+        self.assertEqual(first=len(response.json()), second=2)
+
+        response = self.client.get(url, query_params={'count': 'many'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, query_params={'count': 0})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, query_params={'category': 'unknown'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_404_NOT_FOUND)
+
+    def test_get_random_quote_stream(self) -> None:
+        quotes = QuoteFactory.create_batch(size=5)
+        url = reverse(viewname='quotes-get-random-quote')
+
+        guids = [self.client.get(url, query_params={'mode': 'stream'}).json()['guid'] for _ in range(5)]
+
+        self.assertCountEqual(first=guids, second=[str(quote.guid) for quote in quotes])
+
+        response = self.client.get(url, query_params={'mode': 'sequential'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+    def test_get_random_quote_weighted(self) -> None:
+        get_weighted_sampler().invalidate()
+        quote = QuoteFactory()
+
+        response = self.client.get(reverse(viewname='quotes-get-random-quote'), query_params={'mode': 'weighted'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['guid'], second=str(quote.guid))
+
+        response = self.client.get(reverse(viewname='quotes-get-random-quotes'),
+                                   query_params={'mode': 'weighted', 'category': quote.category.name})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+    def test_search(self) -> None:
+        quote = QuoteFactory(quote_text='The stars are bright tonight',
+                             author=AuthorFactory(name='Carl Sagan'), category=CategoryFactory(name='science'))
+        author_quote = QuoteFactory(quote_text='Another quote', author=AuthorFactory(name='Bright Eyes'))
+        QuoteFactory(quote_text='Nothing to see here')
+        url = reverse(viewname='quotes-search')
+
+        response = self.client.get(url, query_params={'q': 'bright'})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_200_OK)
+        self.assertEqual(first=response.json()['count'], second=2)
+        # A match in the quote text ranks above a match in the author name
+        self.assertEqual(first=[result['guid'] for result in response.json()['results']],
+                         second=[str(quote.guid), str(author_quote.guid)])
+
+        response = self.client.get(url, query_params={'q': 'SCIENCE stars'})
+
+        self.assertEqual(first=[result['guid'] for result in response.json()['results']], second=[str(quote.guid)])
+
+        response = self.client.get(url, query_params={'q': ' '})
+
+        self.assertEqual(first=response.status_code, second=status.HTTP_400_BAD_REQUEST)
+
+    @mock.patch('quotes.signals.update_search_vectors')
+    def test_search_vectors_after_author_deletion(self, update_search_vectors_mock) -> None:
+        quote = QuoteFactory()
+        QuoteFactory()
+        update_search_vectors_mock.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            quote.author.delete()
+            # Only updated once the deletion set the foreign keys to NULL
+            update_search_vectors_mock.assert_not_called()
+
+        queryset = update_search_vectors_mock.call_args.kwargs['queryset']
+        self.assertEqual(first=list(queryset.values_list('pk', 'author')), second=[(quote.pk, None)])
@@ -0,0 +1,169 @@
+import random
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, QuerySet, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from ..models import Category, CategoryAlias, Quote, normalize_category_name
+from ..sampling.samplers import RandomKeySampler
+
+CATEGORY_IDS_CACHE_KEY = 'quotes:category_ids'
+
+# Seeks on the (category, random_key) index, so a category is sampled without sorting its quotes
+category_sampler = RandomKeySampler()
+
+
+def get_category_ids_by_name() -> dict[str, list[int]]:
+    """
+    Get the cached map of normalized category names and aliases to category ids (several categories can have the same
+    normalized name, e.g. "Zen" and "zen"). It is cached for ``QUOTES_CATEGORY_IDS_CACHE_TIMEOUT``, as the commands
+    that import quotes only invalidate the cache of their own process.
+    """
+    category_ids: dict[str, list[int]] | None = cache.get(CATEGORY_IDS_CACHE_KEY)
+
+    if category_ids is None:
+        category_ids = {}
+
+        for category_id, name in Category.objects.values_list('pk', 'name'):
+            category_ids.setdefault(normalize_category_name(name=name), []).append(category_id)
+
+        for category_id, alias in CategoryAlias.objects.values_list('category_id', 'alias'):
+            ids: list[int] = category_ids.setdefault(alias, [])
+
+            if category_id not in ids:
+                ids.append(category_id)
+
+        cache.set(CATEGORY_IDS_CACHE_KEY, category_ids, timeout=settings.QUOTES_CATEGORY_IDS_CACHE_TIMEOUT)
+
+    return category_ids
+
+
+def invalidate_category_ids() -> None:
+    cache.delete(CATEGORY_IDS_CACHE_KEY)
+
+
+def get_category_ids_query(name: str) -> QuerySet:
+    """
+    Query the ids of the categories with the given normalized name or alias, for names that are missing from the cached
+    map (e.g. categories imported by another process). Names with repeated whitespace are only found in the map.
+    """
+    return (
+        Category.objects.filter(Q(name__iexact=name) | Q(aliases__alias=name)).values_list('pk', flat=True).distinct()
+    )
+
+
+def resolve_category_ids(name: str) -> list[int]:
+    """
+    Get the ids of the categories with the given name or alias (case-insensitive), without querying the database when
+    the map is cached and has the name. A name missing from a cached map is looked up in the database, and when found
+    the stale map is dropped.
+    """
+    name = normalize_category_name(name=name)
+    category_ids: dict[str, list[int]] | None = cache.get(CATEGORY_IDS_CACHE_KEY)
+
+    if category_ids is None:
+        return get_category_ids_by_name().get(name, [])
+
+    if name in category_ids:
+        return category_ids[name]
+
+    ids: list[int] = list(get_category_ids_query(name=name))
+
+    if ids:
+        invalidate_category_ids()
+
+    return ids
+
+
+async def aresolve_category_ids(name: str) -> list[int]:
+    """
+    Async variant of ``resolve_category_ids``.
+    """
+    name = normalize_category_name(name=name)
+    category_ids: dict[str, list[int]] | None = await cache.aget(CATEGORY_IDS_CACHE_KEY)
+
+    if category_ids is None:
+        return (await sync_to_async(get_category_ids_by_name)()).get(name, [])
+
+    if name in category_ids:
+        return category_ids[name]
+
+    ids: list[int] = [category_id async for category_id in get_category_ids_query(name=name)]
+
+    if ids:
+        await cache.adelete(CATEGORY_IDS_CACHE_KEY)
+
+    return ids
+
+
+def sample_quote_from_categories(category_ids: list[int], queryset: QuerySet | None = None) -> Quote | None:
+    """
+    Pick a random quote from the given categories: a category weighted by its quote count, then a quote of that
+    category. Empty categories are recognized from their quote count, without touching the quote table.
+    """
+    if not category_ids:
+        return None
+
+    quote_counts: dict[int, int] = dict(
+        Category.objects.filter(pk__in=category_ids, quote_count__gt=0).values_list('pk', 'quote_count'))
+
+    if not quote_counts:
+        return None
+
+    category_id: int = random.choices(population=list(quote_counts), weights=list(quote_counts.values()))[0]
+    queryset = Quote.objects.all() if queryset is None else queryset
+
+    return category_sampler.sample(queryset=queryset.filter(category_id=category_id))
+
+
+async def asample_quote_from_categories(category_ids: list[int], queryset: QuerySet | None = None) -> Quote | None:
+    """
+    Async variant of ``sample_quote_from_categories``.
+    """
+    if not category_ids:
+        return None
+
+    quote_counts: dict[int, int] = {
+        category_id: quote_count async for category_id, quote_count in
+        Category.objects.filter(pk__in=category_ids, quote_count__gt=0).values_list('pk', 'quote_count')
+    }
+
+    if not quote_counts:
+        return None
+
+    category_id: int = random.choices(population=list(quote_counts), weights=list(quote_counts.values()))[0]
+    queryset = Quote.objects.all() if queryset is None else queryset
+
+    return await category_sampler.asample(queryset=queryset.filter(category_id=category_id))
+
+
+def update_category_quote_counts(deltas: Counter[int] | dict[int, int]) -> None:
+    """
+    Add the given deltas (by category id) to the quote counts of the categories, with a single ``UPDATE``.
+    """
+    deltas = {category_id: delta for category_id, delta in deltas.items() if category_id is not None and delta}
+
+    if not deltas:
+        return
+
+    Category.objects.filter(pk__in=deltas).update(quote_count=Greatest(F('quote_count') + Case(
+        *[When(pk=category_id, then=Value(delta)) for category_id, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    ), Value(0), output_field=IntegerField()))
+
+
+def refresh_category_quote_counts(categories: QuerySet | None = None) -> None:
+    """
+    Recount the quotes of the given categories (or all of them), e.g. after quotes were inserted bypassing the
+    incremental updates.
+    """
+    categories = Category.objects.all() if categories is None else categories
+    quote_counts = (
+        Quote.objects.filter(category=OuterRef('pk')).order_by().values('category').annotate(count=Count('pk'))
+        .values('count')
+    )
+    categories.update(quote_count=Coalesce(Subquery(quote_counts), 0))
@@ -1,50 +1,120 @@
+import io
 import logging
+import random
+import threading
+from collections import Counter
 
-from django.db import IntegrityError
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+from django.utils import timezone
 from pydantic import HttpUrl
 
 from contrib.api.clients import UnsplashImageAPIClient
 from ..api.models import Quote as QuoteData
-from ..models import Quote, Author, Category, QuoteOrigin
+from ..models import Quote, Author, Category, ImageEnrichmentJob, QuoteOrigin, compute_quote_hash
+from ..sampling.weighted import get_weighted_sampler
+from ..utils.categories import invalidate_category_ids, update_category_quote_counts
+from ..utils.dimensions import get_dimension_cache, get_dimension_versions
+from ..utils.images import enqueue_image_enrichment
+from ..utils.leaderboard import invalidate_leaderboards
+from ..utils.search import update_search_vectors
 
 logger = logging.getLogger('quotes')
 
+_ingestion_stats: Counter = Counter()
+_ingestion_stats_lock = threading.Lock()
+
+
+def record_ingested_quote(created: bool) -> None:
+    with _ingestion_stats_lock:
+        if created:
+            _ingestion_stats['created'] += 1
+            return
+
+        _ingestion_stats['existing'] += 1
+
+        # Before the hash was checked first, every duplicate looked up an image inline. Queued lookups are only made
+        # for new quotes, so nothing is saved in the ``queue`` mode
+        if settings.QUOTES_IMAGE_ENRICHMENT_MODE == 'sync':
+            _ingestion_stats['unsplash_calls_saved'] += 1
+
+
+def get_ingestion_stats() -> dict[str, int]:
+    """
+    Get the number of new and existing quotes saved by ``get_or_create_quote``, and the inline image lookups saved by
+    returning the existing ones right away (in this process).
+    """
+    with _ingestion_stats_lock:
+        return {key: _ingestion_stats[key] for key in ('created', 'existing', 'unsplash_calls_saved')}
+
+
+def get_quote_dimensions(quote_data: QuoteData) -> tuple[Author, Category, QuoteOrigin]:
+    """
+    Get (or create) the author, category and origin of a quote, from the dimension caches: only the query of the
+    versions of the tables for the ones seen before (@see ``quotes.utils.dimensions``).
+    """
+    versions: dict[type[Author | Category | QuoteOrigin], int] = get_dimension_versions()
+
+    return (
+        get_dimension_cache(model=Author).get_instance(key=(quote_data.author,), version=versions[Author]),
+        get_dimension_cache(model=Category).get_instance(key=(quote_data.category,), version=versions[Category]),
+        # ``str``, so the instance does not keep the pydantic URL (which the serializers can't render)
+        get_dimension_cache(model=QuoteOrigin).get_instance(key=(str(quote_data.origin), quote_data.api_client_key),
+                                                            version=versions[QuoteOrigin]),
+    )
+
 
 def get_or_create_quote(quote_data: QuoteData | None) -> Quote | None:
     """
     Saves a quote to the database if not already present.
+
+    Quotes are identified by the hash of their normalized text, which is checked first: an existing quote is returned
+    right away, without resolving its author, category and origin or looking up an image. New quotes are saved without
+    an image: the image lookup is queued for the ``process_image_enrichment`` worker, unless
+    ``QUOTES_IMAGE_ENRICHMENT_MODE`` is ``sync``.
     """
     if quote_data is None:
         return
 
-    author: str = quote_data.author
-    category: str = quote_data.category
     image_search_query: str | None = quote_data.image_search_query
-    origin: HttpUrl = quote_data.origin
     quote_text: str = quote_data.quote_text
-    api_client_key: str = quote_data.api_client_key
+    quote_hash: str = compute_quote_hash(quote_text=quote_text)
 
     try:
+        quote: Quote | None = Quote.objects.select_related('author', 'category', 'origin').filter(
+            quote_hash=quote_hash).first()
+
+        if quote is not None:
+            record_ingested_quote(created=False)
+
+            return quote
+
         author: Author
-        author, _ = Author.objects.get_or_create(name=author)
         category: Category
-        category, _ = Category.objects.get_or_create(name=category)
         quote_origin: QuoteOrigin
-        quote_origin, _ = QuoteOrigin.objects.get_or_create(url=origin, api_client_key=api_client_key)
-        image_url: HttpUrl | None
-        image_alt_text: str | None
-        image_url, image_alt_text = UnsplashImageAPIClient().get_random_image_with_parameters(
-            image_search_query=image_search_query)
-        quote: Quote
-        quote, created = Quote.objects.get_or_create(
-            author=author,
-            category=category,
-            image_url=image_url,
-            image_alt_text=image_alt_text,
-            origin=quote_origin,
-            quote_text=quote_text,
-            defaults={'author': author, 'category': category, 'origin': quote_origin},
+        author, category, quote_origin = get_quote_dimensions(quote_data=quote_data)
+        # Another process may have saved the quote in the meantime
+        quote, created = Quote.objects.select_related('author', 'category', 'origin').get_or_create(
+            quote_hash=quote_hash,
+            defaults={'author': author, 'category': category, 'origin': quote_origin, 'quote_text': quote_text},
         )
+        record_ingested_quote(created=created)
+
+        if created and settings.QUOTES_IMAGE_ENRICHMENT_MODE == 'sync':
+            image_url: HttpUrl | None
+            image_alt_text: str | None
+            image_url, image_alt_text = UnsplashImageAPIClient().get_random_image_with_parameters(
+                image_search_query=image_search_query)
+
+            if image_url is not None:
+                quote.image_url = str(image_url)
+                quote.image_alt_text = image_alt_text
+                quote.modified = timezone.now()
+                Quote.objects.filter(pk=quote.pk).update(image_url=quote.image_url, image_alt_text=image_alt_text,
+                                                         modified=quote.modified)
+        elif created:
+            enqueue_image_enrichment(quote=quote, image_search_query=image_search_query)
 
         return quote
     except IntegrityError as e:
@@ -54,3 +124,208 @@ def get_or_create_quote(quote_data: QuoteData | None) -> Quote | None:
         logger.exception(msg=e)
 
         raise e
+
+
+async def aget_or_create_quote(quote_data: QuoteData | None) -> Quote | None:
+    """
+    Async variant of ``get_or_create_quote``: the quote is saved with the async ORM and, in ``sync`` image enrichment
+    mode, the image is looked up without blocking the event loop.
+    """
+    if quote_data is None:
+        return
+
+    quote_hash: str = compute_quote_hash(quote_text=quote_data.quote_text)
+
+    try:
+        quote: Quote | None = await Quote.objects.select_related('author', 'category', 'origin').filter(
+            quote_hash=quote_hash).afirst()
+
+        if quote is not None:
+            record_ingested_quote(created=False)
+
+            return quote
+
+        author: Author
+        category: Category
+        quote_origin: QuoteOrigin
+        author, category, quote_origin = await sync_to_async(get_quote_dimensions)(quote_data=quote_data)
+        quote, created = await Quote.objects.select_related('author', 'category', 'origin').aget_or_create(
+            quote_hash=quote_hash,
+            defaults={'author': author, 'category': category, 'origin': quote_origin,
+                      'quote_text': quote_data.quote_text},
+        )
+        record_ingested_quote(created=created)
+
+        if created and settings.QUOTES_IMAGE_ENRICHMENT_MODE == 'sync':
+            image_url: HttpUrl | None
+            image_alt_text: str | None
+            image_url, image_alt_text = await UnsplashImageAPIClient().aget_random_image_with_parameters(
+                image_search_query=quote_data.image_search_query)
+
+            if image_url is not None:
+                quote.image_url = str(image_url)
+                quote.image_alt_text = image_alt_text
+                quote.modified = timezone.now()
+                await Quote.objects.filter(pk=quote.pk).aupdate(image_url=quote.image_url,
+                                                                image_alt_text=image_alt_text,
+                                                                modified=quote.modified)
+        elif created:
+            await sync_to_async(enqueue_image_enrichment)(quote=quote,
+                                                          image_search_query=quote_data.image_search_query)
+
+        return quote
+    except IntegrityError as e:
+        # Don't log, just propagate the error
+        raise e
+    except Exception as e:
+        logger.exception(msg=e)
+
+        raise e
+
+
+def bulk_create_quotes(quotes_data: list[QuoteData], random_votes: bool = False, batch_size: int = 1000,
+                       use_copy: bool = False, enqueue_images: bool = True) -> int:
+    """
+    Save a batch of quotes in bulk, skipping quotes that already exist, and queue image lookups for the new ones.
+
+    The authors, categories and origins of the batch are resolved with at most one query each (@see
+    ``quotes.utils.dimensions``). With ``use_copy`` the quotes are inserted with a single PostgreSQL ``COPY`` (on other
+    databases it is ignored).
+
+    :returns: the number of inserted quotes.
+    :rtype: int
+    """
+    quotes_by_hash: dict[str, QuoteData] = {}
+    for quote_data in quotes_data:
+        if quote_data is not None and quote_data.quote_text:
+            quotes_by_hash.setdefault(compute_quote_hash(quote_text=quote_data.quote_text), quote_data)
+
+    existing_hashes: set[str] = set(
+        Quote.objects.filter(quote_hash__in=quotes_by_hash).values_list('quote_hash', flat=True))
+    new_quotes_by_hash: dict[str, QuoteData] = {
+        quote_hash: quote_data for quote_hash, quote_data in quotes_by_hash.items()
+        if quote_hash not in existing_hashes
+    }
+
+    if not new_quotes_by_hash:
+        return 0
+
+    versions: dict[type[Author | Category | QuoteOrigin], int] = get_dimension_versions()
+    author_ids: dict[tuple[str], int] = get_dimension_cache(model=Author).get_ids(
+        keys={(quote_data.author,) for quote_data in new_quotes_by_hash.values()}, version=versions[Author])
+    category_ids: dict[tuple[str], int] = get_dimension_cache(model=Category).get_ids(
+        keys={(quote_data.category,) for quote_data in new_quotes_by_hash.values()}, version=versions[Category])
+    origin_ids: dict[tuple[str, str], int] = get_dimension_cache(model=QuoteOrigin).get_ids(
+        keys={(str(quote_data.origin), quote_data.api_client_key) for quote_data in new_quotes_by_hash.values()},
+        version=versions[QuoteOrigin])
+    quotes: list[Quote] = []
+
+    for quote_hash, quote_data in new_quotes_by_hash.items():
+        quote = Quote(
+            author_id=author_ids[(quote_data.author,)],
+            category_id=category_ids[(quote_data.category,)],
+            origin_id=origin_ids[(str(quote_data.origin), quote_data.api_client_key)],
+            quote_text=quote_data.quote_text,
+            quote_hash=quote_hash,
+        )
+
+        if random_votes:
+            lower, upper = 0, 99_9999
+            quote.likes = random.randint(lower, upper)
+            quote.dislikes = random.randint(lower, upper)
+
+        quote.update_ranking_scores()
+        quotes.append(quote)
+
+    quotes = insert_quotes(quotes=quotes, batch_size=batch_size,
+                           use_copy=use_copy and connection.vendor == 'postgresql')
+    inserted_hashes: set[str] = {quote.quote_hash for quote in quotes}
+
+    update_search_vectors(queryset=Quote.objects.filter(quote_hash__in=inserted_hashes))
+    invalidate_leaderboards()
+    # Bulk inserts bypass the signals that keep the category lookup and quote counts up to date
+    invalidate_category_ids()
+    get_weighted_sampler().invalidate()
+    update_category_quote_counts(deltas=Counter(quote.category_id for quote in quotes))
+
+    if not enqueue_images or not quotes:
+        return len(quotes)
+
+    inserted_quotes: list[tuple[int, str]] = list(
+        Quote.objects.filter(quote_hash__in=inserted_hashes).values_list('pk', 'quote_hash'))
+    ImageEnrichmentJob.objects.bulk_create(
+        [ImageEnrichmentJob(quote_id=quote_id, image_search_query=new_quotes_by_hash[quote_hash].image_search_query)
+         for quote_id, quote_hash in inserted_quotes],
+        batch_size=batch_size, ignore_conflicts=True)
+
+    return len(quotes)
+
+
+def insert_quotes(quotes: list[Quote], batch_size: int = 1000, use_copy: bool = False) -> list[Quote]:
+    """
+    Insert quotes with ``bulk_create`` (or ``COPY``), leaving out the quotes that another process inserted in the
+    meantime: on a conflict the transaction is rolled back, and retried without the quotes whose hash exists by now.
+
+    :returns: the inserted quotes.
+    :rtype: list[Quote]
+    """
+    while quotes:
+        try:
+            with transaction.atomic():
+                if use_copy:
+                    copy_quotes(quotes=quotes)
+                else:
+                    Quote.objects.bulk_create(quotes, batch_size=batch_size)
+
+            return quotes
+        except IntegrityError:
+            existing_hashes: set[str] = set(Quote.objects.filter(
+                quote_hash__in=[quote.quote_hash for quote in quotes]).values_list('quote_hash', flat=True))
+
+            if not existing_hashes:
+                raise
+
+            quotes = [quote for quote in quotes if quote.quote_hash not in existing_hashes]
+
+            # The ids of the batches inserted before the conflict were rolled back
+            for quote in quotes:
+                quote.pk = None
+
+    return quotes
+
+
+def copy_quotes(quotes: list[Quote]) -> None:
+    """
+    Insert quotes with PostgreSQL's ``COPY ... FROM STDIN``, which is considerably faster than (bulk) ``INSERT``s.
+
+    The values are prepared like Django would for an insert (defaults, ``auto_now_add`` and field conversions), but
+    unlike ``bulk_create`` the primary keys are not set on the given quotes.
+    """
+    fields: list[models.Field] = [field for field in Quote._meta.concrete_fields if not field.primary_key]
+    buffer = io.StringIO()
+
+    for quote in quotes:
+        buffer.write('\t'.join(
+            _format_copy_value(value=field.get_db_prep_save(field.pre_save(quote, add=True), connection=connection))
+            for field in fields))
+        buffer.write('\n')
+
+    buffer.seek(0)
+    columns: str = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            f'COPY {connection.ops.quote_name(Quote._meta.db_table)} ({columns}) FROM STDIN', buffer)
+
+
+def _format_copy_value(value: any) -> str:
+    """
+    Format a value for the text format of ``COPY``.
+    """
+    if value is None:
+        return '\\N'
+
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
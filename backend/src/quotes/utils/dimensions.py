@@ -0,0 +1,144 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import router, transaction
+
+from contrib.versions import get_model_version, get_model_versions
+from ..models import Author, Category, QuoteOrigin
+
+DimensionModel = type[Author | Category | QuoteOrigin]
+
+# The natural key of each dimension table (which has a unique constraint on it)
+DIMENSION_KEY_FIELDS: dict[DimensionModel, tuple[str, ...]] = {
+    Author: ('name',),
+    Category: ('name',),
+    QuoteOrigin: ('url', 'api_client_key'),
+}
+
+
+class DimensionCache:
+    """
+    Bounded, per-process LRU cache of the ids of the rows of a dimension table (authors, categories or origins) by
+    their natural key, for ingesting quotes without looking up (or creating) the same few rows again and again.
+
+    Keys that are not cached are resolved in bulk with an ``INSERT ... ON CONFLICT DO NOTHING`` of the missing rows and
+    a single ``SELECT`` of their ids, and cached once the transaction commits. Renamed and deleted rows bump the version
+    of the table, which is stored in the database (@see ``contrib.versions.bump_model_version``). Every lookup compares
+    it with the version the cache was filled with, so each process drops its cached ids on its next lookup after the
+    change.
+    """
+
+    def __init__(self, model: DimensionModel, max_size: int) -> None:
+        self.model = model
+        self.fields: tuple[str, ...] = DIMENSION_KEY_FIELDS[model]
+        self.max_size = max_size
+        self._ids: OrderedDict[tuple, int] = OrderedDict()
+        self._version: int | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+    def get_ids(self, keys: set[tuple], version: int | None = None) -> dict[tuple, int]:
+        """
+        Get the ids of the rows identified by ``keys`` (tuples of the values of the natural key fields), creating the
+        missing ones. Needs the query of the table's version (unless the caller read it already, @see
+        ``get_dimension_versions``), and two more queries if some keys are not cached.
+        """
+        version = get_model_version(model=self.model) if version is None else version
+        ids: dict[tuple, int] = {}
+
+        with self._lock:
+            if version != self._version:
+                self._ids.clear()
+                self._version = version
+
+            for key in keys:
+                row_id: int | None = self._ids.get(key)
+
+                if row_id is not None:
+                    self._ids.move_to_end(key)
+                    ids[key] = row_id
+
+        missing_keys: set[tuple] = keys - set(ids)
+
+        if not missing_keys:
+            return ids
+
+        fetched_ids: dict[tuple, int] = self.upsert(keys=missing_keys)
+        ids.update(fetched_ids)
+        # Rows created in a transaction that is rolled back must not be cached
+        transaction.on_commit(lambda: self.store(ids=fetched_ids, version=version))
+
+        return ids
+
+    def store(self, ids: dict[tuple, int], version: int) -> None:
+        with self._lock:
+            if version != self._version:
+                return
+
+            for key, row_id in ids.items():
+                self._ids[key] = row_id
+                self._ids.move_to_end(key)
+
+            while len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+
+    def get_id(self, key: tuple, version: int | None = None) -> int:
+        return self.get_ids(keys={key}, version=version)[key]
+
+    def get_instance(self, key: tuple, version: int | None = None) -> Author | Category | QuoteOrigin:
+        """
+        Get the row identified by ``key`` as an instance with only its id and natural key loaded (the other fields are
+        deferred), which is enough to assign it to a quote and to serialize the quote.
+        """
+        values: dict[str, any] = {
+            self.model._meta.pk.attname: self.get_id(key=key, version=version), **dict(zip(self.fields, key))}
+        # In the order of the model's fields, like a query would return them
+        field_names: list[str] = [
+            field.attname for field in self.model._meta.concrete_fields if field.attname in values]
+
+        return self.model.from_db(db=router.db_for_read(self.model), field_names=field_names,
+                                  values=[values[field_name] for field_name in field_names])
+
+    def upsert(self, keys: set[tuple]) -> dict[tuple, int]:
+        self.model.objects.bulk_create(
+            # Sorted, so concurrent ingestions insert (and lock) the same rows in the same order instead of deadlocking
+            [self.model(**dict(zip(self.fields, key))) for key in sorted(keys)],
+            # Existing rows are neither locked nor rewritten (unlike by a no-op update), so their ids are selected below
+            ignore_conflicts=True,
+        )
+        lookup: dict[str, set] = {f'{self.fields[0]}__in': {key[0] for key in keys}}
+
+        return {row[1:]: row[0] for row in self.model.objects.filter(**lookup).values_list('pk', *self.fields)
+                if row[1:] in keys}
+
+
+_dimension_caches: dict[DimensionModel, DimensionCache] = {}
+_dimension_caches_lock = threading.Lock()
+
+
+def get_dimension_cache(model: DimensionModel) -> DimensionCache:
+    """
+    Get this process' cache of the ids of a dimension table, with up to ``QUOTES_DIMENSION_CACHE_SIZE`` entries.
+    """
+    dimension_cache: DimensionCache | None = _dimension_caches.get(model)
+
+    if dimension_cache is None:
+        with _dimension_caches_lock:
+            dimension_cache = _dimension_caches.setdefault(
+                model, DimensionCache(model=model, max_size=settings.QUOTES_DIMENSION_CACHE_SIZE))
+
+    return dimension_cache
+
+
+def get_dimension_versions() -> dict[DimensionModel, int]:
+    """
+    Get the versions of the dimension tables with a single query, to look up the ids of several of them.
+    """
+    return get_model_versions(models=DIMENSION_KEY_FIELDS)
@@ -0,0 +1,95 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from pydantic import HttpUrl
+
+from ..api.clients import BaseQuoteAPIClient
+from ..api.registry import API_CLIENTS
+from ..enums import ImageEnrichmentStatus
+from ..models import ImageEnrichmentJob, Quote
+from ..utils.random_pool import get_random_quote_pool
+
+logger = logging.getLogger('quotes')
+
+
+def get_image_search_query(quote: Quote) -> str | None:
+    """
+    Get the image search query for a quote: the one of its API client if that has one, otherwise its category name.
+    """
+    api_client: BaseQuoteAPIClient | None = API_CLIENTS.get(quote.origin.api_client_key) if quote.origin else None
+
+    if hasattr(api_client, 'image_search_query'):
+        return getattr(api_client, 'image_search_query')
+
+    return quote.category.name if quote.category else None
+
+
+def enqueue_image_enrichment(quote: Quote, image_search_query: str | None = None) -> ImageEnrichmentJob:
+    """
+    Queue an image lookup for a quote (no-op if one is already queued).
+    """
+    job: ImageEnrichmentJob
+    job, _ = ImageEnrichmentJob.objects.get_or_create(quote=quote,
+                                                      defaults={'image_search_query': image_search_query})
+
+    return job
+
+
+def claim_image_enrichment_jobs(batch_size: int) -> list[ImageEnrichmentJob]:
+    """
+    Claim a batch of due jobs for this worker (jobs locked by other workers are skipped). Jobs that have been
+    processing for longer than ``QUOTES_IMAGE_ENRICHMENT_CLAIM_TIMEOUT`` (e.g. because their worker died) are claimed
+    again.
+    """
+    now = timezone.now()
+    claim_expired_before = now - timedelta(seconds=settings.QUOTES_IMAGE_ENRICHMENT_CLAIM_TIMEOUT)
+
+    with transaction.atomic():
+        job_ids: list[int] = list(
+            ImageEnrichmentJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(Q(status=ImageEnrichmentStatus.PENDING, available_at__lte=now) |
+                    Q(status=ImageEnrichmentStatus.PROCESSING, modified__lt=claim_expired_before))
+            .order_by('available_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        ImageEnrichmentJob.objects.filter(pk__in=job_ids).update(status=ImageEnrichmentStatus.PROCESSING, modified=now)
+
+    return list(ImageEnrichmentJob.objects.filter(pk__in=job_ids).select_related('quote__category', 'quote__origin'))
+
+
+def complete_image_enrichment_job(job: ImageEnrichmentJob, image_url: HttpUrl | None, image_alt_text: str | None,
+                                  error: str | None = None) -> bool:
+    """
+    Store the result of an image lookup: save the image on the quote, or schedule a retry with exponential backoff
+    (until ``QUOTES_IMAGE_ENRICHMENT_MAX_ATTEMPTS`` is reached).
+
+    :returns: whether the quote got an image.
+    :rtype: bool
+    """
+    now = timezone.now()
+    job.attempts += 1
+
+    if image_url is not None:
+        Quote.objects.filter(pk=job.quote_id).update(image_url=str(image_url), image_alt_text=image_alt_text,
+                                                     modified=now)
+        job.status = ImageEnrichmentStatus.DONE
+        job.last_error = None
+
+        if settings.QUOTES_RANDOM_POOL_ENABLED:
+            get_random_quote_pool().evict(guid=job.quote.guid)
+    elif job.attempts >= settings.QUOTES_IMAGE_ENRICHMENT_MAX_ATTEMPTS:
+        job.status = ImageEnrichmentStatus.FAILED
+        job.last_error = error or 'No image found'
+    else:
+        job.status = ImageEnrichmentStatus.PENDING
+        job.available_at = now + timedelta(seconds=settings.QUOTES_IMAGE_ENRICHMENT_RETRY_DELAY * 2 ** job.attempts)
+        job.last_error = error or 'No image found'
+
+    job.save(update_fields=['status', 'attempts', 'available_at', 'last_error', 'modified'])
+
+    return image_url is not None
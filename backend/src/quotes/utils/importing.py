@@ -0,0 +1,80 @@
+import csv
+import json
+import logging
+from itertools import batched
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from pydantic import ValidationError
+
+from ..api.models import Quote as QuoteData
+from ..utils.db_operations import bulk_create_quotes
+
+logger = logging.getLogger('quotes')
+
+IMPORT_FORMATS = ('jsonl', 'csv')
+
+
+def get_import_format(path: Path) -> str:
+    """
+    Guess the import format from the file extension (``.jsonl``/``.ndjson`` or ``.csv``).
+    """
+    suffix: str = path.suffix.lower().lstrip('.')
+
+    if suffix in ('jsonl', 'ndjson'):
+        return 'jsonl'
+
+    if suffix in IMPORT_FORMATS:
+        return suffix
+
+    raise ValueError(f'Cannot determine the import format of "{path}", use one of: {", ".join(IMPORT_FORMATS)}')
+
+
+def read_quote_records(path: Path, import_format: str | None = None) -> Iterator[QuoteData | None]:
+    """
+    Stream the records of a JSONL or CSV file with the fields of ``quotes.api.models.Quote``.
+
+    Invalid records are logged and yielded as ``None``, so they can be counted without aborting the import.
+    """
+    import_format = import_format or get_import_format(path=path)
+
+    with path.open(encoding='utf-8', newline='') as file:
+        records: Iterable[dict[str, any] | str]
+
+        if import_format == 'csv':
+            records = csv.DictReader(file)
+        elif import_format == 'jsonl':
+            records = (line for line in file if line.strip())
+        else:
+            raise ValueError(f'Unknown import format "{import_format}", use one of: {", ".join(IMPORT_FORMATS)}')
+
+        for line_number, record in enumerate(records, start=1):
+            try:
+                if import_format == 'jsonl':
+                    record = json.loads(record)
+                else:
+                    # CSV has no null values
+                    record = {key: value or None for key, value in record.items()}
+
+                yield QuoteData.model_validate(record)
+            except (ValueError, ValidationError) as e:
+                logger.warning(msg=f'Skipping invalid record {line_number} of "{path}": {e}')
+
+                yield None
+
+
+def import_quotes(quotes_data: Iterable[QuoteData | None], batch_size: int = 10_000, use_copy: bool = True,
+                  enqueue_images: bool = True, random_votes: bool = False) -> Iterator[tuple[int, int]]:
+    """
+    Import a stream of quotes in batches of ``batch_size``, deduplicated against the existing quotes, with memory use
+    bounded by the batch size.
+
+    :returns: per batch, a tuple of the number of processed records and the number of inserted quotes.
+    :rtype: Iterator[tuple[int, int]]
+    """
+    for batch in batched(quotes_data, batch_size):
+        inserted_count: int = bulk_create_quotes(quotes_data=list(batch), random_votes=random_votes,
+                                                 batch_size=batch_size, use_copy=use_copy,
+                                                 enqueue_images=enqueue_images)
+
+        yield len(batch), inserted_count
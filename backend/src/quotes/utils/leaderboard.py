@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import Quote
+from ..serializers import FastQuoteSerializer
+from ..utils.vote_totals import get_vote_total_annotations
+
+LEADERBOARD_METRICS = ('likes', 'net_score', 'wilson_score')
+
+# Cached leaderboards are lists of (score, serialized quote) pairs, ordered by descending score
+LeaderboardEntries = list[tuple[float, dict[str, any]]]
+
+
+def get_leaderboard_cache_key(metric: str) -> str:
+    return f'quotes:leaderboard:{metric}'
+
+
+def build_leaderboard(metric: str) -> LeaderboardEntries:
+    """
+    Query the top ``QUOTES_LEADERBOARD_SIZE`` quotes by ``metric`` (using the index on the metric). Sharded votes are
+    included in the served votes, but only count for the ranking once they are compacted into the quotes.
+    """
+    quotes: list[Quote] = list(
+        Quote.objects.select_related('author', 'category', 'origin').annotate(**get_vote_total_annotations())
+        .order_by(f'-{metric}', 'pk')[:settings.QUOTES_LEADERBOARD_SIZE])
+    payloads: list[dict[str, any]] = FastQuoteSerializer(instance=quotes, many=True).data
+
+    return [(getattr(quote, metric), payload) for quote, payload in zip(quotes, payloads)]
+
+
+def get_leaderboard(metric: str, count: int) -> list[dict[str, any]]:
+    """
+    Get the ``count`` best quotes by ``metric``, served from the cache and only queried when it is not cached.
+    """
+    if metric not in LEADERBOARD_METRICS:
+        raise ValueError(f'Unknown leaderboard metric "{metric}", use one of: {", ".join(LEADERBOARD_METRICS)}')
+
+    cache_key: str = get_leaderboard_cache_key(metric=metric)
+    entries: LeaderboardEntries | None = cache.get(cache_key)
+
+    if entries is None:
+        entries = build_leaderboard(metric=metric)
+        cache.set(cache_key, entries, timeout=settings.QUOTES_LEADERBOARD_CACHE_TIMEOUT)
+
+    return [payload for _, payload in entries[:count]]
+
+
+def update_leaderboards(quote: Quote) -> None:
+    """
+    Update the cached leaderboards with the new scores of a quote (e.g. after a vote).
+
+    The cached entries are patched in place where that is certainly correct; only when a quote drops off the bottom of
+    a full leaderboard (so an unknown quote may take its place) is that leaderboard invalidated. Concurrent updates from
+    other processes can still overwrite each other, which the cache timeout bounds.
+    """
+    payload: dict[str, any] | None = None
+
+    for metric in LEADERBOARD_METRICS:
+        cache_key: str = get_leaderboard_cache_key(metric=metric)
+        entries: LeaderboardEntries | None = cache.get(cache_key)
+
+        if entries is None:
+            continue
+
+        score: float = getattr(quote, metric)
+        remaining_entries: LeaderboardEntries = [entry for entry in entries if entry[1]['guid'] != str(quote.guid)]
+        is_on_leaderboard: bool = len(remaining_entries) < len(entries)
+        # A leaderboard that is not full holds all quotes, so the quote belongs on it regardless of its score
+        is_full: bool = len(entries) >= settings.QUOTES_LEADERBOARD_SIZE
+        lowest_score: float | None = entries[-1][0] if entries else None
+
+        if is_full and is_on_leaderboard and score < lowest_score:
+            cache.delete(cache_key)
+            continue
+
+        if is_full and not is_on_leaderboard and score <= lowest_score:
+            continue
+
+        if payload is None:
+            payload = FastQuoteSerializer(instance=quote).data
+
+        remaining_entries.append((score, payload))
+        remaining_entries.sort(key=lambda entry: entry[0], reverse=True)
+        cache.set(cache_key, remaining_entries[:settings.QUOTES_LEADERBOARD_SIZE],
+                  timeout=settings.QUOTES_LEADERBOARD_CACHE_TIMEOUT)
+
+
+def remove_from_leaderboards(quote: Quote) -> None:
+    """
+    Invalidate the cached leaderboards that contain a (deleted) quote.
+    """
+    for metric in LEADERBOARD_METRICS:
+        cache_key: str = get_leaderboard_cache_key(metric=metric)
+        entries: LeaderboardEntries | None = cache.get(cache_key)
+
+        if entries is not None and any(entry[1]['guid'] == str(quote.guid) for entry in entries):
+            cache.delete(cache_key)
+
+
+def invalidate_leaderboards() -> None:
+    """
+    Invalidate all cached leaderboards (e.g. after a bulk insert).
+    """
+    cache.delete_many([get_leaderboard_cache_key(metric=metric) for metric in LEADERBOARD_METRICS])
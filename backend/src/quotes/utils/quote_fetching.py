@@ -1,23 +1,45 @@
+import asyncio
 import logging
 import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
+from django.conf import settings
+from django.contrib.sessions.backends.base import SessionBase
 from django.db import IntegrityError
 
+from contrib.api.http import is_source_available
+
 from ..api.clients import BaseQuoteAPIClient
 from ..api.models import Quote as QuoteData
 from ..api.registry import API_CLIENTS
 from ..enums import QuoteSource
 from ..models import Quote
-from ..utils.db_operations import get_or_create_quote
+from ..sampling.registry import get_random_sampler
+from ..sampling.streams import QuoteStream
+from ..sampling.weighted import get_weighted_sampler
+from ..utils.categories import (
+    aresolve_category_ids, asample_quote_from_categories, category_sampler, resolve_category_ids,
+    sample_quote_from_categories,
+)
+from ..utils.db_operations import aget_or_create_quote, get_or_create_quote
 
 logger = logging.getLogger('quotes')
 
+# Modes of ``get_random_quote``: any random quote, the next quote of the session's non-repeating stream, or a random
+# quote weighted by its like ratio
+RANDOM_QUOTE_MODES = ('random', 'stream', 'weighted')
+
 
 def get_random_quote_source(excluded_sources: tuple = ()) -> QuoteSource:
     """
-    Randomly choose a quote source (API client or database).
+    Randomly choose a quote source (API client or database), skipping API clients whose circuit breaker is open.
     """
-    available_sources: list[QuoteSource] = [source for source in QuoteSource if source not in excluded_sources]
+    available_sources: list[QuoteSource] = [
+        source for source in QuoteSource
+        if source not in excluded_sources and (source == QuoteSource.DATABASE or is_source_available(key=source.name))
+    ]
 
     if not available_sources:
         raise ValueError('No available quote sources after exclusion.')
@@ -27,17 +49,165 @@ def get_random_quote_source(excluded_sources: tuple = ()) -> QuoteSource:
 
 def fetch_random_quote_from_database(category: str = None) -> Quote | None:
     """
-    Fetches a random quote from the database.
+    Fetches a random quote from the database, using the configured random sampler, or the per-category sampler when a
+    category (name or alias) is given.
+    """
+    queryset = Quote.objects.select_related('author', 'category', 'origin')
+
+    if category:
+        return sample_quote_from_categories(category_ids=resolve_category_ids(name=category), queryset=queryset)
+
+    return get_random_sampler().sample(queryset=queryset)
+
+
+def fetch_stream_quote_from_database(session: SessionBase) -> Quote | None:
+    """
+    Fetches the next quote of the session's random quote stream (@see ``QuoteStream``), which does not repeat quotes
+    until all of them have been served.
+    """
+    return QuoteStream(session=session).next(queryset=Quote.objects.select_related('author', 'category', 'origin'))
+
+
+def fetch_weighted_quote_from_database() -> Quote | None:
+    """
+    Fetches a random quote from the database, weighted by its like ratio (@see ``WeightedQuoteSampler``).
+    """
+    return get_weighted_sampler().sample(queryset=Quote.objects.select_related('author', 'category', 'origin'))
+
+
+def fetch_random_quotes_from_database(count: int, category: str = None, weighted: bool = False) -> list[Quote]:
+    """
+    Fetches up to ``count`` distinct random quotes from the database (optionally of a category, by name or alias, or
+    weighted by their like ratio) with a single sampling query.
     """
-    queryset = Quote.objects.all()
+    # Not ``.values()``: its joins would be kept in the samplers' aggregates, unlike ``select_related``
+    queryset = Quote.objects.select_related('author', 'category', 'origin')
+
+    if weighted:
+        if category:
+            raise ValueError('Weighted random quotes can not be filtered by category')
+
+        return get_weighted_sampler().sample_many(queryset=queryset, count=count)
+
     if category:
-        queryset = queryset.filter(category__name__icontains=category)
-    return queryset.order_by('?').first()
+        category_ids: list[int] = resolve_category_ids(name=category)
+
+        if not category_ids:
+            return []
+
+        return category_sampler.sample_many(queryset=queryset.filter(category_id__in=category_ids), count=count)
+
+    return get_random_sampler().sample_many(queryset=queryset, count=count)
+
+
+_api_client_executor: ThreadPoolExecutor | None = None
+_api_client_executor_lock = threading.Lock()
+
+
+def get_api_client_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool used to call quote API clients concurrently.
+    """
+    global _api_client_executor
+
+    if _api_client_executor is None:
+        with _api_client_executor_lock:
+            if _api_client_executor is None:
+                _api_client_executor = ThreadPoolExecutor(max_workers=settings.QUOTES_API_FETCH_MAX_WORKERS,
+                                                          thread_name_prefix='quote-api-client')
+
+    return _api_client_executor
+
+
+def fetch_random_quote_data_hedged(api_clients: list[BaseQuoteAPIClient], deadline: float,
+                                   hedge_delay: float) -> QuoteData | None:
+    """
+    Ask the API clients (in random order) for a random quote concurrently and return the first valid one.
+
+    A request is sent to the next client every ``hedge_delay`` seconds (or as soon as a request fails) until one of
+    them answers, so a single slow source no longer determines the latency. Requests that are still running when a
+    quote is found, or when the overall ``deadline`` (in seconds) passes, are ignored.
+    """
+    executor: ThreadPoolExecutor = get_api_client_executor()
+    deadline_at: float = time.monotonic() + deadline
+    waiting_clients: list[BaseQuoteAPIClient] = random.sample(api_clients, k=len(api_clients))
+    pending: set[Future] = set()
+
+    while waiting_clients or pending:
+        if waiting_clients:
+            pending.add(executor.submit(waiting_clients.pop().fetch_random_quote))
+
+        time_left: float = deadline_at - time.monotonic()
+
+        if time_left <= 0:
+            break
+
+        done: set[Future]
+        done, pending = wait(pending, timeout=min(hedge_delay, time_left) if waiting_clients else time_left,
+                             return_when=FIRST_COMPLETED)
+
+        for future in done:
+            if future.exception() is not None:
+                logger.error(msg=future.exception(), exc_info=future.exception())
+                continue
+
+            quote_data: QuoteData | None = future.result()
+
+            if quote_data is not None and quote_data.quote_text:
+                for pending_future in pending:
+                    pending_future.cancel()
+
+                return quote_data
+
+    for pending_future in pending:
+        pending_future.cancel()
+
+    return None
+
+
+def fetch_random_quote_from_api_client_hedged(max_retries: int = 10) -> Quote | None:
+    """
+    Fetch a random quote from the API clients concurrently (@see ``fetch_random_quote_data_hedged``) and save it,
+    within the overall ``QUOTES_API_FETCH_DEADLINE``.
+    """
+    deadline_at: float = time.monotonic() + settings.QUOTES_API_FETCH_DEADLINE
+
+    for _ in range(max_retries):
+        api_clients: list[BaseQuoteAPIClient] = [
+            api_client for api_client in API_CLIENTS.values() if is_source_available(key=api_client.api_client_key)]
+        time_left: float = deadline_at - time.monotonic()
+
+        if time_left <= 0 or not api_clients:
+            break
+
+        quote_data: QuoteData | None = fetch_random_quote_data_hedged(
+            api_clients=api_clients, deadline=time_left, hedge_delay=settings.QUOTES_API_FETCH_HEDGE_DELAY)
+
+        if quote_data is None:
+            break
+
+        try:
+            return get_or_create_quote(quote_data=quote_data)
+        except IntegrityError:
+            continue
+        except Exception as e:
+            logger.exception(msg=e)
+
+    logger.error(msg='Unable to fetch random quote from API within the deadline.')
+
+    return None
 
 
 def fetch_random_quote_from_api_client(quote_source: QuoteSource = None, max_retries: int = 10) -> Quote | None:
+    if settings.QUOTES_API_FETCH_MODE == 'hedged':
+        return fetch_random_quote_from_api_client_hedged(max_retries=max_retries)
+
     if quote_source is None:
-        quote_source: QuoteSource = get_random_quote_source(excluded_sources=(QuoteSource.DATABASE,))
+        try:
+            quote_source: QuoteSource = get_random_quote_source(excluded_sources=(QuoteSource.DATABASE,))
+        except ValueError as e:
+            logger.warning(msg=e)
+            return None
 
     api_client: BaseQuoteAPIClient | None = API_CLIENTS.get(quote_source.name)
 
@@ -89,3 +259,127 @@ def fetch_random_quote() -> Quote | None:
     quote: Quote | None = fetch_random_quote_from_api_client()
 
     return quote if quote else fetch_random_quote_from_database()
+
+
+async def afetch_random_quote_from_database(category: str = None) -> Quote | None:
+    """
+    Async variant of ``fetch_random_quote_from_database``.
+    """
+    queryset = Quote.objects.select_related('author', 'category', 'origin')
+
+    if category:
+        return await asample_quote_from_categories(category_ids=await aresolve_category_ids(name=category),
+                                                   queryset=queryset)
+
+    return await get_random_sampler().asample(queryset=queryset)
+
+
+async def afetch_random_quote_data_hedged(api_clients: list[BaseQuoteAPIClient], deadline: float,
+                                          hedge_delay: float) -> QuoteData | None:
+    """
+    Async variant of ``fetch_random_quote_data_hedged``.
+    """
+    loop = asyncio.get_running_loop()
+    deadline_at: float = loop.time() + deadline
+    waiting_clients: list[BaseQuoteAPIClient] = random.sample(api_clients, k=len(api_clients))
+    pending: set[asyncio.Future] = set()
+
+    try:
+        while waiting_clients or pending:
+            if waiting_clients:
+                pending.add(asyncio.ensure_future(waiting_clients.pop().afetch_random_quote()))
+
+            time_left: float = deadline_at - loop.time()
+
+            if time_left <= 0:
+                break
+
+            done: set[asyncio.Future]
+            done, pending = await asyncio.wait(pending,
+                                               timeout=min(hedge_delay, time_left) if waiting_clients else time_left,
+                                               return_when=asyncio.FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is not None:
+                    logger.error(msg=future.exception(), exc_info=future.exception())
+                    continue
+
+                quote_data: QuoteData | None = future.result()
+
+                if quote_data is not None and quote_data.quote_text:
+                    return quote_data
+    finally:
+        for pending_future in pending:
+            pending_future.cancel()
+
+    return None
+
+
+async def afetch_random_quote_from_api_client(max_retries: int = 10) -> Quote | None:
+    """
+    Async variant of ``fetch_random_quote_from_api_client``: waiting for the quote APIs does not block the event loop.
+    """
+    deadline_at: float = time.monotonic() + settings.QUOTES_API_FETCH_DEADLINE
+
+    for _ in range(max_retries):
+        if settings.QUOTES_API_FETCH_MODE == 'hedged':
+            api_clients: list[BaseQuoteAPIClient] = [
+                api_client for api_client in API_CLIENTS.values() if is_source_available(key=api_client.api_client_key)]
+            time_left: float = deadline_at - time.monotonic()
+
+            if time_left <= 0 or not api_clients:
+                break
+
+            quote_data: QuoteData | None = await afetch_random_quote_data_hedged(
+                api_clients=api_clients, deadline=time_left, hedge_delay=settings.QUOTES_API_FETCH_HEDGE_DELAY)
+
+            if quote_data is None:
+                break
+        else:
+            try:
+                quote_source: QuoteSource = get_random_quote_source(excluded_sources=(QuoteSource.DATABASE,))
+            except ValueError as e:
+                logger.warning(msg=e)
+                return None
+
+            api_client: BaseQuoteAPIClient | None = API_CLIENTS.get(quote_source.name)
+
+            if api_client is None:
+                return None
+
+            quote_data: QuoteData | None = await api_client.afetch_random_quote()
+
+            if quote_data is None:
+                continue
+
+        try:
+            return await aget_or_create_quote(quote_data=quote_data)
+        except IntegrityError:
+            continue
+        except Exception as e:
+            logger.exception(msg=e)
+
+    logger.error(msg='Unable to fetch random quote from API.')
+
+    return None
+
+
+async def afetch_random_quote() -> Quote | None:
+    """
+    Async variant of ``fetch_random_quote``.
+    """
+    try:
+        quote_source: QuoteSource = get_random_quote_source()
+    except ValueError as e:
+        logger.exception(msg=e)
+        return None
+
+    if quote_source == QuoteSource.DATABASE:
+        quote: Quote | None = await afetch_random_quote_from_database()
+
+        if quote:
+            return quote
+
+    quote: Quote | None = await afetch_random_quote_from_api_client()
+
+    return quote if quote else await afetch_random_quote_from_database()
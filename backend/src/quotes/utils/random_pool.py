@@ -0,0 +1,178 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection
+
+from ..models import Quote
+from ..sampling.registry import get_random_sampler
+from ..serializers import FastQuoteSerializer
+
+logger = logging.getLogger('quotes')
+
+
+class RandomQuotePool:
+    """
+    Per-process pool of already serialized random quotes, so most random quote requests need no database round trip.
+
+    Quotes are popped first-in-first-out (each payload is served once) and a background thread refills the pool in
+    batches when it drops below the low-water mark. Payloads older than ``max_age`` seconds are discarded, which bounds
+    how stale a quote edited in another process can be.
+    """
+
+    def __init__(self, size: int, refill_batch: int, low_water_mark: int, max_age: float,
+                 background: bool = True) -> None:
+        self.size = size
+        self.refill_batch = refill_batch
+        self.low_water_mark = low_water_mark
+        self.max_age = max_age
+        self.background = background
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refills = 0
+        self._entries: OrderedDict[str, tuple[float, dict[str, any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._refill_requested = threading.Event()
+        self._refill_thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def pop(self) -> dict[str, any] | None:
+        """
+        Pop a serialized random quote from the pool, or ``None`` if the pool is empty (a miss).
+        """
+        payload: dict[str, any] | None = None
+        expired_before: float = time.monotonic() - self.max_age
+
+        with self._lock:
+            while self._entries:
+                added_at: float
+                _, (added_at, entry) = self._entries.popitem(last=False)
+
+                if added_at >= expired_before:
+                    payload = entry
+                    break
+
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+            needs_refill: bool = len(self._entries) < self.low_water_mark
+
+        if needs_refill:
+            self.request_refill()
+
+        return payload
+
+    def evict(self, guid: str) -> None:
+        """
+        Evict a quote from the pool (e.g. because it was edited or voted on).
+        """
+        with self._lock:
+            if self._entries.pop(str(guid), None) is not None:
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def refill(self) -> int:
+        """
+        Fetch and serialize a batch of random quotes into the pool and return how many were added.
+        """
+        with self._lock:
+            batch_size: int = min(self.refill_batch, self.size - len(self._entries))
+
+        if batch_size <= 0:
+            return 0
+
+        queryset = Quote.objects.select_related('author', 'category', 'origin')
+        quotes: list[Quote] = get_random_sampler().sample_many(queryset=queryset, count=batch_size)
+        payloads: list[dict[str, any]] = FastQuoteSerializer(instance=quotes, many=True).data
+        added_at: float = time.monotonic()
+        added: int = 0
+
+        with self._lock:
+            for payload in payloads:
+                if len(self._entries) >= self.size:
+                    break
+
+                if payload['guid'] not in self._entries:
+                    self._entries[payload['guid']] = (added_at, payload)
+                    added += 1
+
+            self.refills += 1
+
+        return added
+
+    def request_refill(self) -> None:
+        """
+        Ask the background thread to refill the pool (starting it if needed).
+        """
+        if not self.background:
+            return
+
+        self._refill_requested.set()
+
+        if self._refill_thread is None or not self._refill_thread.is_alive():
+            with self._lock:
+                if self._refill_thread is None or not self._refill_thread.is_alive():
+                    self._refill_thread = threading.Thread(target=self._refill_forever, name='random-quote-pool',
+                                                           daemon=True)
+                    self._refill_thread.start()
+
+    def stats(self) -> dict[str, int | float]:
+        lookups: int = self.hits + self.misses
+
+        return {
+            'size': len(self._entries),
+            'max_size': self.size,
+            'refill_batch': self.refill_batch,
+            'low_water_mark': self.low_water_mark,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'refills': self.refills,
+        }
+
+    def _refill_forever(self) -> None:
+        while True:
+            self._refill_requested.wait()
+            self._refill_requested.clear()
+
+            try:
+                while len(self._entries) < self.size and self.refill():
+                    pass
+            except Exception as e:
+                logger.exception(msg=e)
+            finally:
+                connection.close()
+
+
+_random_quote_pool: RandomQuotePool | None = None
+_random_quote_pool_lock = threading.Lock()
+
+
+def get_random_quote_pool() -> RandomQuotePool:
+    """
+    Get this process' random quote pool, configured with the ``QUOTES_RANDOM_POOL_*`` settings.
+    """
+    global _random_quote_pool
+
+    if _random_quote_pool is None:
+        with _random_quote_pool_lock:
+            if _random_quote_pool is None:
+                _random_quote_pool = RandomQuotePool(
+                    size=settings.QUOTES_RANDOM_POOL_SIZE,
+                    refill_batch=settings.QUOTES_RANDOM_POOL_REFILL_BATCH,
+                    low_water_mark=settings.QUOTES_RANDOM_POOL_LOW_WATER_MARK,
+                    max_age=settings.QUOTES_RANDOM_POOL_MAX_AGE,
+                )
+
+    return _random_quote_pool
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, FloatField, OuterRef, Q, QuerySet, Subquery, Value, When
+
+from ..models import Author, Category, Quote
+
+# Weight of a match in each field for the fallback rank, like the default weights of the PostgreSQL rank (A, B and C)
+FALLBACK_FIELD_WEIGHTS = {
+    'quote_text': 1.0,
+    'author__name': 0.4,
+    'category__name': 0.2,
+}
+# The fallback runs a scan per term, so only the first terms of long queries are used
+FALLBACK_MAX_TERMS = 8
+
+
+def get_search_vector() -> SearchVector:
+    """
+    Get the expression of ``Quote.search_vector``: the quote text (weight A), the name of its author (B) and the name of
+    its category (C). The names are subqueries, so the expression can be used in an ``UPDATE``.
+    """
+    config: str = settings.QUOTES_SEARCH_CONFIG
+    author_name = Subquery(Author.objects.filter(pk=OuterRef('author_id')).order_by().values('name'))
+    category_name = Subquery(Category.objects.filter(pk=OuterRef('category_id')).order_by().values('name'))
+
+    return (
+        SearchVector('quote_text', weight='A', config=config)
+        + SearchVector(author_name, weight='B', config=config)
+        + SearchVector(category_name, weight='C', config=config)
+    )
+
+
+def update_search_vectors(queryset: QuerySet) -> int:
+    """
+    Update the search vectors of the given quotes in a single ``UPDATE`` (PostgreSQL only, other databases search
+    without them).
+
+    :returns: the number of updated quotes.
+    :rtype: int
+    """
+    if connection.vendor != 'postgresql':
+        return 0
+
+    return queryset.order_by().update(search_vector=get_search_vector())
+
+
+def search_quotes(query: str, queryset: QuerySet | None = None) -> QuerySet:
+    """
+    Search quotes by their text, author and category, best matches first (annotated with their ``rank``).
+
+    On PostgreSQL the (web search syntax) query is matched against the GIN-indexed ``Quote.search_vector``. Other
+    databases fall back to a case-insensitive substring match of every term, ranked by the fields they match.
+    """
+    queryset = Quote.objects.all() if queryset is None else queryset
+
+    if connection.vendor == 'postgresql':
+        search_query = SearchQuery(query, search_type='websearch', config=settings.QUOTES_SEARCH_CONFIG)
+
+        return (
+            queryset
+            .filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-pk')
+        )
+
+    rank = Value(0.0)
+
+    for term in query.split()[:FALLBACK_MAX_TERMS]:
+        term_lookups: dict[str, Q] = {field: Q(**{f'{field}__icontains': term}) for field in FALLBACK_FIELD_WEIGHTS}
+        queryset = queryset.filter(Q(*term_lookups.values(), _connector=Q.OR))
+
+        for field, lookup in term_lookups.items():
+            rank += Case(When(lookup, then=Value(FALLBACK_FIELD_WEIGHTS[field])), default=Value(0.0),
+                         output_field=FloatField())
+
+    return queryset.annotate(rank=rank).order_by('-rank', '-pk')
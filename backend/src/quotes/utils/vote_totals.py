@@ -0,0 +1,101 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BigIntegerField, ExpressionWrapper, F, Model, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Quote, QuoteVoteShard, compute_wilson_score
+
+VOTE_FIELDS = ('likes', 'dislikes')
+
+
+def get_vote_totals_cache_key(guid: str) -> str:
+    return f'quotes:vote_totals:{guid}'
+
+
+def get_vote_total_expressions() -> dict[str, ExpressionWrapper]:
+    """
+    Get the expressions of the ``total_likes`` and ``total_dislikes`` of quotes: their votes plus the votes on their
+    shards. Annotated in the query of the quotes, so a concurrent compaction is seen either entirely or not at all.
+    """
+    shards = QuoteVoteShard.objects.filter(quote=OuterRef('pk')).order_by().values('quote')
+
+    return {
+        f'total_{field}': ExpressionWrapper(
+            F(field) + Coalesce(Subquery(shards.annotate(total=Sum(field)).values('total')), Value(0)),
+            output_field=BigIntegerField(),
+        )
+        for field in VOTE_FIELDS
+    }
+
+
+def get_vote_total_annotations() -> dict[str, ExpressionWrapper]:
+    """
+    Get the ``get_vote_total_expressions`` to annotate the quotes (or rows) that are serialized, when the votes are
+    sharded (``QUOTES_VOTE_SHARDS``), so the serializer does not look the totals up separately.
+    """
+    return get_vote_total_expressions() if settings.QUOTES_VOTE_SHARDS > 0 else {}
+
+
+def get_many_vote_totals(guids: set[str]) -> dict[str, tuple[int, int]]:
+    """
+    Get the ``(likes, dislikes)`` of quotes by their guid, with the votes on their shards added, cached for
+    ``QUOTES_VOTE_TOTALS_CACHE_TIMEOUT`` seconds so reading a hot quote does not sum its shards every time. The totals
+    that are not cached are queried at once.
+    """
+    cache_keys: dict[str, str] = {get_vote_totals_cache_key(guid=guid): guid for guid in guids}
+    totals: dict[str, tuple[int, int]] = {
+        cache_keys[cache_key]: quote_totals for cache_key, quote_totals in cache.get_many(cache_keys).items()}
+    missing_guids: set[str] = set(guids) - set(totals)
+
+    if missing_guids:
+        fetched_totals: dict[str, tuple[int, int]] = {
+            str(guid): (max(likes, 0), max(dislikes, 0)) for guid, likes, dislikes in
+            Quote.objects.filter(guid__in=missing_guids).annotate(**get_vote_total_expressions()).order_by()
+            .values_list('guid', 'total_likes', 'total_dislikes')
+        }
+        cache.set_many({get_vote_totals_cache_key(guid=guid): quote_totals
+                        for guid, quote_totals in fetched_totals.items()},
+                       timeout=settings.QUOTES_VOTE_TOTALS_CACHE_TIMEOUT)
+        totals.update(fetched_totals)
+
+    return totals
+
+
+def get_vote_totals(guid: str) -> tuple[int, int] | None:
+    """
+    Get the ``(likes, dislikes)`` of a quote with the votes on its shards added (@see ``get_many_vote_totals``).
+    """
+    return get_many_vote_totals(guids={str(guid)}).get(str(guid))
+
+
+def get_annotated_vote_totals(instance: Model | dict[str, any]) -> tuple[int, int] | None:
+    """
+    Get the ``(likes, dislikes)`` totals a quote (or ``.values()`` row) was annotated with (@see
+    ``get_vote_total_annotations``), or ``None`` if it was not annotated.
+    """
+    if isinstance(instance, dict):
+        totals: tuple[int, int] | None = (
+            (instance['total_likes'], instance['total_dislikes']) if 'total_likes' in instance else None)
+    else:
+        totals = (instance.total_likes, instance.total_dislikes) if hasattr(instance, 'total_likes') else None
+
+    return None if totals is None else (max(totals[0], 0), max(totals[1], 0))
+
+
+def apply_vote_totals(payloads: list[dict[str, any]], totals: dict[str, tuple[int, int]] | None = None) -> None:
+    """
+    Replace the votes (and the ranking scores computed from them) of serialized quotes with their totals, including the
+    votes on their shards that are not yet folded into the quotes. Does nothing unless the votes are sharded.
+    """
+    if settings.QUOTES_VOTE_SHARDS <= 0 or not payloads:
+        return
+
+    totals = get_many_vote_totals(guids={payload['guid'] for payload in payloads}) if totals is None else totals
+
+    for payload in payloads:
+        quote_totals: tuple[int, int] | None = totals.get(payload['guid'])
+
+        if quote_totals is not None:
+            likes, dislikes = quote_totals
+            payload.update(likes=likes, dislikes=dislikes, net_score=likes - dislikes,
+                           wilson_score=compute_wilson_score(likes=likes, dislikes=dislikes))
@@ -0,0 +1,367 @@
+import atexit
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from ..models import Quote, QuoteVoteShard, get_ranking_score_expressions
+from ..sampling.weighted import get_weighted_sampler
+from ..utils.leaderboard import update_leaderboards
+from ..utils.random_pool import get_random_quote_pool
+from ..utils.vote_totals import get_vote_total_expressions, get_vote_totals_cache_key
+
+logger = logging.getLogger('quotes')
+
+VOTE_DIRECTIONS = ('increase', 'decrease')
+
+
+def get_opposite_vote_field(vote_field: str) -> str:
+    return 'dislikes' if vote_field == 'likes' else 'likes'
+
+
+def apply_vote(guid: str, vote_field: str, direction: str, reverse_opposite: bool = False) -> bool:
+    """
+    Apply a vote with a single conditional ``UPDATE``, so concurrent votes on the same quote are never lost. The ranking
+    scores are updated in the same statement.
+
+    :returns: whether the quote was updated (``False`` if it does not exist or there is no vote left to remove).
+    :rtype: bool
+    """
+    queryset = Quote.objects.filter(guid=guid)
+    updates: dict[str, any] = {'modified': timezone.now()}
+
+    if direction == 'increase':
+        updates[vote_field] = F(vote_field) + 1
+
+        if reverse_opposite:
+            opposite_field: str = get_opposite_vote_field(vote_field=vote_field)
+            updates[opposite_field] = Case(
+                When(**{f'{opposite_field}__gte': 1}, then=F(opposite_field) - 1),
+                default=F(opposite_field),
+                output_field=BigIntegerField(),
+            )
+    else:
+        queryset = queryset.filter(**{f'{vote_field}__gte': 1})
+        updates[vote_field] = F(vote_field) - 1
+
+    updates.update(get_ranking_score_expressions(likes=updates.get('likes'), dislikes=updates.get('dislikes')))
+
+    return queryset.update(**updates) > 0
+
+
+def get_vote_deltas(quote: Quote, vote_field: str, direction: str, reverse_opposite: bool = False) -> dict[str, int]:
+    """
+    Get the changes of the ``likes`` and ``dislikes`` of a vote on a quote with the given (up-to-date) vote counts, for
+    votes that are not applied with a conditional ``UPDATE`` (@see ``apply_vote``).
+    """
+    opposite_field: str = get_opposite_vote_field(vote_field=vote_field)
+    deltas: dict[str, int] = {'likes': 0, 'dislikes': 0}
+
+    if direction == 'increase':
+        deltas[vote_field] += 1
+
+        if reverse_opposite and getattr(quote, opposite_field) >= 1:
+            deltas[opposite_field] -= 1
+    elif getattr(quote, vote_field) >= 1:
+        deltas[vote_field] -= 1
+
+    return deltas
+
+
+def get_vote_delta_expression(field_name: str, deltas: dict[int, int]) -> Greatest:
+    """
+    Get the expression of the new vote counts of several quotes in a single ``UPDATE``, from their deltas by quote id.
+    """
+    delta = Case(
+        *[When(pk=quote_id, then=Value(delta)) for quote_id, delta in deltas.items() if delta],
+        default=Value(0),
+        output_field=BigIntegerField(),
+    )
+
+    # Votes from other processes may have raced us, never go below zero
+    return Greatest(F(field_name) + delta, Value(0), output_field=BigIntegerField())
+
+
+class VoteBuffer:
+    """
+    Write-behind buffer that coalesces votes per quote in memory and flushes the net deltas in batches, so a burst of
+    votes on one quote costs a single ``UPDATE`` per flush interval instead of one per vote.
+    """
+
+    def __init__(self, flush_interval: float, batch_size: int) -> None:
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: dict[int, list[int]] = {}
+        self._lock = threading.Lock()
+        self._flush_thread: threading.Thread | None = None
+
+    def add(self, quote_id: int, likes_delta: int = 0, dislikes_delta: int = 0) -> None:
+        with self._lock:
+            deltas: list[int] = self._pending.setdefault(quote_id, [0, 0])
+            deltas[0] += likes_delta
+            deltas[1] += dislikes_delta
+
+        self._ensure_flush_thread()
+
+    def get_pending(self, quote_id: int) -> tuple[int, int]:
+        """
+        Get the buffered ``(likes, dislikes)`` deltas of a quote.
+        """
+        with self._lock:
+            likes_delta, dislikes_delta = self._pending.get(quote_id, (0, 0))
+
+        return likes_delta, dislikes_delta
+
+    def flush(self) -> int:
+        """
+        Write all buffered votes to the database and return the number of updated quotes.
+        """
+        with self._lock:
+            pending: dict[int, list[int]] = self._pending
+            self._pending = {}
+
+        pending = {quote_id: deltas for quote_id, deltas in pending.items() if any(deltas)}
+
+        items: list[tuple[int, list[int]]] = list(pending.items())
+        updated: int = 0
+
+        for batch_start in range(0, len(items), self.batch_size):
+            batch: list[tuple[int, list[int]]] = items[batch_start:batch_start + self.batch_size]
+
+            try:
+                queryset = Quote.objects.filter(pk__in=[quote_id for quote_id, _ in batch])
+
+                with transaction.atomic():
+                    updated += queryset.update(
+                        likes=get_vote_delta_expression(field_name='likes', deltas={pk: d[0] for pk, d in batch}),
+                        dislikes=get_vote_delta_expression(field_name='dislikes',
+                                                           deltas={pk: d[1] for pk, d in batch}),
+                        modified=timezone.now(),
+                    )
+                    # Recompute the ranking scores from the new votes (instead of repeating the deltas per score)
+                    queryset.update(**get_ranking_score_expressions())
+            except Exception as e:
+                logger.exception(msg=e)
+
+                # Put the votes back, so they are retried on the next flush
+                for quote_id, (likes_delta, dislikes_delta) in batch:
+                    self.add(quote_id=quote_id, likes_delta=likes_delta, dislikes_delta=dislikes_delta)
+
+        return updated
+
+    def _ensure_flush_thread(self) -> None:
+        if self.flush_interval <= 0 or (self._flush_thread is not None and self._flush_thread.is_alive()):
+            return
+
+        with self._lock:
+            if self._flush_thread is None or not self._flush_thread.is_alive():
+                self._flush_thread = threading.Thread(target=self._flush_forever, name='vote-buffer', daemon=True)
+                self._flush_thread.start()
+
+    def _flush_forever(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception(msg=e)
+                connection.close()
+
+
+_vote_buffer: VoteBuffer | None = None
+_vote_buffer_lock = threading.Lock()
+
+
+def get_vote_buffer() -> VoteBuffer:
+    """
+    Get this process' write-behind vote buffer, configured with the ``QUOTES_VOTE_*`` settings.
+    """
+    global _vote_buffer
+
+    if _vote_buffer is None:
+        with _vote_buffer_lock:
+            if _vote_buffer is None:
+                _vote_buffer = VoteBuffer(flush_interval=settings.QUOTES_VOTE_FLUSH_INTERVAL,
+                                          batch_size=settings.QUOTES_VOTE_FLUSH_BATCH_SIZE)
+                atexit.register(_vote_buffer.flush)
+
+    return _vote_buffer
+
+
+def vote_on_quote(guid: str, vote_field: str, direction: str, reverse_opposite: bool = False) -> Quote | None:
+    """
+    Like or dislike (``vote_field``) a quote, either directly in the database, on one of its sharded vote counters
+    (``QUOTES_VOTE_SHARDS``) or through the write-behind vote buffer (``QUOTES_VOTE_WRITE_BEHIND``), and return the
+    quote with its up-to-date vote counts.
+    """
+    if settings.QUOTES_VOTE_SHARDS > 0:
+        quote: Quote | None = shard_vote(guid=guid, vote_field=vote_field, direction=direction,
+                                         reverse_opposite=reverse_opposite)
+    elif settings.QUOTES_VOTE_WRITE_BEHIND:
+        quote: Quote | None = buffer_vote(guid=guid, vote_field=vote_field, direction=direction,
+                                          reverse_opposite=reverse_opposite)
+    else:
+        apply_vote(guid=guid, vote_field=vote_field, direction=direction, reverse_opposite=reverse_opposite)
+        quote: Quote | None = Quote.objects.select_related('author', 'category', 'origin').filter(guid=guid).first()
+
+    if quote is None:
+        return None
+
+    if settings.QUOTES_RANDOM_POOL_ENABLED:
+        get_random_quote_pool().evict(guid=quote.guid)
+
+    update_leaderboards(quote=quote)
+    get_weighted_sampler().update(quote=quote)
+
+    return quote
+
+
+async def avote_on_quote(guid: str, vote_field: str, direction: str, reverse_opposite: bool = False) -> Quote | None:
+    """
+    Async variant of ``vote_on_quote``. Votes are applied in a transaction, which the async ORM does not support, so
+    it runs ``vote_on_quote`` in a thread.
+    """
+    return await sync_to_async(vote_on_quote)(guid=guid, vote_field=vote_field, direction=direction,
+                                              reverse_opposite=reverse_opposite)
+
+
+def buffer_vote(guid: str, vote_field: str, direction: str, reverse_opposite: bool = False) -> Quote | None:
+    """
+    Add a vote to the write-behind vote buffer and return the quote with the buffered votes applied.
+    """
+    quote: Quote | None = Quote.objects.select_related('author', 'category', 'origin').filter(guid=guid).first()
+
+    if quote is None:
+        return None
+
+    vote_buffer: VoteBuffer = get_vote_buffer()
+    pending_likes, pending_dislikes = vote_buffer.get_pending(quote_id=quote.pk)
+    quote.likes = max(quote.likes + pending_likes, 0)
+    quote.dislikes = max(quote.dislikes + pending_dislikes, 0)
+    deltas: dict[str, int] = get_vote_deltas(quote=quote, vote_field=vote_field, direction=direction,
+                                             reverse_opposite=reverse_opposite)
+    vote_buffer.add(quote_id=quote.pk, likes_delta=deltas['likes'], dislikes_delta=deltas['dislikes'])
+    quote.likes += deltas['likes']
+    quote.dislikes += deltas['dislikes']
+    quote.update_ranking_scores()
+
+    return quote
+
+
+def increment_vote_shard(quote_id: int, likes_delta: int, dislikes_delta: int) -> None:
+    """
+    Add votes to one of the ``QUOTES_VOTE_SHARDS`` counters of a quote, chosen at random, so concurrent votes on the
+    same quote mostly lock different rows. A single upsert (PostgreSQL and SQLite), which creates the shard on its first
+    vote and sets its ``modified``, instead of the quote's, so the validators of the quote change without locking it.
+    """
+    shard: int = random.randrange(settings.QUOTES_VOTE_SHARDS)
+    table: str = connection.ops.quote_name(QuoteVoteShard._meta.db_table)
+    columns: dict[str, str] = {
+        field: connection.ops.quote_name(QuoteVoteShard._meta.get_field(field).column)
+        for field in ('quote', 'shard', 'likes', 'dislikes', 'modified')
+    }
+    modified = QuoteVoteShard._meta.get_field('modified').get_db_prep_value(timezone.now(), connection=connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ({", ".join(columns.values())}) VALUES (%s, %s, %s, %s, %s) '
+            f'ON CONFLICT ({columns["quote"]}, {columns["shard"]}) DO UPDATE SET '
+            f'{columns["likes"]} = {table}.{columns["likes"]} + excluded.{columns["likes"]}, '
+            f'{columns["dislikes"]} = {table}.{columns["dislikes"]} + excluded.{columns["dislikes"]}, '
+            f'{columns["modified"]} = excluded.{columns["modified"]}',
+            [quote_id, shard, likes_delta, dislikes_delta, modified],
+        )
+
+
+def shard_vote(guid: str, vote_field: str, direction: str, reverse_opposite: bool = False) -> Quote | None:
+    """
+    Add a vote to one of the sharded vote counters of a quote and return the quote with the votes on its shards
+    applied.
+
+    The totals are cached (@see ``get_many_vote_totals``), so under concurrent votes they may lag by a few votes for up
+    to ``QUOTES_VOTE_TOTALS_CACHE_TIMEOUT`` seconds, and a removed vote is only checked against them (the compaction
+    never lets the counts go below zero). The shards are folded into the quote by ``compact_vote_shards``.
+    """
+    cache_key: str = get_vote_totals_cache_key(guid=guid)
+    totals: tuple[int, int] | None = cache.get(cache_key)
+    queryset = Quote.objects.select_related('author', 'category', 'origin').filter(guid=guid)
+
+    if totals is None:
+        queryset = queryset.annotate(**get_vote_total_expressions())
+
+    quote: Quote | None = queryset.first()
+
+    if quote is None:
+        return None
+
+    if totals is None:
+        totals = (max(quote.total_likes, 0), max(quote.total_dislikes, 0))
+
+    quote.likes, quote.dislikes = totals
+    deltas: dict[str, int] = get_vote_deltas(quote=quote, vote_field=vote_field, direction=direction,
+                                             reverse_opposite=reverse_opposite)
+
+    if any(deltas.values()):
+        increment_vote_shard(quote_id=quote.pk, likes_delta=deltas['likes'], dislikes_delta=deltas['dislikes'])
+        quote.likes += deltas['likes']
+        quote.dislikes += deltas['dislikes']
+
+    cache.set(cache_key, (quote.likes, quote.dislikes), timeout=settings.QUOTES_VOTE_TOTALS_CACHE_TIMEOUT)
+    # Serialized with the new totals (@see ``FastQuoteSerializer``)
+    quote.total_likes, quote.total_dislikes = quote.likes, quote.dislikes
+    quote.update_ranking_scores()
+
+    return quote
+
+
+def compact_vote_shards(batch_size: int) -> int:
+    """
+    Fold the sharded vote counters into the ``likes`` and ``dislikes`` (and ranking scores) of their quotes, and reset
+    them. The shards of each batch of quotes are locked while they are folded, so concurrent votes wait instead of being
+    lost.
+
+    :returns: the number of updated quotes.
+    :rtype: int
+    """
+    quote_ids: list[int] = list(
+        QuoteVoteShard.objects.exclude(likes=0, dislikes=0).order_by('quote_id').values_list('quote_id', flat=True)
+        .distinct())
+    updated: int = 0
+
+    for batch_start in range(0, len(quote_ids), batch_size):
+        batch: list[int] = quote_ids[batch_start:batch_start + batch_size]
+
+        with transaction.atomic():
+            shards: list[tuple[int, int, str, int, int]] = list(
+                QuoteVoteShard.objects.select_for_update(of=('self',)).filter(quote_id__in=batch)
+                .exclude(likes=0, dislikes=0).values_list('pk', 'quote_id', 'quote__guid', 'likes', 'dislikes'))
+            deltas: dict[int, list[int]] = {}
+
+            for _, quote_id, _, likes_delta, dislikes_delta in shards:
+                quote_deltas: list[int] = deltas.setdefault(quote_id, [0, 0])
+                quote_deltas[0] += likes_delta
+                quote_deltas[1] += dislikes_delta
+
+            queryset = Quote.objects.filter(pk__in=deltas)
+            updated += queryset.update(
+                likes=get_vote_delta_expression(field_name='likes', deltas={pk: d[0] for pk, d in deltas.items()}),
+                dislikes=get_vote_delta_expression(field_name='dislikes',
+                                                   deltas={pk: d[1] for pk, d in deltas.items()}),
+                modified=timezone.now(),
+            )
+            queryset.update(**get_ranking_score_expressions())
+            QuoteVoteShard.objects.filter(pk__in=[shard[0] for shard in shards]).update(likes=0, dislikes=0)
+
+        # The totals don't change, unless the compaction kept them from going below zero
+        cache.delete_many([get_vote_totals_cache_key(guid=shard[2]) for shard in shards])
+
+    return updated
@@ -1,42 +1,270 @@
 from http import HTTPMethod
 
 from distutils.util import strtobool
-from django.db.models import QuerySet
+from django.conf import settings
+from django.db.models import Expression, OuterRef, QuerySet, Subquery
+from django.http import Http404
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from contrib.views import GenericGUIDViewSet
-from .models import Quote
-from .serializers import QuoteSerializer
-from .utils.quote_fetching import fetch_random_quote, fetch_random_quote_from_database
+from contrib.api.http import get_circuit_breaker_states
+from contrib.pagination import PAGINATION_CLASSES
+from contrib.query_budget import query_budget
+from contrib.views import ConditionalGetMixin, GenericGUIDViewSet
+from .models import Quote, QuoteVoteShard
+from .serializers import FastQuoteSerializer, QuoteSerializer
+from .utils.db_operations import get_ingestion_stats
+from .utils.leaderboard import LEADERBOARD_METRICS, get_leaderboard
+from .utils.quote_fetching import (
+    RANDOM_QUOTE_MODES, fetch_random_quote, fetch_random_quote_from_database, fetch_random_quotes_from_database,
+    fetch_stream_quote_from_database, fetch_weighted_quote_from_database,
+)
+from .utils.random_pool import get_random_quote_pool
+from .utils.search import search_quotes
+from .utils.vote_totals import get_vote_total_annotations
+from .utils.votes import VOTE_DIRECTIONS, vote_on_quote
 
 
-class QuoteViewSet(GenericGUIDViewSet, ListAPIView, RetrieveAPIView, viewsets.ViewSet):
+class QuoteViewSet(ConditionalGetMixin, GenericGUIDViewSet, ListAPIView, RetrieveAPIView, viewsets.ViewSet):
     """
     API endpoints for getting quotes.
     """
     serializer_class = QuoteSerializer
-    queryset = Quote.objects.all()
+    queryset = Quote.objects.select_related('author', 'category', 'origin')
+    # The validators query, plus the count and page (or row) queries on a cache miss (@see ``contrib.query_budget``)
+    query_budgets = {'list': 3, 'retrieve': 2}
 
+    @property
+    def pagination_class(self) -> type[BasePagination]:
+        return PAGINATION_CLASSES[settings.QUOTES_LIST_PAGINATION]
+
+    def get_modified_annotations(self, detail: bool) -> dict[str, Expression]:
+        """
+        Sharded votes don't update the ``modified`` of their quotes, but the ``modified`` of their shards (@see
+        ``quotes.utils.votes.shard_vote``): the latest vote on the quote's shards, or on any shard for the list.
+        """
+        if settings.QUOTES_VOTE_SHARDS <= 0:
+            return {}
+
+        shards: QuerySet = QuoteVoteShard.objects.order_by('-modified')
+
+        if detail:
+            shards = shards.filter(quote=OuterRef('pk'))
+
+        return {'votes_modified': Subquery(shards.values('modified')[:1])}
+
+    def get_retrieve_data(self, request: Request, *args, **kwargs) -> dict[str, any]:
+        row: dict[str, any] | None = (
+            self.filter_queryset(self.get_queryset())
+            .filter(guid=kwargs[self.lookup_url_kwarg or self.lookup_field])
+            .values(*FastQuoteSerializer.values_fields, **get_vote_total_annotations())
+            .first()
+        )
+
+        if row is None:
+            raise Http404
+
+        return FastQuoteSerializer(instance=row).data
+
+    def get_list_data(self, request: Request, *args, **kwargs) -> dict[str, any] | list[dict[str, any]]:
+        queryset: QuerySet = self.filter_queryset(self.get_queryset()).values(*FastQuoteSerializer.values_fields,
+                                                                             **get_vote_total_annotations())
+        page: list[dict[str, any]] | None = self.paginate_queryset(queryset)
+
+        if page is None:
+            return FastQuoteSerializer(instance=queryset, many=True).data
+
+        return self.get_paginated_response(FastQuoteSerializer(instance=page, many=True).data).data
+
+    @extend_schema(
+        request=None,
+        parameters=[
+            OpenApiParameter(
+                name='mode',
+                description='How to pick the quote: any random quote (random), the next quote of this session\'s '
+                            'random stream, which does not repeat quotes until all of them have been served (stream), '
+                            'or a random quote weighted by its like ratio (weighted).',
+                required=False,
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                enum=list(RANDOM_QUOTE_MODES),
+                default='random',
+            ),
+        ],
+    )
+    # Sampling (@see ``IdRangeSampler``), or fetching and saving a quote from an API
+    @query_budget(max_queries=24)
     @action(detail=False, methods=[HTTPMethod.GET])
     def get_random_quote(self, request: Request) -> Response:
         """
         Get a random quote.
         """
+        mode: str = request.query_params.get('mode', 'random')
+
+        if mode not in RANDOM_QUOTE_MODES:
+            return Response(data={'error': f'Invalid mode provided, must be one of: {list(RANDOM_QUOTE_MODES)}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if mode in ('stream', 'weighted'):
+            quote: Quote | None = (fetch_stream_quote_from_database(session=request.session) if mode == 'stream'
+                                   else fetch_weighted_quote_from_database())
+
+            if quote is None:
+                return Response(data='No quotes found', status=status.HTTP_404_NOT_FOUND)
+
+            return Response(data=FastQuoteSerializer(instance=quote).data, status=status.HTTP_200_OK)
+
+        if settings.QUOTES_RANDOM_POOL_ENABLED:
+            payload: dict[str, any] | None = get_random_quote_pool().pop()
+
+            if payload is not None:
+                return Response(data=payload, status=status.HTTP_200_OK)
+
         quote: Quote | None = fetch_random_quote()
 
         if quote is None:
             return Response(data='No quotes found', status=status.HTTP_404_NOT_FOUND)
 
-        serializer = QuoteSerializer(instance=quote)
+        serializer = FastQuoteSerializer(instance=quote)
 
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        request=None,
+        parameters=[
+            OpenApiParameter(
+                name='count',
+                description='How many distinct quotes to return (optional, default=10, positive, at most '
+                            'QUOTES_RANDOM_BATCH_MAX_COUNT).',
+                required=False,
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.INT,
+                default=10,
+            ),
+            OpenApiParameter(
+                name='category',
+                description='Category (name or alias, case-insensitive) of the quotes (optional).',
+                required=False,
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name='mode',
+                description='How to pick the quotes: uniformly (random), or weighted by their like ratio (weighted, '
+                            'not combined with a category).',
+                required=False,
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                enum=['random', 'weighted'],
+                default='random',
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: OpenApiResponse(
+                response=QuoteSerializer(many=True),
+                description='Get a list of distinct random quotes (fewer than requested if there are not enough).',
+            ),
+            status.HTTP_404_NOT_FOUND: OpenApiResponse(description='No quotes found (for the category).'),
+        },
+    )
+    # The category lookup and the bounds and probe queries of the sampler (@see ``BaseRandomSampler.sample_many``)
+    @query_budget(max_queries=6)
+    @action(detail=False, methods=[HTTPMethod.GET])
+    def get_random_quotes(self, request: Request) -> Response:
+        """
+        Get several distinct random quotes from the database at once (e.g. to fill a carousel).
+        """
+        try:
+            quote_count: int = int(request.query_params.get('count', 10))
+        except ValueError:
+            return Response(data={'error': 'Invalid count provided, must be an integer'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        mode: str = request.query_params.get('mode', 'random')
+
+        if mode not in ('random', 'weighted'):
+            return Response(data={'error': 'Invalid mode provided, must be one of: random, weighted'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if quote_count < 1:
+            return Response(data={'error': 'Invalid count provided, must be a positive integer'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        quote_count = min(quote_count, settings.QUOTES_RANDOM_BATCH_MAX_COUNT)
+
+        try:
+            quotes: list[Quote] = fetch_random_quotes_from_database(count=quote_count,
+                                                                    category=request.query_params.get('category'),
+                                                                    weighted=mode == 'weighted')
+        except ValueError as e:
+            return Response(data={'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not quotes:
+            return Response(data='No quotes found', status=status.HTTP_404_NOT_FOUND)
+
+        return Response(data=FastQuoteSerializer(instance=quotes, many=True).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=None,
+        responses={
+            status.HTTP_200_OK: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description='Size, configuration and hit/miss counters of the random quote pool.',
+            ),
+            status.HTTP_404_NOT_FOUND: OpenApiResponse(description='The random quote pool is disabled.'),
+        },
+    )
+    @query_budget(max_queries=0)
+    @action(detail=False, methods=[HTTPMethod.GET])
+    def get_random_quote_pool_stats(self, request: Request) -> Response:
+        """
+        Get the statistics of this process' random quote pool.
+        """
+        if not settings.QUOTES_RANDOM_POOL_ENABLED:
+            return Response(data='The random quote pool is disabled', status=status.HTTP_404_NOT_FOUND)
+
+        return Response(data=get_random_quote_pool().stats(), status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=None,
+        responses={
+            status.HTTP_200_OK: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description='Circuit breaker state, counters and latency per outbound source.',
+            ),
+        },
+    )
+    @query_budget(max_queries=0)
+    @action(detail=False, methods=[HTTPMethod.GET])
+    def get_quote_source_stats(self, request: Request) -> Response:
+        """
+        Get the circuit breaker state and latency of the external quote and image sources (in this process).
+        """
+        return Response(data=get_circuit_breaker_states(), status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=None,
+        responses={
+            status.HTTP_200_OK: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description='New and existing ingested quotes, and the inline image lookups saved.',
+            ),
+        },
+    )
+    @query_budget(max_queries=0)
+    @action(detail=False, methods=[HTTPMethod.GET])
+    def get_quote_ingestion_stats(self, request: Request) -> Response:
+        """
+        Get the number of new and existing quotes fetched from the external sources (in this process).
+        """
+        return Response(data=get_ingestion_stats(), status=status.HTTP_200_OK)
+
     @extend_schema(
         request=None,
         parameters=[
@@ -56,33 +284,13 @@ class QuoteViewSet(GenericGUIDViewSet, ListAPIView, RetrieveAPIView, viewsets.Vi
             )
         ],
     )
+    @query_budget(max_queries=2)
     @action(detail=True, methods=[HTTPMethod.PATCH])
     def like(self, request: Request, guid: str) -> Response:
         """
         Like a quote.
         """
-        direction = request.query_params.get('direction', 'increase')
-        quote: Quote = Quote.objects.get(guid=guid)
-
-        if direction == 'increase':
-            quote.likes += 1
-
-            reverse_opposite: bool = bool(strtobool(request.query_params.get('reverse_opposite', '0')))
-
-            if reverse_opposite and quote.dislikes >= 1:
-                quote.dislikes -= 1
-        elif direction == 'decrease':
-            if quote.likes >= 1:
-                quote.likes -= 1
-        else:
-            return Response(data={'error': 'Invalid direction provided, must be one of: ["increase", "decrease"]'},
-                            status=status.HTTP_400_BAD_REQUEST)
-
-        quote.save()
-
-        serializer = QuoteSerializer(instance=quote)
-
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return self._vote(request=request, guid=guid, vote_field='likes')
 
     @extend_schema(
         request=None,
@@ -103,29 +311,28 @@ class QuoteViewSet(GenericGUIDViewSet, ListAPIView, RetrieveAPIView, viewsets.Vi
             )
         ],
     )
+    @query_budget(max_queries=2)
     @action(detail=True, methods=[HTTPMethod.PATCH])
     def dislike(self, request: Request, guid: str) -> Response:
         """
         Dislike a quote.
         """
-        direction = request.query_params.get('direction', 'increase')
-        quote: Quote = Quote.objects.get(guid=guid)
-
-        if direction == 'increase':
-            quote.dislikes += 1
+        return self._vote(request=request, guid=guid, vote_field='dislikes')
 
-            reverse_opposite: bool = bool(strtobool(request.query_params.get('reverse_opposite', '0')))
+    @staticmethod
+    def _vote(request: Request, guid: str, vote_field: str) -> Response:
+        direction: str = request.query_params.get('direction', 'increase')
 
-            if reverse_opposite and quote.likes >= 1:
-                quote.likes -= 1
-        elif direction == 'decrease':
-            if quote.dislikes >= 1:
-                quote.dislikes -= 1
-        else:
+        if direction not in VOTE_DIRECTIONS:
             return Response(data={'error': 'Invalid direction provided, must be one of: ["increase", "decrease"]'},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        quote.save()
+        reverse_opposite: bool = bool(strtobool(request.query_params.get('reverse_opposite', '0')))
+        quote: Quote | None = vote_on_quote(guid=guid, vote_field=vote_field, direction=direction,
+                                            reverse_opposite=reverse_opposite)
+
+        if quote is None:
+            return Response(data='Quote not found', status=status.HTTP_404_NOT_FOUND)
 
         serializer = QuoteSerializer(instance=quote)
 
@@ -136,22 +343,31 @@ class QuoteViewSet(GenericGUIDViewSet, ListAPIView, RetrieveAPIView, viewsets.Vi
         parameters=[
             OpenApiParameter(
                 name='category',
-                description='Category of the quote to find.',
+                description='Category (name or alias, case-insensitive) of the quote to find.',
                 required=True,
                 location=OpenApiParameter.QUERY,
                 type=OpenApiTypes.STR,
             ),
         ],
+        responses={
+            status.HTTP_200_OK: QuoteSerializer,
+            status.HTTP_404_NOT_FOUND: OpenApiResponse(description='No quotes found for the category.'),
+        },
     )
+    # The category lookup, the sampling queries and the vote totals (with sharded votes)
+    @query_budget(max_queries=6)
     @action(detail=False, methods=[HTTPMethod.GET])
     def get_random_quote_by_category(self, request: Request) -> Response:
         """
         Get a random quote from the database, with given category.
         """
         category: str = request.query_params.get('category')
-        quote: Quote = fetch_random_quote_from_database(category=category)
+        quote: Quote | None = fetch_random_quote_from_database(category=category)
 
-        serializer = QuoteSerializer(instance=quote)
+        if quote is None:
+            return Response(data='No quotes found for category', status=status.HTTP_404_NOT_FOUND)
+
+        serializer = FastQuoteSerializer(instance=quote)
 
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -160,24 +376,96 @@ class QuoteViewSet(GenericGUIDViewSet, ListAPIView, RetrieveAPIView, viewsets.Vi
         parameters=[
             OpenApiParameter(
                 name='count',
-                description='How many quotes to return (optional, default=10).',
+                description='How many quotes to return (optional, default=10, at most QUOTES_LEADERBOARD_SIZE).',
                 required=False,
                 location=OpenApiParameter.QUERY,
                 type=OpenApiTypes.INT,
                 default=10,
             ),
+            OpenApiParameter(
+                name='metric',
+                description='How to rank the quotes: by likes, by likes minus dislikes (net_score) or by the lower '
+                            'bound of the Wilson score interval of the like ratio (wilson_score).',
+                required=False,
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                enum=list(LEADERBOARD_METRICS),
+                default='likes',
+            ),
         ],
         responses={
             status.HTTP_200_OK: OpenApiResponse(
                 response=QuoteSerializer(many=True),
-                description='Get a list of the X most liked quotes.',
+                description='Get a list of the X best ranked quotes.',
             )
         },
     )
+    @query_budget(max_queries=1)
     @action(detail=False, methods=[HTTPMethod.GET])
     def get_most_liked_quotes(self, request: Request) -> Response:
-        quote_count: int = request.query_params.get('count', 10)
-        most_liked_quotes: QuerySet = Quote.objects.order_by('-likes')[:int(quote_count)]
-        serializer = QuoteSerializer(instance=most_liked_quotes, many=True)
+        """
+        Get the best ranked quotes (served from the cached leaderboard).
+        """
+        metric: str = request.query_params.get('metric', 'likes')
 
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        if metric not in LEADERBOARD_METRICS:
+            return Response(data={'error': f'Invalid metric provided, must be one of: {list(LEADERBOARD_METRICS)}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            quote_count: int = int(request.query_params.get('count', 10))
+        except ValueError:
+            return Response(data={'error': 'Invalid count provided, must be an integer'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if quote_count < 1:
+            return Response(data={'error': 'Invalid count provided, must be a positive integer'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        quote_count = min(quote_count, settings.QUOTES_LEADERBOARD_SIZE)
+
+        return Response(data=get_leaderboard(metric=metric, count=quote_count), status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=None,
+        parameters=[
+            OpenApiParameter(
+                name='q',
+                description='Words to find in the quote text, author or category (web search syntax on PostgreSQL: '
+                            '"quoted phrases", or, -excluded).',
+                required=True,
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name='page',
+                description='Page number of the results.',
+                required=False,
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.INT,
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: QuoteSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: OpenApiResponse(description='No search query provided.'),
+        },
+    )
+    # The count and page queries
+    @query_budget(max_queries=2)
+    @action(detail=False, methods=[HTTPMethod.GET])
+    def search(self, request: Request) -> Response:
+        """
+        Search quotes by their text, author and category, best matches first (@see ``quotes.utils.search``).
+        """
+        query: str = request.query_params.get('q', '').strip()
+
+        if not query:
+            return Response(data={'error': 'No search query provided'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset: QuerySet = search_quotes(query=query, queryset=self.get_queryset()).values(
+            *FastQuoteSerializer.values_fields, **get_vote_total_annotations())
+        # Always numbered pages: the results are ordered by rank, which the cursor pagination can't seek on
+        paginator = PageNumberPagination()
+        page: list[dict[str, any]] = paginator.paginate_queryset(queryset=queryset, request=request, view=self)
+
+        return paginator.get_paginated_response(FastQuoteSerializer(instance=page, many=True).data)
@@ -76,6 +76,7 @@ class Default(Configuration):
             'django.contrib.auth.middleware.AuthenticationMiddleware',
             'django.contrib.messages.middleware.MessageMiddleware',
             'django.middleware.clickjacking.XFrameOptionsMiddleware',
+            'contrib.query_budget.QueryBudgetMiddleware',
         ]
 
     CORS_ALLOWED_ORIGINS = values.ListValue(
@@ -124,6 +125,12 @@ class Default(Configuration):
             }
         }
 
+    # Cache (set CACHE_URL, e.g. to redis://..., to share the cache between processes)
+    # https://docs.djangoproject.com/en/5.1/ref/settings/#caches
+    CACHES = values.CacheURLValue('locmem://', environ_prefix=ENV_PREFIX)
+    # Server-side cache of retrieve/list payloads, keyed on their ETag (@see ``contrib.views.ConditionalGetMixin``)
+    RESPONSE_CACHE_TIMEOUT = values.IntegerValue(300, environ_prefix=ENV_PREFIX)  # seconds
+
     # Password validation
     # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -247,6 +254,88 @@ class Default(Configuration):
             'REDOC_DIST': 'SIDECAR',
         }
 
+    # Number of queries per endpoint, checked against the declared budgets (@see ``contrib.query_budget``). Violations
+    # are logged, or raise an exception when strict (e.g. in tests).
+    QUERY_BUDGET_ENABLED = values.BooleanValue(True, environ_prefix=ENV_PREFIX)
+    QUERY_BUDGET_STRICT = values.BooleanValue(False, environ_prefix=ENV_PREFIX)
+
+    # Outbound HTTP requests (@see ``contrib.api.http``)
+    HTTP_CONNECT_TIMEOUT = values.FloatValue(3.05, environ_prefix=ENV_PREFIX)  # seconds
+    HTTP_READ_TIMEOUT = values.FloatValue(5.0, environ_prefix=ENV_PREFIX)  # seconds
+    HTTP_POOL_MAXSIZE = values.IntegerValue(10, environ_prefix=ENV_PREFIX)
+    # Threads that send the HTTP requests of async views (@see ``contrib.api.http.run_blocking``)
+    HTTP_ASYNC_MAX_WORKERS = values.IntegerValue(32, environ_prefix=ENV_PREFIX)
+    HTTP_CIRCUIT_BREAKER_FAILURE_THRESHOLD = values.IntegerValue(5, environ_prefix=ENV_PREFIX)
+    HTTP_CIRCUIT_BREAKER_RESET_TIMEOUT = values.FloatValue(30.0, environ_prefix=ENV_PREFIX)  # seconds
+    # Requests per second per source, used for bulk fetching (@see ``contrib.api.rate_limiting``)
+    HTTP_RATE_LIMITS = values.DictValue(
+        {
+            'api_ninja': 10.0,
+            'programming_quotes': 5.0,
+            'zen_quotes': 0.16,  # 5 requests per 30 seconds
+            'unsplash': 1.38,  # 5000 requests per hour (production applications)
+        },
+        environ_prefix=ENV_PREFIX,
+    )
+    HTTP_DEFAULT_RATE_LIMIT = values.FloatValue(5.0, environ_prefix=ENV_PREFIX)
+
+    # Strategy used to pick random quotes from the database (@see ``quotes.sampling.registry.RANDOM_SAMPLERS``)
+    QUOTES_RANDOM_SAMPLER = values.Value(default='id_range', environ_prefix=ENV_PREFIX)
+    # Maximum number of quotes returned at once by ``get_random_quotes``
+    QUOTES_RANDOM_BATCH_MAX_COUNT = values.IntegerValue(50, environ_prefix=ENV_PREFIX)
+    # Weighted random quotes (``mode=weighted``): Beta prior of the like ratio, and how long before the per-process
+    # weights are reloaded to pick up votes from other processes (@see ``quotes.sampling.weighted``)
+    QUOTES_WEIGHTED_PRIOR_LIKES = values.FloatValue(1.0, environ_prefix=ENV_PREFIX)
+    QUOTES_WEIGHTED_PRIOR_DISLIKES = values.FloatValue(1.0, environ_prefix=ENV_PREFIX)
+    QUOTES_WEIGHTED_MAX_AGE = values.FloatValue(300.0, environ_prefix=ENV_PREFIX)  # seconds
+
+    # Per-process pool of pre-serialized random quotes for ``get_random_quote`` (@see ``quotes.utils.random_pool``)
+    QUOTES_RANDOM_POOL_ENABLED = values.BooleanValue(False, environ_prefix=ENV_PREFIX)
+    QUOTES_RANDOM_POOL_SIZE = values.IntegerValue(500, environ_prefix=ENV_PREFIX)
+    QUOTES_RANDOM_POOL_REFILL_BATCH = values.IntegerValue(100, environ_prefix=ENV_PREFIX)
+    QUOTES_RANDOM_POOL_LOW_WATER_MARK = values.IntegerValue(100, environ_prefix=ENV_PREFIX)
+    QUOTES_RANDOM_POOL_MAX_AGE = values.FloatValue(300.0, environ_prefix=ENV_PREFIX)  # seconds
+
+    # Write-behind buffering of likes/dislikes (@see ``quotes.utils.votes.VoteBuffer``)
+    QUOTES_VOTE_WRITE_BEHIND = values.BooleanValue(False, environ_prefix=ENV_PREFIX)
+    QUOTES_VOTE_FLUSH_INTERVAL = values.FloatValue(0.25, environ_prefix=ENV_PREFIX)  # seconds
+    QUOTES_VOTE_FLUSH_BATCH_SIZE = values.IntegerValue(500, environ_prefix=ENV_PREFIX)
+
+    # Sharded vote counters (@see ``quotes.utils.votes.shard_vote``), disabled with 0 shards. Takes precedence over the
+    # write-behind buffering
+    QUOTES_VOTE_SHARDS = values.IntegerValue(0, environ_prefix=ENV_PREFIX)
+    QUOTES_VOTE_TOTALS_CACHE_TIMEOUT = values.IntegerValue(5, environ_prefix=ENV_PREFIX)  # seconds
+
+    # Pagination of the quote list: ``page_number`` (with a total count) or ``cursor`` (keyset pagination, @see
+    # ``contrib.pagination.KeysetPagination``)
+    QUOTES_LIST_PAGINATION = values.Value(default='page_number', environ_prefix=ENV_PREFIX)
+
+    # Maximum number of cached ids per dimension table (authors, categories and origins) of the quote ingestion (@see
+    # ``quotes.utils.dimensions``)
+    QUOTES_DIMENSION_CACHE_SIZE = values.IntegerValue(10_000, environ_prefix=ENV_PREFIX)
+
+    # Lifetime of the cached map of category names and aliases to ids (@see ``quotes.utils.categories``)
+    QUOTES_CATEGORY_IDS_CACHE_TIMEOUT = values.IntegerValue(300, environ_prefix=ENV_PREFIX)  # seconds
+
+    # Text search configuration (language) of the quote search (@see ``quotes.utils.search``)
+    QUOTES_SEARCH_CONFIG = values.Value(default='english', environ_prefix=ENV_PREFIX)
+
+    # Cached leaderboards of ``get_most_liked_quotes`` (@see ``quotes.utils.leaderboard``)
+    QUOTES_LEADERBOARD_SIZE = values.IntegerValue(100, environ_prefix=ENV_PREFIX)  # also the maximum ``count``
+    QUOTES_LEADERBOARD_CACHE_TIMEOUT = values.IntegerValue(300, environ_prefix=ENV_PREFIX)  # seconds
+
+    # How random quotes are fetched from the quote APIs: one at a time (``sequential``) or concurrently (``hedged``)
+    QUOTES_API_FETCH_MODE = values.Value(default='sequential', environ_prefix=ENV_PREFIX)
+    QUOTES_API_FETCH_DEADLINE = values.FloatValue(5.0, environ_prefix=ENV_PREFIX)  # seconds
+    QUOTES_API_FETCH_HEDGE_DELAY = values.FloatValue(0.2, environ_prefix=ENV_PREFIX)  # seconds
+    QUOTES_API_FETCH_MAX_WORKERS = values.IntegerValue(16, environ_prefix=ENV_PREFIX)
+
+    # Image lookups for new quotes: queued for the ``process_image_enrichment`` worker (``queue``) or inline (``sync``)
+    QUOTES_IMAGE_ENRICHMENT_MODE = values.Value(default='queue', environ_prefix=ENV_PREFIX)
+    QUOTES_IMAGE_ENRICHMENT_MAX_ATTEMPTS = values.IntegerValue(5, environ_prefix=ENV_PREFIX)
+    QUOTES_IMAGE_ENRICHMENT_RETRY_DELAY = values.FloatValue(30.0, environ_prefix=ENV_PREFIX)  # seconds
+    QUOTES_IMAGE_ENRICHMENT_CLAIM_TIMEOUT = values.FloatValue(600.0, environ_prefix=ENV_PREFIX)  # seconds
+
     # Unsplash API
     UNSPLASH_API_CLIENT_ID = os.getenv(key='UNSPLASH_API_CLIENT_ID')
 
@@ -19,12 +19,20 @@ from django.urls import include, path
 from rest_framework import routers
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
+from quotes import async_views as quotes_async_views
 from quotes import views as quotes_views
 
 router = routers.DefaultRouter()
 router.register(prefix=r'quotes', viewset=quotes_views.QuoteViewSet, basename='quotes')
 
 urlpatterns = [
+    # Async variants of the hot endpoints (for ASGI)
+    path(route='async/quotes/get_random_quote/', view=quotes_async_views.get_random_quote,
+         name='async-quotes-get-random-quote'),
+    path(route='async/quotes/get_random_quote_by_category/', view=quotes_async_views.get_random_quote_by_category,
+         name='async-quotes-get-random-quote-by-category'),
+    path(route='async/quotes/<uuid:guid>/like/', view=quotes_async_views.like, name='async-quotes-like'),
+    path(route='async/quotes/<uuid:guid>/dislike/', view=quotes_async_views.dislike, name='async-quotes-dislike'),
     # Django REST Framework
     path(route='', view=include(router.urls)),
     path(route='api-auth/', view=include('rest_framework.urls', namespace='rest_framework')),